@@ -0,0 +1,273 @@
+"""
+Benchmarks for the DQ and Profiling Hot Paths
+Generates olist-shaped tables (benchmarks/synthetic_olist.py) at each requested scale
+and times, with pipeline_trace spans:
+
+    dq.load_all_tables / dq.run_checks       : the full DQ run (load, score, stream results)
+    dq.check_<dimension>                     : each check_* method over every loaded column
+    profile.calculate_column_profile[.approx]: exact and sketch profiling of every column
+    profile.profile_all_datasets             : CSV load + serial column profiling
+    report.summary / report.html / report.plot_bins
+
+Each case runs --repeat times; min / median / mean wall time, CPU time, peak RSS growth
+and rows per second go to a JSON file (benchmarks/results/<timestamp>.json by default)
+together with the git commit, library versions and table sizes. --compare flags cases
+whose median is slower than a previous results file by more than --tolerance.
+
+Cases run in a scratch working directory, so the profiler's and checker's relative
+caches (stats, drift sketches, Great_Expectation/) neither pollute nor warm from the repo.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scale 1 10
+    python benchmarks/run_benchmarks.py --scale 0.1 --only 'dq.*' --compare benchmarks/results/base.json
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic_olist import KAGGLE_ROWS, write_tables  # noqa: E402
+from pipeline_trace import Tracer  # noqa: E402
+
+CONFIG_PATH = ROOT / "great_expectation" / "config" / "dq_config.yml"
+DATA_DIR = ROOT / "benchmarks" / "data"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DIMENSIONS = ('completeness', 'validity', 'uniqueness', 'accuracy', 'consistency', 'conformity')
+
+
+def _checker(data_dir, output_dir):
+    from run_dq_check import DataQualityChecker
+    # no stats cache / drift report: every repeat measures the cold path
+    return DataQualityChecker(config_path=str(CONFIG_PATH), data_dir=str(data_dir), output_dir=str(output_dir),
+                              stats_cache_path=None, drift_report_path=None, tracer=Tracer(enabled=False))
+
+
+def build_cases(data_dir, csv_files, work_dir):
+    """
+    Benchmark cases for one generated data set.
+
+    Returns:
+    --------
+    list of (name, rows, fn) : fn runs one repetition; rows is what it processes
+    """
+    import data_profiling_analysis as dpa
+    from profile_bins import PlotBins
+
+    datasets = {f.replace('.csv', ''): pd.read_csv(data_dir / f) for f in csv_files}
+    total_rows = sum(len(df) for df in datasets.values())
+    checker = _checker(data_dir, work_dir / "dq")
+    dq_tables = checker.load_all_tables(csv_files)
+    dq_rows = sum(len(df) for df in dq_tables.values())
+    checker.consistency = checker.build_consistency_engine(dq_tables)
+    profile_df, _ = dpa.profile_all_datasets(data_dir=data_dir, csv_files=csv_files)
+
+    def run_checks():
+        _checker(data_dir, work_dir / "dq").run_checks(csv_files)
+
+    def check(dimension):
+        method = getattr(checker, f"check_{dimension}")
+
+        def run():
+            for table_name, df in dq_tables.items():
+                for column in df.columns:
+                    if dimension == 'consistency':
+                        method(df, column, table_name=table_name)
+                    else:
+                        method(df, column)
+        return run
+
+    def column_profiles(approximate):
+        def run():
+            for table_name, df in datasets.items():
+                for column in df.columns:
+                    dpa.calculate_column_profile(df, column, table_name, approximate=approximate)
+        return run
+
+    cases = [
+        ('dq.load_all_tables', dq_rows, lambda: _checker(data_dir, work_dir / "dq").load_all_tables(csv_files)),
+        ('dq.run_checks', dq_rows, run_checks),
+    ]
+    cases += [(f"dq.check_{dimension}", dq_rows, check(dimension)) for dimension in DIMENSIONS]
+    cases += [
+        ('profile.calculate_column_profile', total_rows, column_profiles(False)),
+        ('profile.calculate_column_profile.approx', total_rows, column_profiles(True)),
+        ('profile.profile_all_datasets', total_rows,
+         lambda: dpa.profile_all_datasets(data_dir=data_dir, csv_files=csv_files)),
+        ('report.summary', total_rows, lambda: dpa.generate_summary_report(profile_df, datasets)),
+        ('report.html', total_rows, lambda: dpa.write_html_report(profile_df, datasets, io.StringIO())),
+        ('report.plot_bins', total_rows, lambda: PlotBins.compute(datasets)),
+    ]
+    return cases
+
+
+def time_case(fn, repeat):
+    """Run fn `repeat` times under a tracer span; per-run wall / cpu seconds and peak RSS growth."""
+    tracer = Tracer()
+    for i in range(repeat):
+        with tracer.span('run', run=i):
+            fn()
+    return [{'wall': s.wall, 'cpu': s.cpu, 'rss_peak_growth_mb': s.metrics()['rss_peak_growth_mb']}
+            for s in tracer.spans]
+
+
+def summarize(runs, rows):
+    walls = [r['wall'] for r in runs]
+    median = statistics.median(walls)
+    growth = [r['rss_peak_growth_mb'] for r in runs if r['rss_peak_growth_mb'] is not None]
+    return {
+        'repeat': len(runs),
+        'rows': rows,
+        'wall_min_s': round(min(walls), 6),
+        'wall_median_s': round(median, 6),
+        'wall_mean_s': round(statistics.fmean(walls), 6),
+        'cpu_median_s': round(statistics.median(r['cpu'] for r in runs), 6),
+        'rss_peak_growth_mb': max(growth) if growth else None,
+        'rows_per_s': round(rows / median, 1) if median > 0 else None,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(scales=(1.0,), seed=0, repeat=3, only=None, data_root=DATA_DIR, verbose=True):
+    """
+    Generate the tables for each scale and time every (matching) case.
+
+    Parameters:
+    -----------
+    scales : list of float
+        Multiples of the Kaggle row counts
+    seed : int
+        Generator seed
+    repeat : int
+        Timed repetitions per case
+    only : str, optional
+        fnmatch pattern on case names (e.g. 'dq.check_*')
+    data_root : Path
+        Generated CSVs go to <data_root>/scale_<scale>_seed_<seed> and are reused
+
+    Returns:
+    --------
+    dict : {'meta': {...}, 'results': {scale: {case: summary}}}
+    """
+    meta = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat,
+        'tables': {},
+    }
+    results = {}
+    cwd = os.getcwd()
+    for scale in scales:
+        data_dir = Path(data_root) / f"scale_{scale:g}_seed_{seed}"
+        if verbose:
+            print(f"📊 Scale {scale:g}: generating tables in {data_dir}")
+        csv_files = write_tables(data_dir, scale, seed)
+        meta['tables'][f"{scale:g}"] = {f.replace('.csv', ''): int(round(KAGGLE_ROWS[f.replace('.csv', '')] * scale))
+                                        for f in csv_files}
+        scale_results = {}
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            try:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    cases = build_cases(data_dir.resolve(), csv_files, Path(work_dir))
+                for name, rows, fn in cases:
+                    if only and not fnmatch.fnmatch(name, only):
+                        continue
+                    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                        runs = time_case(fn, repeat)
+                    scale_results[name] = summarize(runs, rows)
+                    if verbose:
+                        s = scale_results[name]
+                        print(f"   {name:<42s} {s['wall_median_s']:9.3f}s median  {s['rows_per_s'] or 0:>14,.0f} rows/s")
+            finally:
+                os.chdir(cwd)
+        results[f"{scale:g}"] = scale_results
+    return {'meta': meta, 'results': results}
+
+
+def compare(baseline, current, tolerance=0.10):
+    """
+    Cases whose median wall time grew by more than `tolerance` (fraction) over the baseline.
+
+    Returns:
+    --------
+    list of dict : scale, case, baseline / current medians and the ratio, slowest first
+    """
+    regressions = []
+    for scale, cases in current['results'].items():
+        base_cases = baseline.get('results', {}).get(scale, {})
+        for name, summary in cases.items():
+            base = base_cases.get(name)
+            if not base or not base.get('wall_median_s'):
+                continue
+            ratio = summary['wall_median_s'] / base['wall_median_s']
+            if ratio > 1 + tolerance:
+                regressions.append({'scale': scale, 'case': name, 'baseline_s': base['wall_median_s'],
+                                    'current_s': summary['wall_median_s'], 'ratio': round(ratio, 3)})
+    return sorted(regressions, key=lambda r: r['ratio'], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DQ checks, profiling and reports on synthetic olist data")
+    parser.add_argument("--scale", type=float, nargs='+', default=[1.0],
+                        help="Multiples of the Kaggle row counts (e.g. 1 10 100)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--only", help="Only cases matching this pattern, e.g. 'dq.check_*'")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Where generated CSVs are cached")
+    parser.add_argument("--compare", help="Earlier results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed median slowdown (fraction)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if --compare finds a regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.scale, args.seed, args.repeat, args.only, Path(args.data_dir))
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Results saved to: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        if not regressions:
+            print(f"✅ No case slower than {args.compare} by more than {args.tolerance:.0%}")
+        for r in regressions:
+            print(f"⚠️  scale {r['scale']} {r['case']}: {r['baseline_s']:.3f}s -> {r['current_s']:.3f}s ({r['ratio']:.2f}x)")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Deterministic Olist-Shaped Synthetic Tables
+Generates orders, order items, geolocation and reviews with the Kaggle dataset's
+column names, dtypes, null rates and rough value distributions, at any multiple of
+the Kaggle row counts (scale=1 ~ 1.3M rows, 10, 100, or fractions for smoke runs).
+The same (scale, seed) always produces the same CSV bytes.
+
+Keys are consistent across tables (every item / review references an order, order
+items reference a pool of product and seller ids) with a small share of orphans and
+out-of-order timestamps, so consistency, conformity and accuracy checks have
+violations to find.
+
+Usage:
+    python benchmarks/synthetic_olist.py --scale 10 --out benchmarks/data/scale_10
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Row counts of the Kaggle CSVs (scale = 1)
+KAGGLE_ROWS = {
+    'olist_orders_dataset': 99_441,
+    'olist_order_items_dataset': 112_650,
+    'olist_geolocation_dataset': 1_000_163,
+    'olist_order_reviews_dataset': 99_224,
+}
+ORDER_STATUSES = ['delivered', 'shipped', 'canceled', 'unavailable', 'invoiced', 'processing', 'created', 'approved']
+ORDER_STATUS_P = [0.970, 0.011, 0.006, 0.006, 0.003, 0.003, 0.0005, 0.0005]
+STATES = ['SP', 'RJ', 'MG', 'RS', 'PR', 'SC', 'BA', 'DF', 'GO', 'ES', 'PE', 'CE', 'PA', 'MT', 'MA', 'MS',
+          'PB', 'PI', 'RN', 'AL', 'SE', 'TO', 'RO', 'AM', 'AC', 'AP', 'RR']
+CITIES = ['sao paulo', 'rio de janeiro', 'belo horizonte', 'brasilia', 'curitiba', 'campinas',
+          'porto alegre', 'salvador', 'guarulhos', 'sao bernardo do campo']
+REVIEW_SCORE_P = [0.115, 0.032, 0.083, 0.193, 0.577]
+_START = np.datetime64('2016-09-04T00:00:00', 's')
+_SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+
+def rows_for(table, scale):
+    return max(int(round(KAGGLE_ROWS[table] * scale)), 1)
+
+
+def _hex_ids(rng, n):
+    """n 32-char lowercase hex ids (the olist id format)."""
+    return np.frombuffer(rng.bytes(16 * n).hex().encode(), dtype='S32').astype(str)
+
+
+def _timestamps(base, seconds):
+    """'YYYY-MM-DD HH:MM:SS' strings (NaN where seconds is NaN), like the Kaggle CSVs."""
+    values = pd.Series(base + pd.to_timedelta(np.floor(seconds), unit='s'))
+    return values.dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _nullify(rng, values, rate):
+    values = pd.Series(values)
+    return values.where(rng.random(len(values)) >= rate)
+
+
+def generate_tables(scale=1.0, seed=0):
+    """
+    Build the four tables in memory.
+
+    Parameters:
+    -----------
+    scale : float
+        Multiple of the Kaggle row counts
+    seed : int
+        RNG seed; equal (scale, seed) give identical tables
+
+    Returns:
+    --------
+    dict : {table name (CSV stem): DataFrame}
+    """
+    rng = np.random.default_rng(seed)
+    n_orders = rows_for('olist_orders_dataset', scale)
+    n_items = rows_for('olist_order_items_dataset', scale)
+    n_geo = rows_for('olist_geolocation_dataset', scale)
+    n_reviews = rows_for('olist_order_reviews_dataset', scale)
+
+    # orders: purchase time, then approval / carrier / delivery lags (some nulls, ~0.5 % out of order)
+    order_ids = _hex_ids(rng, n_orders)
+    purchase = rng.integers(0, _SPAN_SECONDS, n_orders).astype(np.float64)
+    approved = purchase + rng.exponential(10 * 3600, n_orders)
+    carrier = approved + rng.exponential(3 * 86400, n_orders)
+    delivered = carrier + rng.gamma(2.0, 4 * 86400, n_orders)
+    backwards = rng.random(n_orders) < 0.005
+    carrier[backwards] = purchase[backwards] - rng.integers(3600, 86400, backwards.sum())
+    status = rng.choice(ORDER_STATUSES, n_orders, p=ORDER_STATUS_P)
+    undelivered = status != 'delivered'
+    approved[rng.random(n_orders) < 0.0016] = np.nan
+    carrier[undelivered & (rng.random(n_orders) < 0.9)] = np.nan
+    delivered[undelivered | (rng.random(n_orders) < 0.001)] = np.nan
+    estimated = purchase + rng.integers(10, 40, n_orders) * 86400.0
+    orders = pd.DataFrame({
+        'order_id': order_ids,
+        'customer_id': _hex_ids(rng, n_orders),
+        'order_status': status,
+        'order_purchase_timestamp': _timestamps(_START, purchase),
+        'order_approved_at': _timestamps(_START, approved),
+        'order_delivered_carrier_date': _timestamps(_START, carrier),
+        'order_delivered_customer_date': _timestamps(_START, delivered),
+        'order_estimated_delivery_date': _timestamps(_START, estimated - estimated % 86400),
+    })
+
+    # order items: orders drawn at random (0..n items each), zipf-skewed product / seller pools, lognormal prices
+    products = _hex_ids(rng, max(n_items * 33 // 112, 1))
+    sellers = _hex_ids(rng, max(n_items * 3 // 112, 1))
+    item_orders = np.sort(rng.integers(0, n_orders, n_items))
+    first = np.r_[True, item_orders[1:] != item_orders[:-1]]
+    run_start = np.maximum.accumulate(np.where(first, np.arange(n_items), 0))
+    item_order_ids = order_ids[item_orders].copy()
+    orphans = rng.random(n_items) < 0.0005
+    item_order_ids[orphans] = _hex_ids(rng, int(orphans.sum()))
+    price = np.round(rng.lognormal(4.3, 1.0, n_items), 2)
+    price[rng.random(n_items) < 0.0002] *= -1  # a few refunds recorded as negative prices
+    items = pd.DataFrame({
+        'order_id': item_order_ids,
+        'order_item_id': np.arange(n_items) - run_start + 1,
+        'product_id': products[rng.zipf(1.3, n_items) % len(products)],
+        'seller_id': sellers[rng.zipf(1.2, n_items) % len(sellers)],
+        'shipping_limit_date': _timestamps(_START, purchase[item_orders] + 6 * 86400),
+        'price': price,
+        'freight_value': np.round(rng.lognormal(2.8, 0.55, n_items), 2),
+    })
+
+    # geolocation: many rows per zip prefix, coordinates around a per-prefix centre
+    n_zips = max(n_geo // 50, 1)
+    zip_codes = np.sort(rng.choice(np.arange(1000, 99_999), min(n_zips, 98_999), replace=False))
+    zip_state = rng.choice(STATES, len(zip_codes))
+    centre_lat = rng.uniform(-33.7, 5.2, len(zip_codes))
+    centre_lng = rng.uniform(-73.9, -34.8, len(zip_codes))
+    geo_zip = rng.integers(0, len(zip_codes), n_geo)
+    geolocation = pd.DataFrame({
+        'geolocation_zip_code_prefix': zip_codes[geo_zip],
+        'geolocation_lat': centre_lat[geo_zip] + rng.normal(0, 0.02, n_geo),
+        'geolocation_lng': centre_lng[geo_zip] + rng.normal(0, 0.02, n_geo),
+        'geolocation_city': rng.choice(CITIES, n_geo),
+        'geolocation_state': zip_state[geo_zip],
+    })
+
+    # reviews: mostly one per order, skewed scores, mostly empty comment fields
+    review_orders = rng.integers(0, n_orders, n_reviews)
+    created = purchase[review_orders] + rng.integers(5, 30, n_reviews) * 86400.0
+    created -= created % 86400
+    answered = created + rng.exponential(2 * 86400, n_reviews)
+    late = rng.random(n_reviews) < 0.002
+    answered[late] = created[late] - 3600
+    reviews = pd.DataFrame({
+        'review_id': _hex_ids(rng, n_reviews),
+        'order_id': order_ids[review_orders],
+        'review_score': rng.choice(np.arange(1, 6), n_reviews, p=REVIEW_SCORE_P),
+        'review_comment_title': _nullify(rng, rng.choice(['recomendo', 'otimo', 'bom', 'ruim'], n_reviews), 0.88),
+        'review_comment_message': _nullify(rng, rng.choice(['produto chegou antes do prazo', 'nao recebi',
+                                                           'muito bom', 'qualidade ruim'], n_reviews), 0.59),
+        'review_creation_date': _timestamps(_START, created),
+        'review_answer_timestamp': _timestamps(_START, answered),
+    })
+
+    return {
+        'olist_orders_dataset': orders,
+        'olist_order_items_dataset': items,
+        'olist_geolocation_dataset': geolocation,
+        'olist_order_reviews_dataset': reviews,
+    }
+
+
+def write_tables(directory, scale=1.0, seed=0):
+    """
+    Write the tables as <name>.csv into directory, reusing files from an earlier call
+    with the same scale and seed.
+
+    Returns:
+    --------
+    list of str : CSV file names, in KAGGLE_ROWS order
+    """
+    directory = Path(directory)
+    stamp = directory / '.generated'
+    files = [f"{name}.csv" for name in KAGGLE_ROWS]
+    key = f"scale={scale} seed={seed}"
+    if stamp.exists() and stamp.read_text() == key and all((directory / f).exists() for f in files):
+        return files
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, df in generate_tables(scale, seed).items():
+        df.to_csv(directory / f"{name}.csv", index=False)
+    stamp.write_text(key)
+    return files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write olist-shaped synthetic CSVs")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiple of the Kaggle row counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Output directory")
+    args = parser.parse_args()
+    for csv_file in write_tables(args.out, args.scale, args.seed):
+        print(f"✓ {Path(args.out) / csv_file}")
@@ -0,0 +1,56 @@
+{#
+  Helpers shared by the incremental fact models (fact_orders, fact_order_items,
+  fact_payments).
+
+  An order is "touched" when any of its lifecycle timestamps moves, so the
+  latest non-null timestamp is used as the order's event time. Rows whose
+  event time falls inside the lookback window are re-merged on every run,
+  which picks up late-arriving status/delivery updates.
+
+  Override the window with:  dbt build --vars '{"incremental_lookback_days": 7}'
+  Rebuild everything with:   dbt build --full-refresh
+#}
+
+{% macro order_event_ts(purchase, approved, carrier, delivered) -%}
+  GREATEST(
+    {{ purchase }},
+    COALESCE({{ approved }}, {{ purchase }}),
+    COALESCE({{ carrier }}, {{ purchase }}),
+    COALESCE({{ delivered }}, {{ purchase }})
+  )
+{%- endmacro %}
+
+
+{% macro stg_order_event_ts(alias='') -%}
+  {%- set p = alias ~ '.' if alias else '' -%}
+  {{ order_event_ts(
+      p ~ 'order_purchase_timestamp',
+      p ~ 'order_approved_at',
+      p ~ 'order_delivered_carrier_date',
+      p ~ 'order_delivered_customer_date'
+  ) }}
+{%- endmacro %}
+
+
+{% macro incremental_lookback_days() -%}
+  {{ var('incremental_lookback_days', 3) }}
+{%- endmacro %}
+
+
+{#
+  Filter for child facts keyed on order_id (order items, payments): reprocess
+  orders not yet in the target plus orders with activity in the lookback window.
+#}
+{% macro incremental_child_orders_filter(order_id_column='order_id') -%}
+  (
+    {{ order_id_column }} NOT IN (SELECT DISTINCT order_id FROM {{ this }})
+    OR {{ order_id_column }} IN (
+      SELECT order_id
+      FROM {{ ref('stg_orders') }}
+      WHERE {{ stg_order_event_ts() }} >= TIMESTAMP_SUB(
+        (SELECT MAX({{ stg_order_event_ts() }}) FROM {{ ref('stg_orders') }}),
+        INTERVAL {{ incremental_lookback_days() }} DAY
+      )
+    )
+  )
+{%- endmacro %}
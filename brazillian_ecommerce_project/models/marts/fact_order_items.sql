@@ -1,3 +1,14 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key=['order_id', 'order_item_id'],
+    incremental_strategy='merge',
+    on_schema_change='sync_all_columns',
+    partition_by={'field': 'shipping_limit_date', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['seller_id', 'product_id', 'order_id']
+  )
+}}
+
 SELECT 
   {{ dbt_utils.generate_surrogate_key(['order_id'])}} AS order_item_key,
   order_id, 
@@ -9,3 +20,7 @@ SELECT
   freight_value ,
   price + freight_value AS gross_item_value
 FROM {{ ref('stg_order_items') }}
+{% if is_incremental() %}
+  -- Only orders that are new to this table or had activity in the lookback window
+  WHERE {{ incremental_child_orders_filter('order_id') }}
+{% endif %}
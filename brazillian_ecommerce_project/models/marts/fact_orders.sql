@@ -1,3 +1,14 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key='order_id',
+    incremental_strategy='merge',
+    on_schema_change='sync_all_columns',
+    partition_by={'field': 'purchase_ts', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['customer_id', 'order_status']
+  )
+}}
+
 SELECT distinct
   O.order_id, 
   O.customer_id, 
@@ -16,4 +27,15 @@ SELECT distinct
   U.delivery_is_late
   FROM {{ ref('stg_orders') }} O
   LEFT JOIN {{ ref('util_orders_delivery_metrics') }} U
-    ON O.order_id = U.order_id
\ No newline at end of file
+    ON O.order_id = U.order_id
+{% if is_incremental() %}
+  -- New orders and late-arriving updates: anything whose latest lifecycle
+  -- timestamp is within the lookback window of what is already loaded
+  WHERE {{ stg_order_event_ts('O') }} >= (
+    SELECT TIMESTAMP_SUB(
+      MAX({{ order_event_ts('purchase_ts', 'approved_ts', 'delivered_carrier_ts', 'delivered_customer_ts') }}),
+      INTERVAL {{ incremental_lookback_days() }} DAY
+    )
+    FROM {{ this }}
+  )
+{% endif %}
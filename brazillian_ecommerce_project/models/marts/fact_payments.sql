@@ -1,3 +1,13 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key=['order_id', 'payment_sequential'],
+    incremental_strategy='merge',
+    on_schema_change='sync_all_columns',
+    cluster_by=['order_id', 'payment_type']
+  )
+}}
+
 SELECT 
   {{ dbt_utils.generate_surrogate_key(['order_id'])}} AS payment_key,
   order_id, 
@@ -6,4 +16,7 @@ SELECT
   payment_installments, 
   payment_value 
   FROM {{ ref('stg_order_payments') }}
-  
\ No newline at end of file
+{% if is_incremental() %}
+  -- Only orders that are new to this table or had activity in the lookback window
+  WHERE {{ incremental_child_orders_filter('order_id') }}
+{% endif %}
@@ -1,3 +1,10 @@
+{{
+  config(
+    partition_by={'field': 'review_creation_ts', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['order_id', 'review_score']
+  )
+}}
+
 SELECT 
   review_id, 
   order_id, 
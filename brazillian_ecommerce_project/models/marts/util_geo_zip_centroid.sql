@@ -1,57 +1,101 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key='zip_prefix',
+    incremental_strategy='merge',
+    on_schema_change='sync_all_columns'
+  )
+}}
+
 WITH
-  zip_counts AS (
-  -- 1. Count the occurrences of each city and state per zip code prefix
+  zip_point_counts AS (
+  -- 1. Rows per zip code prefix (a single-column scan of the geolocation table)
   SELECT
-    geolocation_zip_code_prefix,
-    geolocation_city,
-    geolocation_state,
-    geolocation_lat,
-    geolocation_lng,
-    COUNT(*) OVER (PARTITION BY geolocation_zip_code_prefix, geolocation_city) AS city_count,
-    COUNT(*) OVER (PARTITION BY geolocation_zip_code_prefix, geolocation_state) AS state_count
+    geolocation_zip_code_prefix AS zip_prefix,
+    COUNT(*) AS geo_point_count
   FROM
     {{ ref('stg_geolocation') }}
+  GROUP BY
+    geolocation_zip_code_prefix
 ),
-  ranked_locations AS (
-  -- 2. Rank the city and state by frequency for each zip code prefix
+  changed_zips AS (
+  -- 2. Zip prefixes to (re)compute: all of them on a full build, otherwise only
+  --    prefixes that are new or whose number of geolocation rows changed. Rows built
+  --    before geo_point_count existed get it as NULL (sync_all_columns) and are
+  --    recomputed once so their count is filled in
   SELECT
-    *,
-    -- Rank cities by frequency (highest count first), then by city name (stable fallback)
-    ROW_NUMBER() OVER (
-        PARTITION BY geolocation_zip_code_prefix
-        ORDER BY city_count DESC, geolocation_city ASC
-    ) AS city_rank,
-    -- Rank states by frequency (highest count first), then by state name (stable fallback)
-    ROW_NUMBER() OVER (
-        PARTITION BY geolocation_zip_code_prefix
-        ORDER BY state_count DESC, geolocation_state ASC
-    ) AS state_rank
+    C.zip_prefix,
+    C.geo_point_count
   FROM
-    zip_counts
+    zip_point_counts C
+{% if is_incremental() %}
+  LEFT JOIN {{ this }} T
+    ON C.zip_prefix = T.zip_prefix
+  WHERE
+    T.zip_prefix IS NULL
+    OR T.geo_point_count IS NULL
+    OR T.geo_point_count != C.geo_point_count
+{% endif %}
 ),
-  selected_location AS (
-  -- 3. Select the single most frequent city and state for each zip code prefix
+  geo AS (
   SELECT
-    geolocation_zip_code_prefix AS zip_prefix,
-    MAX(CASE WHEN city_rank = 1 THEN geolocation_city END) AS selected_city,
-    MAX(CASE WHEN state_rank = 1 THEN geolocation_state END) AS selected_state,
-    geolocation_lat,
-    geolocation_lng
+    G.geolocation_zip_code_prefix AS zip_prefix,
+    G.geolocation_city,
+    G.geolocation_state,
+    G.geolocation_lat,
+    G.geolocation_lng
   FROM
-    ranked_locations
-  GROUP BY
-    geolocation_zip_code_prefix, geolocation_lat, geolocation_lng
+    {{ ref('stg_geolocation') }} G
+  INNER JOIN changed_zips Z
+    ON G.geolocation_zip_code_prefix = Z.zip_prefix
+),
+  city_counts AS (
+  SELECT zip_prefix, geolocation_city, COUNT(*) AS city_count
+  FROM geo
+  GROUP BY zip_prefix, geolocation_city
+),
+  state_counts AS (
+  SELECT zip_prefix, geolocation_state, COUNT(*) AS state_count
+  FROM geo
+  GROUP BY zip_prefix, geolocation_state
+),
+  selected_city AS (
+  -- 3. Most frequent city per zip prefix (alphabetical tie-break)
+  SELECT
+    zip_prefix,
+    ARRAY_AGG(geolocation_city IGNORE NULLS ORDER BY city_count DESC, geolocation_city ASC LIMIT 1)[SAFE_OFFSET(0)] AS city
+  FROM city_counts
+  GROUP BY zip_prefix
+),
+  selected_state AS (
+  -- 4. Most frequent state per zip prefix (alphabetical tie-break)
+  SELECT
+    zip_prefix,
+    ARRAY_AGG(geolocation_state IGNORE NULLS ORDER BY state_count DESC, geolocation_state ASC LIMIT 1)[SAFE_OFFSET(0)] AS state
+  FROM state_counts
+  GROUP BY zip_prefix
+),
+  centroid AS (
+  -- 5. Centroid over the distinct coordinates of each zip prefix
+  SELECT
+    zip_prefix,
+    AVG(CAST(geolocation_lat AS FLOAT64)) AS latitude,
+    AVG(CAST(geolocation_lng AS FLOAT64)) AS longitude
+  FROM (
+    SELECT DISTINCT zip_prefix, geolocation_lat, geolocation_lng
+    FROM geo
+  )
+  GROUP BY zip_prefix
 )
--- 4. Final aggregation to get the required outputs, now with explicit casting
 SELECT
-  zip_prefix,
-  ANY_VALUE(selected_city) AS city,
-  ANY_VALUE(selected_state) AS state,
-  AVG(CAST(geolocation_lat AS FLOAT64)) AS latitude,
-  AVG(CAST(geolocation_lng AS FLOAT64)) AS longitude
+  Z.zip_prefix,
+  SC.city,
+  SS.state,
+  CE.latitude,
+  CE.longitude,
+  Z.geo_point_count
 FROM
-  selected_location
-GROUP BY
-  zip_prefix
-ORDER BY
-  zip_prefix
\ No newline at end of file
+  changed_zips Z
+LEFT JOIN selected_city SC ON Z.zip_prefix = SC.zip_prefix
+LEFT JOIN selected_state SS ON Z.zip_prefix = SS.zip_prefix
+LEFT JOIN centroid CE ON Z.zip_prefix = CE.zip_prefix
@@ -0,0 +1,161 @@
+"""
+Shared Numeric Column Statistics Cache
+Quantiles, mean, std, min, max and MAD for numeric columns, computed in one
+partition-based pass (a single np.quantile call selects every quantile at once)
+and cached by a content fingerprint of the column. Both the DQ accuracy check
+(run_dq_check.py) and the profiler (data_profiling_analysis.py) read from the same
+on-disk cache, so unchanged data is never re-sorted.
+
+Outlier methods work on the cached stats:
+    iqr    : Q1 - k*IQR .. Q3 + k*IQR            (default k = 1.5)
+    mad    : |x - median| <= k * 1.4826 * MAD    (default k = 3.5)
+    zscore : |x - mean|   <= k * std             (default k = 3)
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CACHE_FILE = Path("data_profiling_output/column_stats.json")
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+OUTLIER_METHODS = {'iqr': 1.5, 'mad': 3.5, 'zscore': 3.0}
+MAX_ENTRIES = 5000
+_MAD_SCALE = 1.4826  # MAD -> std for normal data
+
+
+def column_fingerprint(series):
+    """Content hash of a column (values + dtype), independent of the row index."""
+    hashed = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    # Order-sensitive combine of the per-row hashes
+    weights = np.arange(1, len(hashed) + 1, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        digest = int(np.bitwise_xor.reduce(hashed * weights)) if len(hashed) else 0
+    return f"{series.dtype}:{len(hashed)}:{digest:016x}"
+
+
+def compute_stats(series):
+    """
+    One pass of statistics for a numeric column (nulls dropped).
+
+    Returns:
+    --------
+    dict : count, mean, std, min, max, mad and q<percent> for each of QUANTILES
+           (values None when the column has no non-null values)
+    """
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values)]
+    stats = {'count': int(len(values))}
+    if len(values) == 0:
+        stats.update({k: None for k in ('mean', 'std', 'min', 'max', 'mad')})
+        stats.update({_q_key(q): None for q in QUANTILES})
+        return stats
+    quantiles = np.quantile(values, QUANTILES)
+    median = float(quantiles[QUANTILES.index(0.5)])
+    stats.update({
+        'mean': float(values.mean()),
+        'std': float(values.std(ddof=1)) if len(values) > 1 else None,
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'mad': float(np.median(np.abs(values - median))),
+    })
+    stats.update({_q_key(q): float(v) for q, v in zip(QUANTILES, quantiles)})
+    return stats
+
+
+def _q_key(q):
+    return f"q{int(round(q * 100)):02d}"
+
+
+def outlier_bounds(stats, method='iqr', k=None):
+    """(low, high) inlier bounds for an outlier method, or None if not computable."""
+    if method not in OUTLIER_METHODS:
+        raise ValueError(f"Unknown outlier method '{method}'; expected one of {sorted(OUTLIER_METHODS)}")
+    k = OUTLIER_METHODS[method] if k is None else float(k)
+    if stats['count'] == 0:
+        return None
+    if method == 'iqr':
+        iqr = stats['q75'] - stats['q25']
+        return stats['q25'] - k * iqr, stats['q75'] + k * iqr
+    if method == 'mad':
+        spread = k * _MAD_SCALE * stats['mad']
+        return stats['q50'] - spread, stats['q50'] + spread
+    if stats['std'] is None:
+        return stats['mean'], stats['mean']
+    return stats['mean'] - k * stats['std'], stats['mean'] + k * stats['std']
+
+
+def count_inliers(series, bounds):
+    """Values inside [low, high]; nulls never count."""
+    if bounds is None:
+        return 0
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        return int(((values >= bounds[0]) & (values <= bounds[1])).sum())
+
+
+class StatsCache:
+    """
+    Fingerprint -> stats, persisted as JSON; least recently used entries are dropped
+    past MAX_ENTRIES. Safe to share between threads (e.g. dq_service workers).
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = Path(path) if path is not None else None
+        self.entries = {}
+        self._new_keys = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, series):
+        key = column_fingerprint(series)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            entry = {'stats': compute_stats(series)}
+            with self._lock:
+                self.misses += 1
+                self.entries[key] = entry
+                self._new_keys.append(key)
+        else:
+            with self._lock:
+                self.hits += 1
+        entry['used'] = time.time()
+        return entry['stats']
+
+    def drain_new(self):
+        """Entries computed since the last drain (profiling workers ship these to the parent)."""
+        with self._lock:
+            new = {key: self.entries[key] for key in self._new_keys if key in self.entries}
+            self._new_keys = []
+        return new
+
+    def merge(self, entries):
+        """Adopt entries computed by another process; they count as misses here."""
+        with self._lock:
+            self.entries.update(entries)
+            self.misses += len(entries)
+
+    def save(self):
+        if self.path is None:
+            return None
+        with self._lock:
+            if len(self.entries) > MAX_ENTRIES:
+                keep = sorted(self.entries, key=lambda k: self.entries[k].get('used', 0), reverse=True)[:MAX_ENTRIES]
+                self.entries = {k: self.entries[k] for k in keep}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            tmp_path.replace(self.path)
+        return self.path
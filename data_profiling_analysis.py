@@ -5,15 +5,28 @@ This script performs extensive profiling on all CSV files with statistical and v
 
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 from pathlib import Path
+from string import Template
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import os
+import sys
+import tempfile
 import warnings
+from column_stats import StatsCache, compute_stats
+from dq_drift import DRIFT_DIR, record_sketches
+from profile_bins import BINS_FILE, PlotBins
+from profile_sketches import approximate_metrics
+from profile_stages import StageInputs, stats_frame, table_totals
+from profile_store import PROFILE_FILE, ProfileStore, write_profile_artifact
+from pipeline_trace import NULL_TRACER, Tracer
 warnings.filterwarnings('ignore')
 
-# Set style for better visualizations
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (15, 8)
+try:
+    import pyarrow as pa
+except ImportError:  # parallel profiling needs Arrow for the shared column buffers
+    pa = None
 
 # Define data directory
 DATA_DIR = Path("data/kaggle-raw")
@@ -31,8 +44,15 @@ CSV_FILES = [
     "product_category_name_translation.csv"
 ]
 
+TRACE_FILE = Path("data_profiling_output/profile_trace.json")
+# Per-table rows / columns / memory, so the reports can be rebuilt without the CSVs
+TABLE_STATS_FILE = Path("data_profiling_output/table_stats.csv")
 
-def calculate_column_profile(df, column_name, table_name):
+# approximate='auto' sketches tables at least this long (geolocation, order/customer IDs)
+APPROX_MIN_ROWS = 50_000
+
+
+def calculate_column_profile(df, column_name, table_name, stats_cache=None, approximate=False):
     """
     Calculate comprehensive profiling metrics for a single column.
     
@@ -44,6 +64,12 @@ def calculate_column_profile(df, column_name, table_name):
         Name of the column to profile
     table_name : str
         Name of the table/dataset
+    stats_cache : StatsCache, optional
+        Shared numeric stats cache (also used by the DQ accuracy check)
+    approximate : bool
+        Use bounded-memory sketches (profile_sketches) for distinct count, top values
+        and quartiles; their error bounds are recorded next to the metrics and
+        unique_count / lowest_frequency are left empty
         
     Returns:
     --------
@@ -64,9 +90,15 @@ def calculate_column_profile(df, column_name, table_name):
     }
     
     # Distinct count and uniqueness
-    profile['distinct_count'] = col_data.nunique()
-    profile['unique_count'] = (col_data.value_counts() == 1).sum()
-    profile['not_unique_count'] = total_count - profile['unique_count']
+    sketch = approximate_metrics(col_data) if approximate else None
+    if sketch is not None:
+        profile['distinct_count'] = min(sketch['distinct_count'], int(profile['not_null_count']))
+        profile['unique_count'] = None  # needs exact per-value counts
+        profile['not_unique_count'] = None
+    else:
+        profile['distinct_count'] = col_data.nunique()
+        profile['unique_count'] = (col_data.value_counts() == 1).sum()
+        profile['not_unique_count'] = total_count - profile['unique_count']
     profile['percent_distinct'] = (profile['distinct_count'] / total_count * 100) if total_count > 0 else 0
     
     # Remove null values for further analysis
@@ -76,19 +108,22 @@ def calculate_column_profile(df, column_name, table_name):
     if pd.api.types.is_numeric_dtype(col_data):
         profile['min_value'] = col_data_clean.min() if len(col_data_clean) > 0 else None
         profile['max_value'] = col_data_clean.max() if len(col_data_clean) > 0 else None
-        profile['mean'] = col_data_clean.mean() if len(col_data_clean) > 0 else None
-        profile['median'] = col_data_clean.median() if len(col_data_clean) > 0 else None
-        profile['std_dev'] = col_data_clean.std() if len(col_data_clean) > 0 else None
-        
-        # Quantiles
-        if len(col_data_clean) > 0:
-            profile['q1_25'] = col_data_clean.quantile(0.25)
-            profile['q2_50_median'] = col_data_clean.quantile(0.50)
-            profile['q3_75'] = col_data_clean.quantile(0.75)
+        if sketch is not None:
+            profile['mean'] = col_data_clean.mean() if len(col_data_clean) > 0 else None
+            profile['median'] = sketch['q2_50_median']
+            profile['std_dev'] = col_data_clean.std() if len(col_data_clean) > 0 else None
+            profile['q1_25'] = sketch['q1_25']
+            profile['q2_50_median'] = sketch['q2_50_median']
+            profile['q3_75'] = sketch['q3_75']
         else:
-            profile['q1_25'] = None
-            profile['q2_50_median'] = None
-            profile['q3_75'] = None
+            # Mean / std / quantiles from one partition pass, cached by column content
+            stats = stats_cache.get(col_data) if stats_cache is not None else compute_stats(col_data)
+            profile['mean'] = stats['mean']
+            profile['median'] = stats['q50']
+            profile['std_dev'] = stats['std']
+            profile['q1_25'] = stats['q25']
+            profile['q2_50_median'] = stats['q50']
+            profile['q3_75'] = stats['q75']
         
         # Count zeros
         profile['zero_count'] = (col_data == 0).sum()
@@ -133,7 +168,14 @@ def calculate_column_profile(df, column_name, table_name):
             profile['avg_size'] = None
     
     # Frequency analysis (for all types)
-    if len(col_data_clean) > 0:
+    if sketch is not None and len(col_data_clean) > 0:
+        # No counter survives when every value is rarer than frequency_error (e.g. ID columns)
+        profile['most_frequent_value'] = sketch['top_values'][0] if sketch['top_values'] else None
+        profile['highest_frequency'] = sketch['top_frequencies'][0] if sketch['top_frequencies'] else 0
+        profile['lowest_frequency'] = None  # not tracked by the heavy-hitter sketch
+        profile['top_10_values'] = sketch['top_values']
+        profile['top_10_frequencies'] = sketch['top_frequencies']
+    elif len(col_data_clean) > 0:
         value_counts = col_data.value_counts()
         profile['most_frequent_value'] = value_counts.index[0] if len(value_counts) > 0 else None
         profile['highest_frequency'] = value_counts.iloc[0] if len(value_counts) > 0 else 0
@@ -150,49 +192,212 @@ def calculate_column_profile(df, column_name, table_name):
         profile['top_10_values'] = []
         profile['top_10_frequencies'] = []
     
+    # Error bounds (0 = exact): distinct count std error, max frequency undercount, quartile rank error
+    is_numeric = pd.api.types.is_numeric_dtype(col_data)
+    profile['profile_mode'] = 'approximate' if sketch is not None else 'exact'
+    profile['distinct_count_error'] = sketch['distinct_count_error'] if sketch is not None else 0.0
+    profile['frequency_error'] = sketch['frequency_error'] if sketch is not None else 0
+    if sketch is not None:
+        profile['quantile_rank_error'] = sketch['quantile_rank_error']
+    else:
+        profile['quantile_rank_error'] = 0.0 if is_numeric else None
+    
     return profile
 
 
-def profile_all_datasets():
+# Per-worker state: memory-mapped Arrow tables by path and a read-only stats cache copy
+_WORKER = {'tables': {}, 'stats_cache': None}
+
+
+def _share_table(df, path):
+    """
+    Write a table once as an uncompressed Arrow IPC file. Workers memory-map these
+    files, so column buffers are shared through the page cache instead of being
+    pickled per task.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_shared_table(path):
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+def _init_profile_worker(stats_cache_path):
+    _WORKER['tables'] = {}
+    _WORKER['stats_cache'] = StatsCache(stats_cache_path) if stats_cache_path else None
+
+
+def _profile_unit(unit):
+    """
+    Profile one (table, column) work unit from the memory-mapped table.
+
+    Returns:
+    --------
+    tuple : (profile, new stats entries, error) -- a failure is returned as its message
+            (profile None) so it fails only its own table, as in serial mode
+    """
+    table_name, column_name, path, approximate = unit
+    stats_cache = _WORKER['stats_cache']
+    try:
+        tables = _WORKER['tables']
+        if path not in tables:
+            tables[path] = _read_shared_table(path)
+        column_df = tables[path].select([column_name]).to_pandas()
+        profile = calculate_column_profile(column_df, column_name, table_name, stats_cache, approximate)
+    except Exception as e:
+        return None, {}, f"{column_name}: {e}"
+    return profile, stats_cache.drain_new() if stats_cache is not None else {}, None
+
+
+def _use_approximate(approximate, n_rows):
+    """Resolve the profiling mode ('off' / 'on' / 'auto', or a bool) for a table of n_rows."""
+    if approximate == 'auto':
+        return n_rows >= APPROX_MIN_ROWS
+    return approximate in (True, 'on')
+
+
+def _profile_parallel(shared, workers, stats_cache=None, approximate='off'):
+    """
+    Profile every column of the shared tables on a process pool, in (table, column) order.
+
+    Parameters:
+    -----------
+    shared : dict
+        table name -> (IPC file path, column names, row count), in output order
+
+    Returns:
+    --------
+    tuple : (profiles of the tables whose columns all succeeded, {table name: first error})
+    """
+    units = [(table_name, column, path, _use_approximate(approximate, n_rows))
+             for table_name, (path, columns, n_rows) in shared.items() for column in columns]
+    cache_path = stats_cache.path if stats_cache is not None else None
+    chunksize = max(1, len(units) // (workers * 4))
+    profiles, failed = [], {}
+    with ProcessPoolExecutor(workers, initializer=_init_profile_worker, initargs=(cache_path,)) as pool:
+        # map() yields in submission order, so profile_df is deterministic
+        for unit, (profile, entries, error) in zip(units, pool.map(_profile_unit, units, chunksize=chunksize)):
+            if error is not None:
+                failed.setdefault(unit[0], error)
+                continue
+            profiles.append(profile)
+            if stats_cache is not None:
+                stats_cache.merge(entries)
+    return [p for p in profiles if p['table_name'] not in failed], failed
+
+
+def profile_all_datasets(stats_cache=None, workers=1, data_dir=DATA_DIR, csv_files=CSV_FILES, approximate='off',
+                         tracer=NULL_TRACER, stages=None):
     """
     Profile all CSV files and return a comprehensive DataFrame with all metrics.
     
+    Parameters:
+    -----------
+    stats_cache : StatsCache, optional
+        Shared numeric stats cache; unchanged columns skip their quantile pass
+    workers : int
+        Processes for column profiling; 1 profiles serially, 0 uses every core.
+        Parallel mode needs pyarrow and falls back to serial without it.
+    data_dir : Path
+        Directory holding the CSV files
+    csv_files : list of str
+        CSV files to profile, in output order
+    approximate : str or bool
+        'off' (exact), 'on' (sketch every column) or 'auto' (sketch tables with at
+        least APPROX_MIN_ROWS rows)
+    tracer : Tracer
+        Receives a span per CSV load, table and (serial mode) column
+    stages : StageInputs, optional
+        Receives each table right after it is profiled; the table is then released
+        instead of being kept in the returned datasets
+    
     Returns:
     --------
-    pd.DataFrame : DataFrame containing profiling results for all columns in all tables
+    tuple : (profile DataFrame with one row per column of every table,
+             dict of the loaded DataFrames - empty when `stages` is given)
     """
     all_profiles = []
     datasets = {}
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and pa is None:
+        print("⚠️  pyarrow not installed - profiling serially")
+        workers = 1
+    # Parallel mode: each table is written to an Arrow file as it loads, profiled by the pool later
+    shared_dir = tempfile.TemporaryDirectory(prefix="profiling_") if workers > 1 else None
+    shared = {}
     
     print("=" * 80)
     print("STARTING DATA PROFILING ANALYSIS")
     print("=" * 80)
     print()
     
-    for csv_file in CSV_FILES:
-        file_path = DATA_DIR / csv_file
-        table_name = csv_file.replace('.csv', '')
-        
-        print(f"Processing: {table_name}")
-        
-        try:
-            # Read the CSV file
-            df = pd.read_csv(file_path)
-            datasets[table_name] = df
+    try:
+        for csv_file in csv_files:
+            file_path = Path(data_dir) / csv_file
+            table_name = csv_file.replace('.csv', '')
             
-            print(f"  - Shape: {df.shape}")
-            print(f"  - Columns: {len(df.columns)}")
-            
-            # Profile each column
-            for column in df.columns:
-                profile = calculate_column_profile(df, column, table_name)
-                all_profiles.append(profile)
+            print(f"Processing: {table_name}")
             
+            try:
+                # Read the CSV file
+                with tracer.span('load_csv', category='table', table=table_name):
+                    df = pd.read_csv(file_path)
+                
+                print(f"  - Shape: {df.shape}")
+                print(f"  - Columns: {len(df.columns)}")
+                
+                # Profile each column (parallel mode profiles all tables at once below)
+                approx = _use_approximate(approximate, len(df))
+                if approx:
+                    print(f"  - Approximate mode: sketches for distinct counts, top values and quartiles")
+                if workers == 1:
+                    profiles = []
+                    with tracer.span('profile_table', category='table', table=table_name, rows=len(df)):
+                        for column in df.columns:
+                            with tracer.span('profile_column', category='column', table=table_name, column=column):
+                                profiles.append(calculate_column_profile(df, column, table_name, stats_cache, approx))
+                    all_profiles.extend(profiles)
+                    if stages is not None:
+                        with tracer.span('stage_inputs', category='table', table=table_name):
+                            stages.add(table_name, df, profiles)
+                else:
+                    path = os.path.join(shared_dir.name, f"{table_name}.arrow")
+                    _share_table(df, path)
+                    shared[table_name] = (path, list(df.columns), len(df))
+                if stages is None:
+                    datasets[table_name] = df
+                del df
+                
+                print(f"  ✓ Completed\n")
+                
+            except Exception as e:
+                print(f"  ✗ Error reading {csv_file}: {str(e)}\n")
+                continue
+        
+        if shared:
+            n_columns = sum(len(columns) for _, columns, _ in shared.values())
+            print(f"Profiling {n_columns} columns on {workers} worker processes...")
+            with tracer.span('profile_parallel', category='table', columns=n_columns, workers=workers):
+                all_profiles, failed = _profile_parallel(shared, workers, stats_cache, approximate)
+            # A failing column drops its whole table, like an error while profiling it serially
+            for table_name, error in failed.items():
+                print(f"  ✗ Error reading {table_name}.csv: {error}")
+                del shared[table_name]
+                datasets.pop(table_name, None)
             print(f"  ✓ Completed\n")
-            
-        except Exception as e:
-            print(f"  ✗ Error reading {csv_file}: {str(e)}\n")
-            continue
+            if stages is not None:
+                # Stages need the profiles, so tables come back one at a time from their Arrow files
+                for table_name, (path, _, _) in shared.items():
+                    with tracer.span('stage_inputs', category='table', table=table_name):
+                        df = _read_shared_table(path).to_pandas()
+                        profiles = [p for p in all_profiles if p['table_name'] == table_name]
+                        stages.add(table_name, df, profiles)
+                        del df
+    finally:
+        if shared_dir is not None:
+            shared_dir.cleanup()
     
     # Create DataFrame from all profiles
     profile_df = pd.DataFrame(all_profiles)
@@ -200,7 +405,45 @@ def profile_all_datasets():
     return profile_df, datasets
 
 
-def create_profiling_visualizations(profile_df, datasets):
+def _binned_kde(hist):
+    """Gaussian KDE evaluated at the bin centers by smoothing the counts (Scott's bandwidth)."""
+    counts, edges = hist['counts'].astype(np.float64), hist['edges']
+    width = edges[1] - edges[0]
+    if not hist['std'] > 0 or len(counts) < 3:
+        return counts
+    sigma = hist['std'] * hist['n'] ** (-1 / 5) / width  # bandwidth in bins
+    half = min(int(4 * sigma) + 1, len(counts) - 1)
+    kernel = np.exp(-0.5 * (np.arange(-half, half + 1) / sigma) ** 2)
+    # 'full' then trim: mode='same' returns the longer input when the kernel is wider than the bins
+    return np.convolve(counts, kernel / kernel.sum(), mode='full')[half:half + len(counts)]
+
+
+def _pyplot():
+    """
+    pyplot and seaborn with the report style, imported on first use so metrics-only
+    runs never load them. Figures are only saved, so pyplot starts on the headless
+    Agg backend (unless the caller already imported it with another backend).
+    """
+    import matplotlib
+    if 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (15, 8)
+    return plt, sns
+
+
+def _plot_hexbin(hexbin, cmap):
+    """Redraw precomputed hexbin cells: each center falls back into its own hexagon."""
+    plt, _ = _pyplot()
+    hb = plt.hexbin(hexbin['x'], hexbin['y'], C=hexbin['counts'], reduce_C_function=np.sum,
+                    gridsize=int(hexbin['gridsize']), extent=tuple(hexbin['extent']),
+                    bins='log', cmap=cmap, mincnt=1)
+    plt.colorbar(hb, label='Rows (log scale)')
+
+
+def create_profiling_visualizations(profile_df, datasets, bins=None):
     """
     Create comprehensive visualizations for the profiling results.
     
@@ -210,7 +453,12 @@ def create_profiling_visualizations(profile_df, datasets):
         DataFrame containing all profiling results
     datasets : dict
         Dictionary of all loaded datasets
+    bins : PlotBins, optional
+        Precomputed histogram / hexbin / review-score arrays (binned from datasets if None)
     """
+    if bins is None:
+        bins = PlotBins.compute(datasets)
+    plt, sns = _pyplot()
     print("\n" + "=" * 80)
     print("GENERATING VISUALIZATIONS")
     print("=" * 80)
@@ -332,46 +580,32 @@ def create_profiling_visualizations(profile_df, datasets):
         print("✓ Saved: 06_quality_heatmap_part2.png")
         plt.close()
     
-    # 6. Numeric Distributions (for selected numeric columns)
-    numeric_cols = profile_df[profile_df['data_type'].str.contains('int|float', case=False, na=False)]
-    
-    for table_name, dataset in datasets.items():
-        numeric_columns = dataset.select_dtypes(include=[np.number]).columns
+    # 6. Numeric Distributions (for selected numeric columns), from the precomputed histograms
+    for table_name, hists in bins.hists.items():
+        numeric_columns = list(hists)
         
         if len(numeric_columns) > 0:
             n_cols = min(len(numeric_columns), 6)  # Max 6 columns per plot
             n_rows = (n_cols + 2) // 3
             
             fig, axes = plt.subplots(n_rows, 3, figsize=(18, 5 * n_rows))
+            axes = np.atleast_1d(axes).flatten()
             
-            # Handle different subplot configurations
-            if n_rows > 1:
-                axes = axes.flatten()
-            elif n_rows == 1 and isinstance(axes, np.ndarray):
-                axes = axes
-            else:
-                axes = [axes]
-            
-            for idx, col in enumerate(numeric_columns[:6]):
-                if isinstance(axes, np.ndarray):
-                    ax = axes[idx]
-                else:
-                    ax = axes[idx] if isinstance(axes, list) else axes
-                    
-                data = dataset[col].dropna()
-                
-                if len(data) > 0:
-                    sns.histplot(data, kde=True, ax=ax, color='skyblue', edgecolor='black')
-                    ax.set_title(f'{col}\n(mean: {data.mean():.2f}, std: {data.std():.2f})', 
-                                fontsize=10)
-                    ax.set_xlabel('')
-                    ax.set_ylabel('Frequency')
+            for ax, col in zip(axes, numeric_columns[:6]):
+                hist = hists[col]
+                edges, counts = hist['edges'], hist['counts']
+                ax.stairs(counts, edges, fill=True, color='skyblue', alpha=0.6)
+                ax.stairs(counts, edges, color='black', linewidth=0.5)
+                centers = (edges[:-1] + edges[1:]) / 2
+                ax.plot(centers, _binned_kde(hist), color='skyblue', linewidth=2)
+                ax.set_title(f"{col}\n(mean: {hist['mean']:.2f}, std: {hist['std']:.2f})", 
+                            fontsize=10)
+                ax.set_xlabel('')
+                ax.set_ylabel('Frequency')
             
             # Hide unused subplots
-            axes_list = axes if isinstance(axes, (list, np.ndarray)) else [axes]
-            for idx in range(len(numeric_columns[:6]), len(axes_list)):
-                if isinstance(axes_list, np.ndarray) or isinstance(axes_list, list):
-                    axes_list[idx].axis('off')
+            for ax in axes[len(numeric_columns[:6]):]:
+                ax.axis('off')
             
             plt.suptitle(f'Numeric Column Distributions: {table_name}', 
                         fontsize=14, fontweight='bold', y=1.00)
@@ -380,82 +614,97 @@ def create_profiling_visualizations(profile_df, datasets):
             print(f"✓ Saved: 07_distributions_{table_name}.png")
             plt.close()
     
-    # 7. Scatter plots for numeric relationships
-    print("\n  Creating scatter plots for numeric relationships...")
+    # 7. Hexbin density plots for numeric relationships (every row, binned once)
+    print("\n  Creating hexbin plots for numeric relationships...")
     
     # Orders dataset - price vs freight
-    if 'olist_order_items_dataset' in datasets:
-        df_items = datasets['olist_order_items_dataset']
-        if 'price' in df_items.columns and 'freight_value' in df_items.columns:
-            plt.figure(figsize=(12, 8))
-            sample_size = min(5000, len(df_items))
-            sample_data = df_items.sample(n=sample_size, random_state=42)
-            
-            plt.scatter(sample_data['price'], sample_data['freight_value'], 
-                       alpha=0.5, s=20, c='steelblue', edgecolors='black', linewidth=0.5)
-            plt.xlabel('Price', fontsize=12)
-            plt.ylabel('Freight Value', fontsize=12)
-            plt.title('Price vs Freight Value (Order Items)', fontsize=16, fontweight='bold')
-            plt.grid(True, alpha=0.3)
-            
-            # Add correlation
-            corr = sample_data[['price', 'freight_value']].corr().iloc[0, 1]
-            plt.text(0.05, 0.95, f'Correlation: {corr:.3f}', 
-                    transform=plt.gca().transAxes, fontsize=12,
-                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-            
-            plt.tight_layout()
-            plt.savefig(output_dir / '08_scatter_price_vs_freight.png', dpi=300, bbox_inches='tight')
-            print("✓ Saved: 08_scatter_price_vs_freight.png")
-            plt.close()
+    if 'price_vs_freight' in bins.hexbins:
+        hexbin = bins.hexbins['price_vs_freight']
+        plt.figure(figsize=(12, 8))
+        _plot_hexbin(hexbin, 'Blues')
+        plt.xlabel('Price', fontsize=12)
+        plt.ylabel('Freight Value', fontsize=12)
+        plt.title('Price vs Freight Value (Order Items)', fontsize=16, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        
+        # Add correlation
+        plt.text(0.05, 0.95, f"Correlation: {hexbin['corr']:.3f}", 
+                transform=plt.gca().transAxes, fontsize=12,
+                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+        
+        plt.tight_layout()
+        plt.savefig(output_dir / '08_scatter_price_vs_freight.png', dpi=300, bbox_inches='tight')
+        print("✓ Saved: 08_scatter_price_vs_freight.png")
+        plt.close()
     
     # Payments dataset - payment value vs installments
-    if 'olist_order_payments_dataset' in datasets:
-        df_payments = datasets['olist_order_payments_dataset']
-        if 'payment_value' in df_payments.columns and 'payment_installments' in df_payments.columns:
-            plt.figure(figsize=(12, 8))
-            sample_size = min(5000, len(df_payments))
-            sample_data = df_payments.sample(n=sample_size, random_state=42)
-            
-            plt.scatter(sample_data['payment_installments'], sample_data['payment_value'], 
-                       alpha=0.5, s=20, c='coral', edgecolors='black', linewidth=0.5)
-            plt.xlabel('Payment Installments', fontsize=12)
-            plt.ylabel('Payment Value', fontsize=12)
-            plt.title('Payment Installments vs Payment Value', fontsize=16, fontweight='bold')
-            plt.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            plt.savefig(output_dir / '09_scatter_installments_vs_value.png', dpi=300, bbox_inches='tight')
-            print("✓ Saved: 09_scatter_installments_vs_value.png")
-            plt.close()
+    if 'installments_vs_value' in bins.hexbins:
+        plt.figure(figsize=(12, 8))
+        _plot_hexbin(bins.hexbins['installments_vs_value'], 'Oranges')
+        plt.xlabel('Payment Installments', fontsize=12)
+        plt.ylabel('Payment Value', fontsize=12)
+        plt.title('Payment Installments vs Payment Value', fontsize=16, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(output_dir / '09_scatter_installments_vs_value.png', dpi=300, bbox_inches='tight')
+        print("✓ Saved: 09_scatter_installments_vs_value.png")
+        plt.close()
     
     # Reviews dataset - score distribution
-    if 'olist_order_reviews_dataset' in datasets:
-        df_reviews = datasets['olist_order_reviews_dataset']
-        if 'review_score' in df_reviews.columns:
-            plt.figure(figsize=(12, 8))
-            score_counts = df_reviews['review_score'].value_counts().sort_index()
-            
-            sns.barplot(x=score_counts.index, y=score_counts.values, palette='coolwarm')
-            plt.xlabel('Review Score', fontsize=12)
-            plt.ylabel('Count', fontsize=12)
-            plt.title('Distribution of Review Scores', fontsize=16, fontweight='bold')
-            
-            # Add percentages on bars
-            total = score_counts.sum()
-            for i, (idx, val) in enumerate(score_counts.items()):
-                plt.text(i, val, f'{val:,}\n({val/total*100:.1f}%)', 
-                        ha='center', va='bottom', fontsize=10)
-            
-            plt.tight_layout()
-            plt.savefig(output_dir / '10_review_score_distribution.png', dpi=300, bbox_inches='tight')
-            print("✓ Saved: 10_review_score_distribution.png")
-            plt.close()
+    if bins.review_scores is not None:
+        plt.figure(figsize=(12, 8))
+        scores, counts = bins.review_scores['values'], bins.review_scores['counts']
+        
+        sns.barplot(x=scores, y=counts, palette='coolwarm')
+        plt.xlabel('Review Score', fontsize=12)
+        plt.ylabel('Count', fontsize=12)
+        plt.title('Distribution of Review Scores', fontsize=16, fontweight='bold')
+        
+        # Add percentages on bars
+        total = counts.sum()
+        for i, val in enumerate(counts):
+            plt.text(i, val, f'{val:,}\n({val/total*100:.1f}%)', 
+                    ha='center', va='bottom', fontsize=10)
+        
+        plt.tight_layout()
+        plt.savefig(output_dir / '10_review_score_distribution.png', dpi=300, bbox_inches='tight')
+        print("✓ Saved: 10_review_score_distribution.png")
+        plt.close()
     
     print()
 
 
-def generate_summary_report(profile_df, datasets):
+def dataset_stats(datasets):
+    """
+    Shape and deep memory usage of every dataset, computed once and shared by the
+    summary and HTML reports (main gets the same frame from StageInputs.table_stats).
+    
+    Returns:
+    --------
+    pd.DataFrame : rows, columns, memory_mb indexed by table name (datasets order)
+    """
+    return stats_frame({table_name: table_totals(df) for table_name, df in datasets.items()})
+
+
+def typed_profile(profile_df):
+    """
+    Profile frame prepared once for the summary sections: categorical names/dtypes,
+    a `table.column` label and a numeric dtype-class flag (classified per distinct dtype).
+    """
+    typed = profile_df.copy()
+    typed['label'] = typed['table_name'].astype(str) + '.' + typed['column_name'].astype(str)
+    typed['data_type'] = typed['data_type'].astype('category')
+    numeric_types = [t for t in typed['data_type'].cat.categories if 'int' in t.lower() or 'float' in t.lower()]
+    typed['is_numeric'] = typed['data_type'].isin(numeric_types).to_numpy()
+    return typed
+
+
+def _fmt(series, spec):
+    return series.map(spec.format)
+
+
+def generate_summary_report(profile_df, datasets, table_stats=None):
     """
     Generate a comprehensive summary of findings from the data profiling.
     
@@ -465,11 +714,17 @@ def generate_summary_report(profile_df, datasets):
         DataFrame containing all profiling results
     datasets : dict
         Dictionary of all loaded datasets
+    table_stats : pd.DataFrame, optional
+        Output of dataset_stats (computed here if not given)
         
     Returns:
     --------
     str : Formatted summary report
     """
+    typed = typed_profile(profile_df)
+    table_stats = dataset_stats(datasets) if table_stats is None else table_stats
+    numeric = typed[typed['is_numeric']]
+    
     summary = []
     summary.append("\n" + "=" * 80)
     summary.append("DATA PROFILING SUMMARY OF FINDINGS")
@@ -477,24 +732,20 @@ def generate_summary_report(profile_df, datasets):
     summary.append("")
     
     # Overall statistics
-    total_tables = profile_df['table_name'].nunique()
-    total_columns = len(profile_df)
-    total_rows = sum(df.shape[0] for df in datasets.values())
-    
     summary.append("1. OVERALL DATASET STATISTICS")
     summary.append("-" * 80)
-    summary.append(f"   • Total Tables: {total_tables}")
-    summary.append(f"   • Total Columns: {total_columns}")
-    summary.append(f"   • Total Rows (across all tables): {total_rows:,}")
+    summary.append(f"   • Total Tables: {typed['table_name'].nunique()}")
+    summary.append(f"   • Total Columns: {len(typed)}")
+    summary.append(f"   • Total Rows (across all tables): {int(table_stats['rows'].sum()):,}")
     summary.append("")
     
     # Table-level statistics
     summary.append("2. TABLE-LEVEL SUMMARY")
     summary.append("-" * 80)
-    for table_name, df in datasets.items():
+    for table_name, rows, columns, memory_mb in table_stats.itertuples():
         summary.append(f"   • {table_name}:")
-        summary.append(f"     - Shape: {df.shape[0]:,} rows × {df.shape[1]} columns")
-        summary.append(f"     - Memory Usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+        summary.append(f"     - Shape: {rows:,} rows × {columns} columns")
+        summary.append(f"     - Memory Usage: {memory_mb:.2f} MB")
     summary.append("")
     
     # Data Quality Issues
@@ -502,32 +753,30 @@ def generate_summary_report(profile_df, datasets):
     summary.append("-" * 80)
     
     # High null percentage columns
-    high_nulls = profile_df[profile_df['percent_null'] > 50].sort_values('percent_null', ascending=False)
+    high_nulls = typed[typed['percent_null'] > 50]
     if len(high_nulls) > 0:
+        # sort_values (not nlargest) keeps the historical tie order of the report
+        top = high_nulls.sort_values('percent_null', ascending=False).head(10)
         summary.append("   ⚠ COLUMNS WITH HIGH NULL PERCENTAGE (>50%):")
-        for _, row in high_nulls.head(10).iterrows():
-            summary.append(f"     - {row['table_name']}.{row['column_name']}: "
-                          f"{row['percent_null']:.2f}% null ({row['null_count']:,} of {row['total_count']:,})")
+        summary.extend("     - " + top['label'] + ": " + _fmt(top['percent_null'], "{:.2f}") + "% null ("
+                       + _fmt(top['null_count'], "{:,}") + " of " + _fmt(top['total_count'], "{:,}") + ")")
     else:
         summary.append("   ✓ No columns with high null percentage (>50%)")
     summary.append("")
     
     # Columns with all unique values (potential primary keys)
-    unique_cols = profile_df[profile_df['percent_distinct'] >= 99]
+    unique_cols = typed[typed['percent_distinct'] >= 99]
     if len(unique_cols) > 0:
         summary.append("   ℹ POTENTIAL PRIMARY KEY COLUMNS (≥99% distinct values):")
-        for _, row in unique_cols.iterrows():
-            summary.append(f"     - {row['table_name']}.{row['column_name']}: "
-                          f"{row['percent_distinct']:.2f}% distinct")
+        summary.extend("     - " + unique_cols['label'] + ": " + _fmt(unique_cols['percent_distinct'], "{:.2f}") + "% distinct")
     summary.append("")
     
     # Columns with high zero percentage
-    high_zeros = profile_df[profile_df['percent_zeros'] > 50].sort_values('percent_zeros', ascending=False)
+    high_zeros = typed[typed['percent_zeros'] > 50]
     if len(high_zeros) > 0:
+        top = high_zeros.sort_values('percent_zeros', ascending=False).head(10)
         summary.append("   ⚠ NUMERIC COLUMNS WITH HIGH ZERO PERCENTAGE (>50%):")
-        for _, row in high_zeros.head(10).iterrows():
-            summary.append(f"     - {row['table_name']}.{row['column_name']}: "
-                          f"{row['percent_zeros']:.2f}% zeros")
+        summary.extend("     - " + top['label'] + ": " + _fmt(top['percent_zeros'], "{:.2f}") + "% zeros")
     summary.append("")
     
     # Data type distribution
@@ -535,44 +784,39 @@ def generate_summary_report(profile_df, datasets):
     summary.append("-" * 80)
     dtype_dist = profile_df['data_type'].value_counts()
     for dtype, count in dtype_dist.items():
-        summary.append(f"   • {dtype}: {count} columns ({count/len(profile_df)*100:.1f}%)")
+        summary.append(f"   • {dtype}: {count} columns ({count/len(typed)*100:.1f}%)")
     summary.append("")
     
     # Statistical insights for numeric columns
-    numeric_profiles = profile_df[profile_df['data_type'].str.contains('int|float', case=False, na=False)]
-    if len(numeric_profiles) > 0:
+    if len(numeric) > 0:
         summary.append("5. NUMERIC COLUMN INSIGHTS")
         summary.append("-" * 80)
         
         # Columns with high variability (high std dev relative to mean)
-        numeric_profiles_clean = numeric_profiles.dropna(subset=['mean', 'std_dev'])
-        numeric_profiles_clean = numeric_profiles_clean[numeric_profiles_clean['mean'] != 0]
-        numeric_profiles_clean['cv'] = numeric_profiles_clean['std_dev'] / numeric_profiles_clean['mean'].abs()
-        high_var = numeric_profiles_clean.nlargest(5, 'cv')
+        with_cv = numeric[numeric['mean'].notna() & numeric['std_dev'].notna() & (numeric['mean'] != 0)]
+        high_var = with_cv.assign(cv=with_cv['std_dev'] / with_cv['mean'].abs()).nlargest(5, 'cv')
         
         if len(high_var) > 0:
             summary.append("   Top 5 columns with highest variability (Coefficient of Variation):")
-            for _, row in high_var.iterrows():
-                summary.append(f"     - {row['table_name']}.{row['column_name']}: "
-                              f"CV = {row['cv']:.2f} (mean: {row['mean']:.2f}, std: {row['std_dev']:.2f})")
+            summary.extend("     - " + high_var['label'] + ": CV = " + _fmt(high_var['cv'], "{:.2f}")
+                           + " (mean: " + _fmt(high_var['mean'], "{:.2f}") + ", std: "
+                           + _fmt(high_var['std_dev'], "{:.2f}") + ")")
         summary.append("")
     
     # String length analysis
-    string_profiles = profile_df[~profile_df['data_type'].str.contains('int|float', case=False, na=False)]
-    if len(string_profiles) > 0:
+    strings = typed[~typed['is_numeric']]
+    if len(strings) > 0:
         summary.append("6. STRING COLUMN INSIGHTS")
         summary.append("-" * 80)
         
         # Longest average string columns
-        string_profiles_clean = string_profiles.dropna(subset=['avg_length'])
-        longest_strings = string_profiles_clean.nlargest(5, 'avg_length')
+        longest_strings = strings[strings['avg_length'].notna()].nlargest(5, 'avg_length')
         
         if len(longest_strings) > 0:
             summary.append("   Top 5 columns with longest average string length:")
-            for _, row in longest_strings.iterrows():
-                summary.append(f"     - {row['table_name']}.{row['column_name']}: "
-                              f"avg = {row['avg_length']:.1f} chars "
-                              f"(min: {row['min_length']}, max: {row['max_length']})")
+            summary.extend("     - " + longest_strings['label'] + ": avg = " + _fmt(longest_strings['avg_length'], "{:.1f}")
+                           + " chars (min: " + longest_strings['min_length'].astype(str) + ", max: "
+                           + longest_strings['max_length'].astype(str) + ")")
         summary.append("")
     
     # Cardinality insights
@@ -580,16 +824,11 @@ def generate_summary_report(profile_df, datasets):
     summary.append("-" * 80)
     
     # Low cardinality columns (potential categorical)
-    low_card = profile_df[
-        (profile_df['distinct_count'] <= 20) & 
-        (profile_df['distinct_count'] > 1)
-    ].sort_values('distinct_count')
-    
+    low_card = typed[(typed['distinct_count'] <= 20) & (typed['distinct_count'] > 1)]
     if len(low_card) > 0:
+        top = low_card.sort_values('distinct_count').head(10)
         summary.append("   Low cardinality columns (≤20 distinct values - good for categorical analysis):")
-        for _, row in low_card.head(10).iterrows():
-            summary.append(f"     - {row['table_name']}.{row['column_name']}: "
-                          f"{row['distinct_count']} distinct values")
+        summary.extend("     - " + top['label'] + ": " + top['distinct_count'].astype(str) + " distinct values")
     summary.append("")
     
     # Recommendations
@@ -603,10 +842,9 @@ def generate_summary_report(profile_df, datasets):
         recommendations.append("   • Address high null percentages in columns - consider imputation or exclusion")
     
     # Data type optimization
-    object_cols = profile_df[profile_df['data_type'] == 'object']
-    low_card_objects = object_cols[object_cols['distinct_count'] <= 50]
-    if len(low_card_objects) > 0:
-        recommendations.append(f"   • Convert {len(low_card_objects)} low-cardinality object columns to categorical dtype for memory efficiency")
+    low_card_objects = int(((typed['data_type'] == 'object') & (typed['distinct_count'] <= 50)).sum())
+    if low_card_objects > 0:
+        recommendations.append(f"   • Convert {low_card_objects} low-cardinality object columns to categorical dtype for memory efficiency")
     
     # ID columns
     if len(unique_cols) > 0:
@@ -617,16 +855,12 @@ def generate_summary_report(profile_df, datasets):
         recommendations.append("   • Investigate columns with high zero percentages - may indicate sparse data or data quality issues")
     
     # Outliers
-    numeric_with_stats = numeric_profiles.dropna(subset=['mean', 'std_dev', 'max_value'])
-    potential_outliers = numeric_with_stats[
-        numeric_with_stats['max_value'] > (numeric_with_stats['mean'] + 3 * numeric_with_stats['std_dev'])
-    ]
-    if len(potential_outliers) > 0:
-        recommendations.append(f"   • {len(potential_outliers)} numeric columns may contain outliers - consider outlier detection and treatment")
+    potential_outliers = int((numeric['max_value'] > numeric['mean'] + 3 * numeric['std_dev']).sum())
+    if potential_outliers > 0:
+        recommendations.append(f"   • {potential_outliers} numeric columns may contain outliers - consider outlier detection and treatment")
     
     if len(recommendations) > 0:
-        for rec in recommendations:
-            summary.append(rec)
+        summary.extend(recommendations)
     else:
         summary.append("   ✓ No major data quality issues detected")
     
@@ -638,75 +872,160 @@ def generate_summary_report(profile_df, datasets):
     return "\n".join(summary)
 
 
-def main():
+def main(workers=1, approximate='off', trace_memory=False, cprofile=False, metrics_only=False):
     """
     Main execution function for data profiling.
+    
+    Parameters:
+    -----------
+    workers : int
+        Processes for column profiling (1 = serial, 0 = every core)
+    approximate : str
+        'off', 'on' or 'auto' (sketch-based metrics for large tables)
+    trace_memory : bool
+        Add tracemalloc allocation peaks to the stage trace
+    cprofile : bool
+        cProfile each stage and dump the slowest one next to the trace
+    metrics_only : bool
+        Stop after the metrics and plot bins: no plotting import, figures or reports
     """
     print("\n" + "🔍" * 40)
     print("  COMPREHENSIVE DATA PROFILING ANALYSIS")
     print("  Brazilian E-commerce Dataset")
     print("🔍" * 40 + "\n")
     
-    # Step 1: Profile all datasets
-    profile_df, datasets = profile_all_datasets()
+    # Wall / CPU / RSS per stage, table and column -> data_profiling_output/profile_trace.json
+    tracer = Tracer(tracemalloc=trace_memory, cprofile=cprofile)
     
-    # Step 2: Save profiling results to CSV
-    output_file = "data_profiling_results.csv"
-    profile_df.to_csv(output_file, index=False)
-    print(f"\n✓ Profiling results saved to: {output_file}")
-    
-    # Step 3: Create visualizations
-    create_profiling_visualizations(profile_df, datasets)
-    
-    # Step 4: Generate and save summary report
-    summary_report = generate_summary_report(profile_df, datasets)
+    # Step 1: Profile all datasets; each table is reduced to the later stages' inputs
+    # (totals, sketches, plot bins) and released before the next one loads
+    with tracer.span('profile'):
+        stats_cache = StatsCache()
+        stages = StageInputs()
+        profile_df, _ = profile_all_datasets(stats_cache, workers=workers, approximate=approximate,
+                                             tracer=tracer, stages=stages)
+        stats_cache.save()
+        print(f"✓ Column stats cache: {stats_cache.hits} reused, {stats_cache.misses} computed")
     
-    summary_file = "data_profiling_summary.txt"
-    with open(summary_file, 'w') as f:
-        f.write(summary_report)
-    
-    print(summary_report)
-    print(f"\n✓ Summary report saved to: {summary_file}")
-    
-    # Step 5: Create detailed profiling HTML report
-    print("\n" + "=" * 80)
-    print("CREATING DETAILED HTML REPORT")
-    print("=" * 80)
-    
-    html_content = generate_html_report(profile_df, datasets)
-    html_file = "data_profiling_report.html"
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Step 2: Save profiling results to CSV
+    with tracer.span('save_results'):
+        output_file = "data_profiling_results.csv"
+        profile_df.to_csv(output_file, index=False)
+        print(f"\n✓ Profiling results saved to: {output_file}")
+        profile_artifact = write_profile_artifact(profile_df)
+        if profile_artifact is not None:
+            print(f"✓ Typed, (table, column)-sorted results saved to: {profile_artifact}")
+        else:
+            print("⚠️  pyarrow not installed - skipping the Parquet results artifact")
     
-    print(f"✓ Interactive HTML report saved to: {html_file}")
+    # Step 2b: Schema / distribution drift vs the previous load (from stored sketches only)
+    with tracer.span('drift'):
+        drift = record_sketches(stages.sketches)
+        if drift['previous_load_id'] is None:
+            print(f"✓ Drift baseline sketches stored for load {drift['load_id']}")
+        else:
+            print(f"✓ Drift vs load {drift['previous_load_id']}: {drift['drifted_columns']} drifted columns, "
+                  f"{len(drift['schema_changes'])} schema changes")
+            for change in drift['schema_changes']:
+                print(f"  ⚠️ {change['change']}: {change['table_name']}.{change['column_name'] or '*'}")
+            for column in drift['columns']:
+                if column['status'] == 'major':
+                    print(f"  ⚠️ {column['table_name']}.{column['column_name']}: PSI {column['psi']}")
+    
+    # Step 3: Save the plot bins and table totals (for the dashboard and `dq report`)
+    with tracer.span('plot_bins'):
+        bins = stages.bins
+        bins.save(BINS_FILE)
+        print(f"✓ Plot bins cached in: {BINS_FILE}")
+        table_stats = stages.table_stats
+        table_stats.to_csv(TABLE_STATS_FILE)
+    
+    # Step 4: Figures, summary and HTML report (with metrics_only: later, via `dq report`)
+    report_files = [] if metrics_only else write_reports(profile_df, bins, table_stats, tracer)
+    
+    trace_file, prof_file = tracer.write(TRACE_FILE)
+    tracer.close()
+    print("\n⏱️  Stage timings:")
+    for line in tracer.report():
+        print(f"  {line}")
     
     print("\n" + "✅" * 40)
     print("  DATA PROFILING COMPLETE!")
     print("✅" * 40)
     print(f"\nGenerated files:")
     print(f"  • {output_file} - Complete profiling metrics in CSV format")
-    print(f"  • {summary_file} - Summary of key findings")
-    print(f"  • {html_file} - Interactive HTML report with detailed tables")
-    print(f"  • data_profiling_output/ - Directory with all visualization plots")
+    if profile_artifact is not None:
+        print(f"  • {profile_artifact} - Same metrics, typed and indexed (query with profile_store.ProfileStore)")
+    for line in report_files:
+        print(f"  • {line}")
+    print(f"  • {BINS_FILE}, {TABLE_STATS_FILE} - Plot bins and table totals for the reports")
+    print(f"  • {DRIFT_DIR}/ - Per-load column sketches and the latest drift report")
+    print(f"  • {trace_file} - Stage / table / column spans (open in chrome://tracing or Perfetto)")
+    if prof_file is not None:
+        print(f"  • {prof_file} - cProfile of the slowest stage (python -m pstats {prof_file})")
+    if metrics_only:
+        print("\n📊 Figures and reports skipped (--metrics-only); render them with: python dq.py report")
     print()
 
 
-def generate_html_report(profile_df, datasets):
+def write_reports(profile_df, bins, table_stats, tracer=NULL_TRACER):
     """
-    Generate an HTML report with detailed profiling information.
+    Render the figures, the summary and the HTML report from the profiles, the plot
+    bins and the per-table totals (no dataset is needed).
     
-    Parameters:
-    -----------
-    profile_df : pd.DataFrame
-        DataFrame containing all profiling results
-    datasets : dict
-        Dictionary of all loaded datasets
-        
     Returns:
     --------
-    str : HTML content
+    list of str : generated files with a short description, for the closing summary
+    """
+    with tracer.span('visualizations'):
+        create_profiling_visualizations(profile_df, None, bins)
+    
+    with tracer.span('summary_report'):
+        summary_report = generate_summary_report(profile_df, None, table_stats)
+
+        summary_file = "data_profiling_summary.txt"
+        with open(summary_file, 'w') as f:
+            f.write(summary_report)
+
+        print(summary_report)
+        print(f"\n✓ Summary report saved to: {summary_file}")
+    
+    with tracer.span('html_report'):
+        print("\n" + "=" * 80)
+        print("CREATING DETAILED HTML REPORT")
+        print("=" * 80)
+
+        html_file = "data_profiling_report.html"
+        write_html_report(profile_df, None, html_file, table_stats)
+
+        print(f"✓ Interactive HTML report saved to: {html_file}")
+    
+    return [
+        f"{summary_file} - Summary of key findings",
+        f"{html_file} - Interactive HTML report with detailed tables",
+        "data_profiling_output/ - Directory with all visualization plots",
+    ]
+
+
+def report_from_artifacts(profile_path=PROFILE_FILE, bins_path=BINS_FILE, stats_path=TABLE_STATS_FILE):
     """
-    html = """
+    Rebuild the figures and reports from a previous run's saved profiles, plot bins
+    and table totals, without reading the CSVs.
+    
+    Returns:
+    --------
+    list of str : generated files, as returned by write_reports
+    """
+    bins = PlotBins.load(bins_path)
+    if bins is None or not Path(stats_path).exists():
+        raise FileNotFoundError(f"{bins_path} / {stats_path} not found - run the profiler first")
+    profile_df = ProfileStore.open(profile_path).frame
+    table_stats = pd.read_csv(stats_path, index_col='table_name')
+    return write_reports(profile_df, bins, table_stats)
+
+
+# Compiled once; the report is streamed section by section (see write_html_report)
+_HTML_HEAD = Template("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -813,44 +1132,37 @@ def generate_html_report(profile_df, datasets):
             <h2>Brazilian E-commerce Dataset</h2>
             
             <div class="info-box">
-                <strong>Report Generated:</strong> """ + pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S') + """
+                <strong>Report Generated:</strong> $generated
             </div>
-    """
-    
-    # Summary statistics
-    html += """
+    """)
+
+_HTML_STATS = Template("""
             <h2>📈 Overall Statistics</h2>
             <div class="summary-stats">
                 <div class="stat-card">
                     <div class="stat-label">Total Tables</div>
-                    <div class="stat-value">""" + str(profile_df['table_name'].nunique()) + """</div>
+                    <div class="stat-value">$tables</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Total Columns</div>
-                    <div class="stat-value">""" + str(len(profile_df)) + """</div>
+                    <div class="stat-value">$columns</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Total Rows</div>
-                    <div class="stat-value">""" + f"{sum(df.shape[0] for df in datasets.values()):,}" + """</div>
+                    <div class="stat-value">$rows</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Total Memory (MB)</div>
-                    <div class="stat-value">""" + f"{sum(df.memory_usage(deep=True).sum() for df in datasets.values()) / 1024**2:.1f}" + """</div>
+                    <div class="stat-value">$memory</div>
                 </div>
             </div>
-    """
     
-    # Detailed profiling table by table
-    html += """
             <h2>📋 Detailed Profiling Results by Table</h2>
-    """
-    
-    for table_name in sorted(profile_df['table_name'].unique()):
-        table_data = profile_df[profile_df['table_name'] == table_name].copy()
-        
-        html += f"""
-            <h3>{table_name}</h3>
-            <p><strong>Shape:</strong> {datasets[table_name].shape[0]:,} rows × {datasets[table_name].shape[1]} columns</p>
+    """)
+
+_HTML_TABLE_START = Template("""
+            <h3>$table_name</h3>
+            <p><strong>Shape:</strong> $n_rows rows × $n_cols columns</p>
             <div style="overflow-x: auto;">
                 <table>
                     <thead>
@@ -870,49 +1182,146 @@ def generate_html_report(profile_df, datasets):
                         </tr>
                     </thead>
                     <tbody>
-        """
-        
-        for _, row in table_data.iterrows():
-            null_class = 'warning' if row['percent_null'] > 50 else 'good' if row['percent_null'] == 0 else ''
-            distinct_class = 'good' if row['percent_distinct'] > 90 else ''
-            
-            mean_str = f"{row['mean']:.2f}" if pd.notna(row['mean']) else 'N/A'
-            std_str = f"{row['std_dev']:.2f}" if pd.notna(row['std_dev']) else 'N/A'
-            min_str = str(row['min_value'])[:30] if pd.notna(row['min_value']) else 'N/A'
-            max_str = str(row['max_value'])[:30] if pd.notna(row['max_value']) else 'N/A'
-            freq_str = str(row['most_frequent_value'])[:40] if pd.notna(row['most_frequent_value']) else 'N/A'
-            
-            html += f"""
+        """)
+
+_HTML_ROW = Template("""
                         <tr>
-                            <td><strong>{row['column_name']}</strong></td>
-                            <td>{row['data_type']}</td>
-                            <td>{row['total_count']:,}</td>
-                            <td class="{null_class}">{row['percent_null']:.2f}%</td>
-                            <td>{row['distinct_count']:,}</td>
-                            <td class="{distinct_class}">{row['percent_distinct']:.2f}%</td>
-                            <td>{mean_str}</td>
-                            <td>{std_str}</td>
-                            <td>{min_str}</td>
-                            <td>{max_str}</td>
-                            <td>{row['percent_zeros']:.2f}%</td>
-                            <td>{freq_str}</td>
+                            <td><strong>$column_name</strong></td>
+                            <td>$data_type</td>
+                            <td>$total_count</td>
+                            <td class="$null_class">$percent_null%</td>
+                            <td>$distinct_count</td>
+                            <td class="$distinct_class">$percent_distinct%</td>
+                            <td>$mean</td>
+                            <td>$std_dev</td>
+                            <td>$min_value</td>
+                            <td>$max_value</td>
+                            <td>$percent_zeros%</td>
+                            <td>$most_frequent_value</td>
                         </tr>
-            """
-        
-        html += """
+            """)
+
+_HTML_TABLE_END = """
                     </tbody>
                 </table>
             </div>
         """
-    
-    html += """
+
+_HTML_FOOT = """
         </div>
     </body>
     </html>
     """
+
+
+def _format_cells(profile_df):
+    """
+    Every HTML cell of the detailed tables as strings, formatted column-wise.
+
+    Returns:
+    --------
+    pd.DataFrame : One row per profiled column, one string column per template field
+    """
+    def fixed(series):
+        return series.map('{:.2f}'.format, na_action='ignore').fillna('N/A')
+
+    def truncated(series, width):
+        return series.map(lambda v: str(v)[:width], na_action='ignore').fillna('N/A')
+
+    percent_null = profile_df['percent_null']
+    return pd.DataFrame({
+        'table_name': profile_df['table_name'],
+        'column_name': profile_df['column_name'],
+        'data_type': profile_df['data_type'],
+        'total_count': profile_df['total_count'].map('{:,}'.format),
+        'null_class': np.select([percent_null > 50, percent_null == 0], ['warning', 'good'], ''),
+        'percent_null': percent_null.map('{:.2f}'.format),
+        'distinct_count': profile_df['distinct_count'].map('{:,}'.format),
+        'distinct_class': np.where(profile_df['percent_distinct'] > 90, 'good', ''),
+        'percent_distinct': profile_df['percent_distinct'].map('{:.2f}'.format),
+        'mean': fixed(profile_df['mean']),
+        'std_dev': fixed(profile_df['std_dev']),
+        'min_value': truncated(profile_df['min_value'], 30),
+        'max_value': truncated(profile_df['max_value'], 30),
+        'percent_zeros': profile_df['percent_zeros'].map('{:.2f}'.format),
+        'most_frequent_value': truncated(profile_df['most_frequent_value'], 40),
+    }, index=profile_df.index)
+
+
+def write_html_report(profile_df, datasets, out, table_stats=None):
+    """
+    Stream the HTML profiling report to `out`, one table section at a time.
     
-    return html
+    Parameters:
+    -----------
+    profile_df : pd.DataFrame
+        DataFrame containing all profiling results
+    datasets : dict
+        Dictionary of all loaded datasets
+    out : str, Path or file-like
+        Output path, or an open text stream to write to
+    table_stats : pd.DataFrame, optional
+        Output of dataset_stats (computed here if not given)
+        
+    Returns:
+    --------
+    int : Number of characters written
+    """
+    if not hasattr(out, 'write'):
+        with open(out, 'w', encoding='utf-8') as f:
+            return write_html_report(profile_df, datasets, f, table_stats)
+    
+    table_stats = dataset_stats(datasets) if table_stats is None else table_stats
+    written = out.write(_HTML_HEAD.substitute(generated=pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')))
+    written += out.write(_HTML_STATS.substitute(
+        tables=profile_df['table_name'].nunique(), columns=len(profile_df),
+        rows=f"{int(table_stats['rows'].sum()):,}", memory=f"{table_stats['memory_mb'].sum():.1f}",
+    ))
+    
+    cells = _format_cells(profile_df)
+    for table_name, table_cells in cells.groupby('table_name', sort=True):
+        n_rows, n_cols = table_stats.loc[table_name, ['rows', 'columns']]
+        written += out.write(_HTML_TABLE_START.substitute(table_name=table_name, n_rows=f"{n_rows:,}", n_cols=n_cols))
+        written += out.write(''.join(_HTML_ROW.substitute(row._asdict())
+                                     for row in table_cells.itertuples(index=False)))
+        written += out.write(_HTML_TABLE_END)
+    
+    written += out.write(_HTML_FOOT)
+    return written
+
+
+def generate_html_report(profile_df, datasets):
+    """
+    Generate an HTML report with detailed profiling information.
+    
+    Parameters:
+    -----------
+    profile_df : pd.DataFrame
+        DataFrame containing all profiling results
+    datasets : dict
+        Dictionary of all loaded datasets
+        
+    Returns:
+    --------
+    str : HTML content (use write_html_report to stream straight to a file)
+    """
+    buffer = io.StringIO()
+    write_html_report(profile_df, datasets, buffer)
+    return buffer.getvalue()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Profile the Brazilian e-commerce CSVs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for column profiling (1 = serial, 0 = every core)")
+    parser.add_argument("--approximate", choices=["off", "on", "auto"], default="off",
+                        help=f"Sketch distinct counts / top values / quartiles (auto: tables ≥ {APPROX_MIN_ROWS:,} rows)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record tracemalloc allocation peaks per span (slower)")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="cProfile each stage and dump the slowest to data_profiling_output/profile_trace.prof")
+    parser.add_argument("--metrics-only", action="store_true",
+                        help="Skip figures and reports (render them later with: python dq.py report)")
+    args = parser.parse_args()
+    main(workers=args.workers, approximate=args.approximate, trace_memory=args.trace_memory, cprofile=args.cprofile,
+         metrics_only=args.metrics_only)
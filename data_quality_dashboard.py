@@ -1,20 +1,71 @@
 import dash
-from dash import dcc, html, dash_table
+from dash import Input, Output, dcc, html, dash_table
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
-import json
+from dq_drift import load_report
+from dq_results import DIMENSIONS, ResultTable
+from profile_bins import PlotBins
 
 def load_results():
-    with open("Great_Expectation/dq_results_detailed.json", "r") as f:
-        detailed = json.load(f)
-    with open("Great_Expectation/dq_summary.json", "r") as f:
-        summary = json.load(f)
-    df = pd.read_csv("Great_Expectation/dq_results_summary.csv")
-    return detailed, summary, df
+    # Summary and column table are derived from the columnar results written by run_dq_check
+    results = ResultTable.load("Great_Expectation/dq_results.npz")
+    return results, results.summary(), results.to_frame()
 
-detailed_results, summary, csv_df = load_results()
+results, summary, csv_df = load_results()
+
+# Latest load-to-load drift from the profiler's sketches (empty until two loads were profiled)
+drift_report = load_report()
+drift_columns = ['table_name', 'column_name', 'kind', 'status', 'psi', 'ks', 'js', 'null_pct_change', 'distinct_change']
+df_drift = pd.DataFrame(drift_report['columns'] if drift_report else [], columns=drift_columns)
+df_drift = df_drift.sort_values('psi', ascending=False, na_position='last')
+df_schema = pd.DataFrame(drift_report['schema_changes'] if drift_report else [],
+                         columns=['table_name', 'column_name', 'change'])
+
+# Histogram / hexbin / review-score arrays cached by the profiler (None until it has run)
+plot_bins = PlotBins.load()
+hist_options = [{'label': f"{table}.{column}", 'value': f"{table}|{column}"}
+                for table, columns in (plot_bins.hists.items() if plot_bins else []) for column in columns]
+
+
+def histogram_figure(key):
+    table, column = key.split('|')
+    hist = plot_bins.hists[table][column]
+    edges = hist['edges']
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=hist['counts'], width=np.diff(edges),
+                           marker_color='skyblue', marker_line_color='black', marker_line_width=0.5))
+    fig.update_layout(title=f"{table}.{column} (mean: {hist['mean']:.2f}, std: {hist['std']:.2f}, n: {hist['n']:,})",
+                      xaxis_title=column, yaxis_title='Frequency', bargap=0)
+    return fig
+
+
+def hexbin_figure(name, title, x_label, y_label):
+    hexbin = plot_bins.hexbins[name]
+    fig = go.Figure(go.Scatter(
+        x=hexbin['x'], y=hexbin['y'], mode='markers', text=hexbin['counts'],
+        hovertemplate=f"{x_label}: %{{x:.2f}}<br>{y_label}: %{{y:.2f}}<br>rows: %{{text:,}}<extra></extra>",
+        marker=dict(symbol='hexagon', size=11, color=np.log10(hexbin['counts']), colorscale='Blues',
+                    colorbar=dict(title='log10 rows')),
+    ))
+    fig.update_layout(title=f"{title} (correlation: {hexbin['corr']:.3f}, n: {hexbin['n']:,})",
+                      xaxis_title=x_label, yaxis_title=y_label)
+    return fig
+
+
+distribution_graphs = []
+if plot_bins and 'price_vs_freight' in plot_bins.hexbins:
+    distribution_graphs.append(hexbin_figure('price_vs_freight', 'Price vs Freight Value', 'Price', 'Freight Value'))
+if plot_bins and 'installments_vs_value' in plot_bins.hexbins:
+    distribution_graphs.append(hexbin_figure('installments_vs_value', 'Installments vs Payment Value',
+                                             'Payment Installments', 'Payment Value'))
+if plot_bins and plot_bins.review_scores is not None:
+    scores = plot_bins.review_scores
+    fig_reviews = px.bar(x=scores['values'], y=scores['counts'], labels={'x': 'Review Score', 'y': 'Count'},
+                         title='Distribution of Review Scores', color=scores['values'],
+                         color_continuous_scale='RdBu')
+    distribution_graphs.append(fig_reviews)
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 
@@ -57,14 +108,8 @@ fig_pass_fail.update_layout(title="Overall Pass/Fail Distribution")
 
 # Quality Dimensions - Average across all columns (excluding uniqueness from overall)
 dimensions = ['Completeness', 'Validity', 'Accuracy', 'Consistency', 'Conformity']
-avg_scores = []
-
-for dim in dimensions:
-    col_name = f"{dim} Score"
-    if col_name in csv_df.columns:
-        avg_scores.append(csv_df[col_name].mean())
-    else:
-        avg_scores.append(0)
+dimension_means = dict(zip(DIMENSIONS, np.nanmean(results.scores, axis=0))) if len(results) else {}
+avg_scores = [dimension_means.get(dim.lower(), 0) for dim in dimensions]
 
 fig_dimensions = go.Figure()
 fig_dimensions.add_trace(go.Scatterpolar(
@@ -112,16 +157,10 @@ fig_table_scores.update_traces(texttemplate='%{text:.1f}%', textposition='outsid
 fig_table_scores.update_layout(yaxis_range=[0, 110])
 
 # Dimension breakdown bar chart
-dim_data = []
-for dim in dimensions:
-    col_name = f"{dim} Score"
-    if col_name in csv_df.columns:
-        avg_score = csv_df[col_name].mean()
-        dim_data.append({'Dimension': dim, 'Average Score': avg_score})
+dim_data = [{'Dimension': dim, 'Average Score': score} for dim, score in zip(dimensions, avg_scores)]
 
 # Add uniqueness separately (informational only)
-if 'Uniqueness Score' in csv_df.columns:
-    dim_data.append({'Dimension': 'Uniqueness*', 'Average Score': csv_df['Uniqueness Score'].mean()})
+dim_data.append({'Dimension': 'Uniqueness*', 'Average Score': dimension_means.get('uniqueness', 0)})
 
 df_dimensions = pd.DataFrame(dim_data)
 fig_dimensions_bar = px.bar(
@@ -171,6 +210,42 @@ app.layout = dbc.Container([
         ]
     ),
     
+    html.Hr(),
+    html.H3("Distribution Drift vs Previous Load", className="my-3"),
+    html.P(f"Load {drift_report['load_id']} vs {drift_report['previous_load_id'] or 'none (baseline)'}: "
+           f"{drift_report['drifted_columns']} drifted columns, {len(df_schema)} schema changes. "
+           "PSI ≥ 0.1 moderate, ≥ 0.25 major." if drift_report else
+           "No drift report yet - run data_profiling_analysis.py on two loads.",
+           className="text-muted small"),
+    dash_table.DataTable(
+        data=df_schema.to_dict('records'),
+        columns=[{"name": i, "id": i} for i in df_schema.columns],
+        style_cell={'textAlign': 'left', 'padding': '8px'},
+        style_header={'backgroundColor': '#ffc107', 'fontWeight': 'bold'},
+    ) if len(df_schema) else html.Div(),
+    dash_table.DataTable(
+        data=df_drift.to_dict('records'),
+        columns=[{"name": i, "id": i} for i in df_drift.columns],
+        page_size=15,
+        sort_action="native",
+        style_cell={'textAlign': 'left', 'padding': '8px'},
+        style_header={'backgroundColor': '#007bff', 'color': 'white', 'fontWeight': 'bold'},
+        style_data_conditional=[
+            {'if': {'filter_query': '{status} = "major"'}, 'backgroundColor': '#f8d7da'},
+            {'if': {'filter_query': '{status} = "moderate"'}, 'backgroundColor': '#fff3cd'},
+        ],
+    ),
+    
+    html.Hr(),
+    html.H3("Column Distributions", className="my-3"),
+    html.P("Plotted from the profiler's precomputed bins (data_profiling_output/plot_bins.npz)." if plot_bins else
+           "No plot bins yet - run data_profiling_analysis.py.",
+           className="text-muted small"),
+    dbc.Row([dbc.Col(dcc.Graph(figure=fig), width=6) for fig in distribution_graphs]),
+    dcc.Dropdown(id='histogram-column', options=hist_options,
+                 value=hist_options[0]['value'] if hist_options else None, clearable=False),
+    dcc.Graph(id='histogram-graph'),
+    
     html.Hr(),
     html.H3("Detailed Column Results", className="my-3"),
     dash_table.DataTable(
@@ -210,6 +285,12 @@ app.layout = dbc.Container([
     ])
 ], fluid=True)
 
+
+@app.callback(Output('histogram-graph', 'figure'), Input('histogram-column', 'value'))
+def update_histogram(key):
+    return histogram_figure(key) if key else go.Figure()
+
+
 if __name__ == "__main__":
     print("\n" + "="*80)
     print("🚀 Starting Data Quality Dashboard - Olist E-commerce Analysis")
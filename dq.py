@@ -0,0 +1,91 @@
+"""
+Command-Line Entry Point for Profiling, Data Quality Checks and Reports
+Each subcommand imports only what it runs: `--help` and argument errors load no
+pandas, `profile --metrics-only` and `check` never load matplotlib / seaborn, and the
+Dash stack is only imported by `dashboard`. Plots are rendered on the headless Agg
+backend.
+
+Usage:
+    python dq.py profile [--workers 0] [--approximate auto] [--metrics-only]
+    python dq.py check [--cprofile]
+    python dq.py report        # figures, summary and HTML report from the last profile run
+    python dq.py dashboard
+"""
+
+import argparse
+import sys
+
+
+def _profile(args):
+    from data_profiling_analysis import main
+    main(workers=args.workers, approximate=args.approximate, trace_memory=args.trace_memory,
+         cprofile=args.cprofile, metrics_only=args.metrics_only)
+    return 0
+
+
+def _check(args):
+    from run_dq_check import main
+    checker = main(trace_memory=args.trace_memory, cprofile=args.cprofile)
+    return 0 if len(checker.results) else 1
+
+
+def _report(args):
+    from data_profiling_analysis import report_from_artifacts
+    try:
+        files = report_from_artifacts()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    print("\nGenerated files:")
+    for line in files:
+        print(f"  • {line}")
+    return 0
+
+
+def _dashboard(args):
+    from data_quality_dashboard import app
+    print(f"\n🌐 Dashboard URL: http://{args.host}:{args.port}/")
+    app.run(debug=args.debug, host=args.host, port=args.port)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="dq", description="Profile and quality-check the olist CSVs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    profile = commands.add_parser("profile", help="Profile every CSV column (metrics, figures, reports)")
+    profile.add_argument("--workers", type=int, default=1,
+                         help="Processes for column profiling (1 = serial, 0 = every core)")
+    profile.add_argument("--approximate", choices=["off", "on", "auto"], default="off",
+                         help="Sketch distinct counts / top values / quartiles (auto: large tables only)")
+    profile.add_argument("--metrics-only", action="store_true",
+                         help="Skip figures and reports; render them later with `dq report`")
+    profile.set_defaults(run=_profile)
+
+    check = commands.add_parser("check", help="Run the data quality checks on the raw CSVs")
+    check.set_defaults(run=_check)
+
+    for command in (profile, check):
+        command.add_argument("--trace-memory", action="store_true",
+                             help="Record tracemalloc allocation peaks per span (slower)")
+        command.add_argument("--cprofile", action="store_true",
+                             help="cProfile each stage and dump the slowest next to the trace")
+
+    report = commands.add_parser("report", help="Render figures, summary and HTML report from the last profile run")
+    report.set_defaults(run=_report)
+
+    dashboard = commands.add_parser("dashboard", help="Serve the data quality dashboard (needs dash)")
+    dashboard.add_argument("--host", default="127.0.0.1")
+    dashboard.add_argument("--port", type=int, default=8051)
+    dashboard.add_argument("--debug", action="store_true")
+    dashboard.set_defaults(run=_dashboard)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
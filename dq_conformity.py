@@ -0,0 +1,163 @@
+"""
+Conformity Rule Library for the Data Quality Checker
+Vectorized format rules for the olist columns (32-hex ids, 5-digit zip prefixes,
+Brazilian state codes, ISO timestamps, lat/lng ranges, e-mails). Regex rules run
+as one Arrow compute kernel over the whole column when pyarrow is installed, and
+as a precompiled pandas `str.fullmatch` otherwise. Each rule returns the number of
+non-null values that actually conform.
+
+Rules are assigned per column by the first matching name glob (and optional dtype
+filter); columns without a rule fall back to counting non-null values.
+"""
+
+import re
+from fnmatch import fnmatchcase
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pandas regex fallback
+    pa = pc = None
+
+BR_STATES = frozenset({
+    'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MT', 'MS', 'MG', 'PA',
+    'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO',
+})
+# Bounding box of Brazil incl. offshore islands, in degrees
+BRAZIL_LAT = (-34.0, 5.5)
+BRAZIL_LNG = (-74.0, -28.0)
+
+_PATTERNS = {
+    'hex32_id': r'^[0-9a-f]{32}$',
+    'zip_prefix': r'^[0-9]{5}$',
+    'iso_timestamp': r'^[0-9]{4}-[0-9]{2}-[0-9]{2}([ T][0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]+)?)?)?$',
+    'email': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
+}
+_COMPILED = {name: re.compile(pattern) for name, pattern in _PATTERNS.items()}
+
+
+def _is_text(series):
+    return pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series)
+
+
+def _regex_mask(series, rule):
+    """Boolean mask of values fully matching the rule's pattern (nulls -> False)."""
+    if pc is not None:
+        array = pa.array(series.astype('string'), type=pa.string(), from_pandas=True)
+        return pc.fill_null(pc.match_substring_regex(array, _PATTERNS[rule]), False).to_numpy(zero_copy_only=False)
+    return series.astype('string').str.fullmatch(_COMPILED[rule]).fillna(False).to_numpy(dtype=bool)
+
+
+def _numeric(series):
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _in_range(series, low, high, integral=False):
+    values = _numeric(series)
+    with np.errstate(invalid='ignore'):
+        mask = (values >= low) & (values <= high)
+    if integral:
+        mask &= np.floor(values) == values
+    return int(mask.sum())
+
+
+def hex32_id(series):
+    """32-char lowercase hex ids (order_id, customer_id, product_id, ...)."""
+    return int(_regex_mask(series, 'hex32_id').sum())
+
+
+def zip_prefix(series):
+    """5-digit zip prefixes; integer columns (leading zeros dropped by read_csv) must be in 0..99999."""
+    if _is_text(series):
+        return int(_regex_mask(series, 'zip_prefix').sum())
+    return _in_range(series, 0, 99999, integral=True)
+
+
+def br_state(series):
+    """Two-letter Brazilian state (UF) codes, case-insensitive."""
+    upper = series.astype('string').str.strip().str.upper()
+    return int(upper.isin(BR_STATES).fillna(False).sum())
+
+
+def iso_timestamp(series):
+    """ISO dates / timestamps that match the layout AND are valid calendar values."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return int(series.notna().sum())
+    shaped = _regex_mask(series, 'iso_timestamp')
+    parsed = pd.to_datetime(series, errors='coerce', format='ISO8601').notna().to_numpy()
+    return int((shaped & parsed).sum())
+
+
+def latitude(series):
+    return _in_range(series, *BRAZIL_LAT)
+
+
+def longitude(series):
+    return _in_range(series, *BRAZIL_LNG)
+
+
+def email(series):
+    return int(_regex_mask(series, 'email').sum())
+
+
+def not_null(series):
+    return int(series.notna().sum())
+
+
+RULES = {
+    'hex32_id': hex32_id,
+    'zip_prefix': zip_prefix,
+    'br_state': br_state,
+    'iso_timestamp': iso_timestamp,
+    'latitude': latitude,
+    'longitude': longitude,
+    'email': email,
+    'not_null': not_null,
+}
+
+# First match wins; `dtypes` restricts a rule to text or numeric columns
+DEFAULT_ASSIGNMENTS = [
+    {'pattern': '*email*', 'rule': 'email'},
+    {'pattern': '*zip_code_prefix', 'rule': 'zip_prefix'},
+    {'pattern': '*_state', 'rule': 'br_state'},
+    {'pattern': '*_lat', 'rule': 'latitude'},
+    {'pattern': '*_lng', 'rule': 'longitude'},
+    {'pattern': '*_id', 'rule': 'hex32_id', 'dtypes': ['string']},
+    {'pattern': '*_date', 'rule': 'iso_timestamp'},
+    {'pattern': '*_timestamp', 'rule': 'iso_timestamp'},
+    {'pattern': '*_at', 'rule': 'iso_timestamp'},
+]
+
+
+class ConformityRules:
+    """Resolve and run the conformity rule for each column."""
+
+    def __init__(self, assignments=None):
+        self.assignments = list(assignments if assignments is not None else DEFAULT_ASSIGNMENTS)
+        for assignment in self.assignments:
+            if assignment['rule'] not in RULES:
+                raise ValueError(f"Unknown conformity rule '{assignment['rule']}'; expected one of {sorted(RULES)}")
+
+    @classmethod
+    def from_config(cls, config):
+        section = (config or {}).get('conformity') or {}
+        return cls(section.get('assignments'))
+
+    def rule_for(self, column, series):
+        for assignment in self.assignments:
+            if not fnmatchcase(column.lower(), assignment['pattern']):
+                continue
+            dtypes = assignment.get('dtypes')
+            if dtypes:
+                kind = 'string' if _is_text(series) else 'numeric' if pd.api.types.is_numeric_dtype(series) else None
+                if kind not in dtypes:
+                    continue
+            return assignment['rule']
+        return 'not_null'
+
+    def count(self, column, series):
+        """Conforming (non-null and valid) values of the column."""
+        return RULES[self.rule_for(column, series)](series)
@@ -0,0 +1,270 @@
+"""
+Consistency Engine for the Data Quality Checker
+Cross-table referential checks (child key ⊂ parent key), intra-row comparison
+rules (e.g. order_delivered_customer_date >= order_purchase_timestamp) and location
+rules (a row's city / state must match the most frequent geolocation city / state
+of its zip prefix, resolved through the geo_centroid zip lookup).
+
+Every key column referenced by a rule gets ONE sorted-unique KeyIndex per run,
+shared by all rules that point at it; membership is a vectorized binary search
+(np.searchsorted), so orphan detection never materializes a pandas merge.
+"""
+
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+from geo_centroid import GEO_COLUMNS, build_zip_lookup
+
+# DQ table the location rules resolve zip prefixes against
+GEO_TABLE = 'olist_geolocation'
+LOCATION_FIELDS = ('city', 'state')
+
+_OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '==': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+_RULE_PATTERN = re.compile(r'^\s*(\S+)\s*(>=|<=|!=|==|>|<)\s*(\S+)\s*$')
+
+
+def _normalize_keys(series, numeric):
+    """
+    Key values as int64 (numeric indexes) or str, a mask of non-null keys and a
+    mask of keys that can match. Non-integral numeric keys (1.5) are non-null but
+    never match (an int64 cast would truncate them onto 1): they stay out of a
+    parent index and count as violations on the child side.
+    """
+    if numeric:
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        integral = present & (values == np.floor(values))
+        return np.where(integral, values, -1).astype(np.int64), present, integral
+    present = series.notna().to_numpy()
+    return series.astype(str).to_numpy().astype(str), present, present
+
+
+class KeyIndex:
+    """Sorted unique key array; `contains` is a vectorized binary search."""
+
+    def __init__(self, keys, numeric):
+        self.keys = keys
+        self.numeric = numeric
+
+    @classmethod
+    def from_series(cls, series):
+        numeric = pd.api.types.is_numeric_dtype(series)
+        values, _, matchable = _normalize_keys(series, numeric)
+        return cls(np.unique(values[matchable]), numeric)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def contains(self, series):
+        """Boolean mask per value; nulls are reported separately via the second return value."""
+        values, present, matchable = _normalize_keys(series, self.numeric)
+        if len(self.keys) == 0:
+            return np.zeros(len(values), dtype=bool), present
+        pos = np.minimum(np.searchsorted(self.keys, values), len(self.keys) - 1)
+        return matchable & (self.keys[pos] == values), present
+
+
+def _place_names(values):
+    """Lower-cased, trimmed, accent-free place names ('São Paulo ' -> 'sao paulo'); nulls stay null."""
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+    names = (pd.Series(uniques, dtype=object).astype(str).str.strip().str.lower()
+             .str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii'))
+    names = np.append(names.to_numpy(dtype=object), None)
+    return names[codes]  # code -1 (null) -> the appended None
+
+
+def _split_ref(ref):
+    table, _, column = ref.rpartition('.')
+    return table, column
+
+
+def parse_row_rule(expression):
+    """'left >= right' -> (left, op_symbol, right); right may be a column or a numeric literal."""
+    match = _RULE_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Cannot parse consistency rule '{expression}' (expected '<column> <op> <column|number>')")
+    return match.groups()
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _comparable(left, right):
+    """Cast two operands to a common comparable type (datetimes unless both are numeric)."""
+    if pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right):
+        return left, right
+    return pd.to_datetime(left, errors='coerce'), pd.to_datetime(right, errors='coerce')
+
+
+class ConsistencyEngine:
+    """
+    Evaluate the configured consistency rules against the loaded tables.
+
+    Parameters:
+    -----------
+    tables : dict
+        {table_name: DataFrame} as loaded by DataQualityChecker
+    references : list of dict
+        [{'child': 'table.column', 'parent': 'table.column'}, ...]
+    row_rules : list of dict
+        [{'table': name, 'rule': 'col_a >= col_b'}, ...]; the rule is scored on col_a
+    key_indexes : dict, optional
+        Prebuilt {(table, column): KeyIndex} to reuse instead of indexing the loaded parent column
+    locations : list of dict, optional
+        [{'table': name, 'zip': column, 'city': column, 'state': column}, ...]; the city and
+        state columns are each scored against the zip lookup of the loaded geolocation table
+    zip_lookup : ZipCentroidLookup, optional
+        Prebuilt lookup to use instead of the loaded geolocation table (e.g. when only a sample is loaded)
+    """
+
+    def __init__(self, tables, references=(), row_rules=(), key_indexes=None, locations=(), zip_lookup=None):
+        self.tables = tables
+        self._indexes = dict(key_indexes or {})
+        self._masks = {}
+        self._zip_lookup = zip_lookup
+        self.rules = {}
+        self.skipped = []
+        for ref in references:
+            child, parent = _split_ref(ref['child']), _split_ref(ref['parent'])
+            if not self._has_column(*child) or not (self._has_column(*parent) or parent in self._indexes):
+                self.skipped.append(f"{ref['child']} ⊂ {ref['parent']}")
+                continue
+            self.rules.setdefault(child, []).append(('reference', parent))
+        for rule in row_rules:
+            left, op, right = parse_row_rule(rule['rule'])
+            table = rule['table']
+            right_ok = self._has_column(table, right) or _is_number(right)
+            if not self._has_column(table, left) or not right_ok:
+                self.skipped.append(f"{table}: {rule['rule']}")
+                continue
+            self.rules.setdefault((table, left), []).append(('row', (left, op, right)))
+        geo_loaded = zip_lookup is not None or (GEO_TABLE in tables and
+                                                set(GEO_COLUMNS).issubset(tables[GEO_TABLE].columns))
+        for location in locations:
+            table, zip_column = location['table'], location['zip']
+            for field in LOCATION_FIELDS:
+                column = location.get(field)
+                if column is None:
+                    continue
+                if not (geo_loaded and self._has_column(table, zip_column) and self._has_column(table, column)):
+                    self.skipped.append(f"{table}.{column} = {GEO_TABLE} {field} of {zip_column}")
+                    continue
+                self.rules.setdefault((table, column), []).append(('location', (zip_column, field)))
+
+    def _has_column(self, table, column):
+        return table in self.tables and column in self.tables[table].columns
+
+    def index(self, table, column):
+        """KeyIndex for a key column; built on first use and shared afterwards."""
+        key = (table, column)
+        if key not in self._indexes:
+            self._indexes[key] = KeyIndex.from_series(self.tables[table][column])
+        return self._indexes[key]
+
+    def zip_lookup(self):
+        """ZipCentroidLookup of this run's geolocation table; built on first use and shared afterwards."""
+        if self._zip_lookup is None:
+            self._zip_lookup = build_zip_lookup(self.tables[GEO_TABLE])
+        return self._zip_lookup
+
+    def has_rules(self, table, column):
+        return (table, column) in self.rules
+
+    def _evaluate(self, df, column, rule):
+        """True where the row satisfies the rule; null operands are not violations."""
+        kind, spec = rule
+        if kind == 'reference':
+            found, present = self.index(*spec).contains(df[column])
+            return found | ~present
+        if kind == 'location':
+            # unknown zips are the referential rule's concern, so like nulls they are not violations
+            zip_column, field = spec
+            lookup = self.zip_lookup()
+            if len(lookup) == 0:
+                return np.ones(len(df), dtype=bool)
+            pos = lookup.positions(df[zip_column])
+            expected = _place_names(getattr(lookup, field))[np.maximum(pos, 0)]
+            actual = _place_names(df[column])
+            checked = (pos >= 0) & pd.notna(actual) & (expected != '')
+            return ~checked | (actual == expected)
+        left, op, right = spec
+        right_values = df[right] if right in df.columns else pd.Series(float(right), index=df.index)
+        a, b = _comparable(df[left], right_values)
+        both = (a.notna() & b.notna()).to_numpy()
+        return ~both | _OPERATORS[op](a, b).to_numpy()
+
+    def _rule_mask(self, table, column, rule):
+        cache_key = (table, column, rule)
+        if cache_key not in self._masks:
+            self._masks[cache_key] = self._evaluate(self.tables[table], column, rule)
+        return self._masks[cache_key]
+
+    def consistent_count(self, table, column, sample=None):
+        """
+        Rows of table.column that satisfy every rule attached to it. With `sample`
+        (a frame of some of the table's rows) only those rows are evaluated; parent
+        key indexes still cover the full parent tables.
+        """
+        if sample is None:
+            mask = np.ones(len(self.tables[table]), dtype=bool)
+            for rule in self.rules.get((table, column), []):
+                mask &= self._rule_mask(table, column, rule)
+        else:
+            mask = np.ones(len(sample), dtype=bool)
+            for rule in self.rules.get((table, column), []):
+                mask &= self._evaluate(sample, column, rule)
+        return int(mask.sum())
+
+    def rule_report(self):
+        """One entry per rule evaluated on a full table: description, checked rows and violations."""
+        report = []
+        for (table, column), rules in self.rules.items():
+            for rule in rules:
+                if (table, column, rule) not in self._masks:
+                    continue  # not planned, or only seen through a sample
+                kind, spec = rule
+                if kind == 'reference':
+                    description = f"{table}.{column} ⊂ {spec[0]}.{spec[1]}"
+                elif kind == 'location':
+                    description = f"{table}.{column} = {GEO_TABLE} {spec[1]} of {spec[0]}"
+                else:
+                    description = f"{table}: {' '.join(spec)}"
+                mask = self._rule_mask(table, column, rule)
+                report.append({"rule": description, "type": kind, "rows": int(len(mask)),
+                               "violations": int((~mask).sum())})
+        return report
+
+
+def required_columns(references=(), row_rules=(), locations=()):
+    """{table: {columns}} every configured rule reads, so they are loaded even if not checked."""
+    required = {}
+    for ref in references:
+        for table, column in (_split_ref(ref['child']), _split_ref(ref['parent'])):
+            required.setdefault(table, set()).add(column)
+    for rule in row_rules:
+        left, _, right = parse_row_rule(rule['rule'])
+        columns = required.setdefault(rule['table'], set())
+        columns.add(left)
+        if not _is_number(right):
+            columns.add(right)
+    for location in locations:
+        columns = required.setdefault(location['table'], set())
+        columns.update(location[key] for key in ('zip',) + LOCATION_FIELDS if location.get(key))
+    if locations:
+        required.setdefault(GEO_TABLE, set()).update(GEO_COLUMNS)
+    return required
@@ -0,0 +1,269 @@
+"""
+Schema and Distribution Drift Between Data Loads
+Each profiling run stores one compact sketch per column, built on the metrics from
+calculate_column_profile (null %, distinct count, mean, std). Numeric columns also
+keep 101 quantile points. Other columns keep their top-k value frequencies. The
+current load is compared against the previous load's sketches only, so historical
+CSVs are never re-read.
+
+Metrics per column:
+    psi : Population Stability Index over the previous load's decile bins (or top-k values)
+    ks  : Kolmogorov-Smirnov distance between the quantile CDFs (numeric only)
+    js  : Jensen-Shannon divergence (base 2, 0..1) over the same bins as PSI
+Schema changes: tables / columns added or removed and dtype changes.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DRIFT_DIR = Path("data_profiling_output/drift")
+REPORT_FILE = "drift_report.json"
+QUANTILE_POINTS = np.linspace(0, 1, 101)
+TOP_K = 20
+# Common PSI reading: < 0.1 stable, 0.1 - 0.25 moderate shift, >= 0.25 major shift
+PSI_MODERATE, PSI_MAJOR = 0.1, 0.25
+_EPS = 1e-4
+_OTHER = '__other__'
+
+
+def column_sketch(series, profile=None):
+    """
+    Compact, JSON-serializable sketch of one column.
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Column of the current load
+    profile : dict, optional
+        Row of calculate_column_profile for this column (null %, distinct count, mean, std)
+
+    Returns:
+    --------
+    dict : dtype, rows, profile metrics and either `quantiles` or `top_k` + `other`
+    """
+    profile = profile or {}
+    total = len(series)
+    sketch = {
+        'dtype': str(series.dtype),
+        'rows': int(total),
+        'percent_null': float(profile.get('percent_null', series.isna().mean() * 100 if total else 0)),
+        'distinct_count': int(profile.get('distinct_count', series.nunique())),
+    }
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        sketch['kind'] = 'numeric'
+        sketch['mean'] = _maybe_float(profile.get('mean', values.mean() if len(values) else None))
+        sketch['std'] = _maybe_float(profile.get('std_dev', values.std(ddof=1) if len(values) > 1 else None))
+        sketch['quantiles'] = np.quantile(values, QUANTILE_POINTS).tolist() if len(values) else None
+    else:
+        counts = series.dropna().astype(str).value_counts(normalize=True)
+        top = counts.iloc[:TOP_K]
+        sketch['kind'] = 'categorical'
+        sketch['top_k'] = {str(k): float(v) for k, v in top.items()}
+        sketch['other'] = float(max(1.0 - top.sum(), 0.0)) if len(counts) else 0.0
+    return sketch
+
+
+def _maybe_float(value):
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def table_sketches(datasets, profile_df=None):
+    """{table: {column: sketch}} for every loaded table, reusing profile rows when given."""
+    profiles = {}
+    if profile_df is not None and len(profile_df):
+        profiles = {(r['table_name'], r['column_name']): r for r in profile_df.to_dict('records')}
+    return {
+        table: {column: column_sketch(df[column], profiles.get((table, column))) for column in df.columns}
+        for table, df in datasets.items()
+    }
+
+
+# --- distances -----------------------------------------------------------------
+def psi(expected, actual):
+    expected = np.clip(np.asarray(expected, dtype=np.float64), _EPS, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), _EPS, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def js_divergence(p, q):
+    p = np.asarray(p, dtype=np.float64)
+    q = np.asarray(q, dtype=np.float64)
+    m = (p + q) / 2
+
+    def kl(a, b):
+        mask = a > 0
+        return np.sum(a[mask] * np.log2(a[mask] / b[mask]))
+
+    return float(max(0.5 * kl(p, m) + 0.5 * kl(q, m), 0.0))
+
+
+def _cdf(quantiles, x):
+    """Empirical CDF of the quantile points (1 % resolution)."""
+    return np.searchsorted(quantiles, x, side='right') / len(quantiles)
+
+
+def _numeric_masses(previous, current):
+    """Probability mass of both loads in the previous load's decile bins."""
+    prev_q, cur_q = np.asarray(previous), np.asarray(current)
+    edges = np.unique(prev_q[10:100:10])
+    expected = np.diff(np.concatenate([[0.0], _cdf(prev_q, edges), [1.0]]))
+    actual = np.diff(np.concatenate([[0.0], _cdf(cur_q, edges), [1.0]]))
+    return expected, actual
+
+
+def _categorical_masses(previous, current):
+    """Masses over the union of both top-k lists plus the remainder bucket."""
+    keys = sorted(set(previous['top_k']) | set(current['top_k']))
+
+    def masses(sketch):
+        mass = np.array([sketch['top_k'].get(k, 0.0) for k in keys] + [0.0])
+        mass[-1] = max(1.0 - mass.sum(), 0.0)
+        return mass
+
+    return masses(previous), masses(current)
+
+
+def compare_columns(previous, current):
+    """
+    Drift metrics between two sketches of the same column.
+
+    Returns:
+    --------
+    dict : psi, ks, js, null/distinct deltas and a status (stable / moderate / major);
+           metrics are None when either load has no values
+    """
+    result = {
+        'kind': current['kind'],
+        'null_pct_change': round(current['percent_null'] - previous['percent_null'], 2),
+        'distinct_change': current['distinct_count'] - previous['distinct_count'],
+        'psi': None, 'ks': None, 'js': None,
+    }
+    if current['kind'] == 'numeric':
+        if previous.get('quantiles') is None or current.get('quantiles') is None:
+            result['status'] = 'stable'
+            return result
+        expected, actual = _numeric_masses(previous['quantiles'], current['quantiles'])
+        grid = np.union1d(previous['quantiles'], current['quantiles'])
+        ks = np.abs(_cdf(np.asarray(previous['quantiles']), grid) - _cdf(np.asarray(current['quantiles']), grid))
+        result['ks'] = round(float(ks.max()), 4)
+    else:
+        expected, actual = _categorical_masses(previous, current)
+    result['psi'] = round(psi(expected, actual), 4)
+    result['js'] = round(js_divergence(expected, actual), 4)
+    result['status'] = 'major' if result['psi'] >= PSI_MAJOR else 'moderate' if result['psi'] >= PSI_MODERATE else 'stable'
+    return result
+
+
+def schema_changes(previous, current):
+    """Tables / columns added or removed and dtype changes between two loads' sketches."""
+    changes = []
+    for table in sorted(set(previous) | set(current)):
+        if table not in current:
+            changes.append({'table_name': table, 'column_name': None, 'change': 'table_removed'})
+            continue
+        if table not in previous:
+            changes.append({'table_name': table, 'column_name': None, 'change': 'table_added'})
+            continue
+        before, after = previous[table], current[table]
+        for column in [c for c in before if c not in after]:
+            changes.append({'table_name': table, 'column_name': column, 'change': 'column_removed'})
+        for column in after:
+            if column not in before:
+                changes.append({'table_name': table, 'column_name': column, 'change': 'column_added'})
+            elif before[column]['dtype'] != after[column]['dtype']:
+                changes.append({'table_name': table, 'column_name': column, 'change': 'dtype_changed',
+                                'from': before[column]['dtype'], 'to': after[column]['dtype']})
+    return changes
+
+
+def drift_report(previous, current, load_id, previous_load_id=None):
+    """Column drift for every column present in both loads with the same sketch kind."""
+    columns = []
+    for table, sketches in current.items():
+        for column, sketch in sketches.items():
+            before = (previous.get(table) or {}).get(column)
+            if before is None or before['kind'] != sketch['kind']:
+                continue
+            columns.append({'table_name': table, 'column_name': column, **compare_columns(before, sketch)})
+    return {
+        'load_id': load_id,
+        'previous_load_id': previous_load_id,
+        'schema_changes': schema_changes(previous, current) if previous_load_id else [],
+        'columns': columns,
+        'drifted_columns': sum(c['status'] != 'stable' for c in columns),
+    }
+
+
+class SketchStore:
+    """One sketches_<load_id>.json per load plus the latest drift_report.json."""
+
+    def __init__(self, directory=DRIFT_DIR):
+        self.directory = Path(directory)
+
+    def loads(self):
+        return sorted(p.stem[len('sketches_'):] for p in self.directory.glob('sketches_*.json'))
+
+    def read(self, load_id):
+        with open(self.directory / f"sketches_{load_id}.json") as f:
+            return json.load(f)
+
+    def write(self, load_id, sketches):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / f"sketches_{load_id}.json", 'w') as f:
+            json.dump(sketches, f)
+
+    def latest(self):
+        loads = self.loads()
+        return (loads[-1], self.read(loads[-1])) if loads else (None, {})
+
+
+def detect_drift(datasets, profile_df=None, directory=DRIFT_DIR, load_id=None):
+    """
+    Sketch the current load, compare it with the previous load and persist both.
+
+    Returns:
+    --------
+    dict : drift report (also written to <directory>/drift_report.json)
+    """
+    return record_sketches(table_sketches(datasets, profile_df), directory, load_id)
+
+
+def record_sketches(current, directory=DRIFT_DIR, load_id=None):
+    """
+    detect_drift for a load that was already sketched (table_sketches output), e.g.
+    table by table while the profiler had each table loaded.
+    """
+    store = SketchStore(directory)
+    previous_id, previous = store.latest()
+    load_id = load_id or datetime.now().strftime('%Y%m%dT%H%M%S')
+    report = drift_report(previous, current, load_id, previous_id)
+    store.write(load_id, current)
+    with open(store.directory / REPORT_FILE, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def load_report(path=DRIFT_DIR / REPORT_FILE):
+    """Latest drift report, or None if no profiling run has produced one."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def summarize(report):
+    """Compact drift block for dq_summary.json."""
+    return {
+        'load_id': report['load_id'],
+        'previous_load_id': report['previous_load_id'],
+        'drifted_columns': report['drifted_columns'],
+        'schema_changes': len(report['schema_changes']),
+        'major': [f"{c['table_name']}.{c['column_name']}" for c in report['columns'] if c['status'] == 'major'],
+    }
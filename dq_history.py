@@ -0,0 +1,202 @@
+"""
+Historical Data Quality Score Store
+Append-only SQLite store of every DQ run's per-column scores, so score drift and
+regressions can be tracked across runs (dq_summary.json only holds the latest run).
+
+Layout:
+    runs   : one row per run (timestamp, run_date partition key, threshold, pass rate)
+    scores : one row per (run, table, column) with every dimension score, the
+             overall score and the pass flag
+
+Recording a run is a single transaction of len(results) inserts. Trend queries hit
+the (table_name, column_name, run_id) index and alerts only read each column's own
+last few scored runs, so neither slows down as history accumulates and runs of other
+tables / feeds in between do not break a column's baseline.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dq_results import DIMENSIONS, SCAN_LABELS
+
+HISTORY_FILE = "dq_history.sqlite"
+SCORE_FIELDS = DIMENSIONS + ('overall',)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    threshold REAL NOT NULL,
+    total_columns INTEGER NOT NULL,
+    passed_columns INTEGER NOT NULL,
+    pass_rate REAL
+);
+CREATE INDEX IF NOT EXISTS runs_by_date ON runs (run_date);
+CREATE TABLE IF NOT EXISTS scores (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    total_rows INTEGER NOT NULL,
+    {', '.join(f'{field} REAL' for field in SCORE_FIELDS)},
+    passed INTEGER NOT NULL,
+    scan TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_column ON scores (table_name, column_name, run_id);
+CREATE INDEX IF NOT EXISTS scores_by_run ON scores (run_id);
+"""
+
+
+def _nullable(values):
+    """float array -> list with NaN as None (SQL NULL)."""
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+class HistoryStore:
+    """Append-only run history with trend and alert queries."""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_run(self, results):
+        """
+        Append one run's ResultTable.
+
+        Returns:
+        --------
+        int : run_id of the new run
+        """
+        n = len(results)
+        passed = results.passed
+        overall = results.overall_scores
+        scored = ~np.isnan(overall)
+        pass_rate = round(float(passed[scored].mean() * 100), 2) if scored.any() else None
+        columns = [_nullable(results.scores[:, i]) for i in range(len(DIMENSIONS))] + [_nullable(overall)]
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (run_at, run_date, threshold, total_columns, passed_columns, pass_rate) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (results.run_timestamp, results.run_timestamp[:10], results.threshold,
+                 n, int(passed.sum()), pass_rate),
+            )
+            run_id = cursor.lastrowid
+            tables = [results.table_names[i] for i in results.table_idx]
+            placeholders = ', '.join('?' * (len(SCORE_FIELDS) + 6))
+            self.conn.executemany(
+                f"INSERT INTO scores (run_id, table_name, column_name, total_rows, "
+                f"{', '.join(SCORE_FIELDS)}, passed, scan) VALUES ({placeholders})",
+                zip([run_id] * n, tables, results.column_names, results.total_rows.tolist(),
+                    *columns, passed.astype(int).tolist(), [SCAN_LABELS[s] for s in results.scan]),
+            )
+        return run_id
+
+    def runs(self, last=None):
+        """Run metadata, oldest first (optionally only the last N runs)."""
+        query = "SELECT * FROM runs ORDER BY run_id DESC"
+        params = ()
+        if last is not None:
+            query += " LIMIT ?"
+            params = (int(last),)
+        return pd.read_sql_query(query, self.conn, params=params).iloc[::-1].reset_index(drop=True)
+
+    def trend(self, table_name, column_name, dimension='overall', last=10):
+        """
+        Score of table.column over its last N recorded runs, oldest first.
+
+        Returns:
+        --------
+        pd.DataFrame : run_id, run_at, score, passed
+        """
+        if dimension not in SCORE_FIELDS:
+            raise ValueError(f"Unknown dimension '{dimension}'; expected one of {list(SCORE_FIELDS)}")
+        frame = pd.read_sql_query(
+            f"SELECT s.run_id, r.run_at, s.{dimension} AS score, s.passed FROM scores s "
+            "JOIN runs r ON r.run_id = s.run_id "
+            "WHERE s.table_name = ? AND s.column_name = ? ORDER BY s.run_id DESC LIMIT ?",
+            self.conn, params=(table_name, column_name, int(last)),
+        )
+        frame['score'] = frame['score'].astype(float)
+        frame['passed'] = frame['passed'].astype(bool)
+        return frame.iloc[::-1].reset_index(drop=True)
+
+    def alerts(self, run_id=None, window=5, drop=5.0, z=3.0):
+        """
+        Regressions and drift of the overall score in `run_id` (default: latest run).
+
+        Parameters:
+        -----------
+        window : int
+            Prior scored runs of each column forming its baseline
+        drop : float
+            Score points: minimum fall vs the previous run ('drop') and minimum
+            deviation from the baseline mean ('drift')
+        z : float
+            Drift also needs the deviation to exceed z times the std of run-to-run
+            changes within the baseline
+
+        Returns:
+        --------
+        list of dict : table_name, column_name, kind (regression / drop / drift),
+                       score, previous, baseline, message
+        """
+        if run_id is None:
+            run_id = self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+            if run_id is None:
+                return []
+        # Per column of this run: the run itself plus its own last `window` scored runs before it
+        # (rank 1 = this run, 2 = the column's previous scored run, ...)
+        frame = pd.read_sql_query(
+            "WITH current AS (SELECT table_name, column_name FROM scores WHERE run_id = ?), "
+            "ranked AS (SELECT s.table_name, s.column_name, s.overall, s.passed, ROW_NUMBER() OVER "
+            "(PARTITION BY s.table_name, s.column_name ORDER BY s.run_id DESC) AS rank "
+            "FROM scores s JOIN current USING (table_name, column_name) "
+            "WHERE s.run_id = ? OR (s.run_id < ? AND s.overall IS NOT NULL)) "
+            "SELECT * FROM ranked WHERE rank <= ?",
+            self.conn, params=(int(run_id), int(run_id), int(run_id), int(window) + 1),
+        )
+        if frame.empty or frame['rank'].max() < 2:
+            return []
+        # rank descending = oldest first
+        scores = frame.pivot(index=['table_name', 'column_name'], columns='rank', values='overall')
+        scores = scores[sorted(scores.columns, reverse=True)]
+        passed = frame.pivot(index=['table_name', 'column_name'], columns='rank', values='passed')
+        current, was_passed, now_passed = scores[1], passed[2], passed[1]
+        prior = scores.drop(columns=1)
+        previous = prior[2]
+        baseline = prior.mean(axis=1)
+        # Noise = spread of run-to-run changes, so a steady decline is not mistaken for noise
+        spread = prior.diff(axis=1).std(axis=1).fillna(0.0)
+        history = prior.count(axis=1)
+
+        alerts = []
+        for key, score in current.dropna().items():
+            prev, base = previous[key], baseline[key]
+            if now_passed[key] == 0 and was_passed[key] == 1:
+                kind, message = 'regression', f"now failing ({score:.2f}, was {prev:.2f})"
+            elif prev - score >= drop:
+                kind, message = 'drop', f"fell {prev - score:.2f} points since the previous run"
+            elif history[key] >= 2 and abs(score - base) >= max(drop, z * spread[key]):
+                kind, message = 'drift', f"{score - base:+.2f} points from the {history[key]}-run baseline"
+            else:
+                continue
+            alerts.append({
+                'table_name': key[0], 'column_name': key[1], 'kind': kind, 'score': float(score),
+                'previous': None if np.isnan(prev) else float(prev),
+                'baseline': None if np.isnan(base) else round(float(base), 2), 'message': message,
+            })
+        return alerts
@@ -0,0 +1,111 @@
+"""
+Check Execution Plan for the Data Quality Checker
+Compiles the `checks` section of dq_config.yml into a plan of which dimensions run
+on which table columns. Columns are targeted with glob patterns on "table.column"
+and optional dtype filters; tables and columns no enabled check targets are never
+read from disk.
+
+    checks:
+      accuracy:
+        enabled: true
+        include: ["olist_order_*.*"]     # default ["*.*"]
+        exclude: ["*.*_id"]
+        dtypes: [numeric]                # numeric | string | datetime | bool | exact dtype name
+"""
+
+from fnmatch import fnmatchcase
+
+import pandas as pd
+
+from dq_results import DIMENSIONS
+
+_DTYPE_GROUPS = {
+    'numeric': lambda dtype: pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype),
+    'string': lambda dtype: pd.api.types.is_string_dtype(dtype) or pd.api.types.is_object_dtype(dtype),
+    'datetime': pd.api.types.is_datetime64_any_dtype,
+    'bool': pd.api.types.is_bool_dtype,
+}
+
+
+def _as_list(value, default):
+    if value is None:
+        return list(default)
+    return [value] if isinstance(value, str) else list(value)
+
+
+class DimensionRule:
+    """Targeting for one dimension: enabled flag, include/exclude globs and dtype filter."""
+
+    def __init__(self, name, enabled=True, include=None, exclude=None, dtypes=None):
+        self.name = name
+        self.enabled = bool(enabled)
+        self.include = _as_list(include, ['*.*'])
+        self.exclude = _as_list(exclude, [])
+        self.dtypes = _as_list(dtypes, [])
+
+    def matches_name(self, table, column):
+        qualified = f"{table}.{column}"
+        return (any(fnmatchcase(qualified, p) for p in self.include)
+                and not any(fnmatchcase(qualified, p) for p in self.exclude))
+
+    def matches_dtype(self, dtype):
+        if not self.dtypes:
+            return True
+        return any(_DTYPE_GROUPS[d](dtype) if d in _DTYPE_GROUPS else str(dtype) == d for d in self.dtypes)
+
+    def describe(self):
+        if not self.enabled:
+            return f"{self.name}: disabled"
+        target = ', '.join(self.include)
+        if self.exclude:
+            target += f" except {', '.join(self.exclude)}"
+        if self.dtypes:
+            target += f" [{', '.join(self.dtypes)}]"
+        return f"{self.name}: {target}"
+
+
+class ExecutionPlan:
+    """
+    Which dimensions run on which columns.
+
+    Dimensions missing from the config run everywhere (the pre-plan behaviour);
+    configured checks without an implementation (e.g. timeliness) are reported
+    in `unsupported` and ignored.
+    """
+
+    def __init__(self, rules, unsupported=()):
+        self.rules = rules
+        self.unsupported = list(unsupported)
+
+    @classmethod
+    def from_config(cls, config):
+        checks = (config or {}).get('checks') or {}
+        rules, unsupported = {}, []
+        for name, spec in checks.items():
+            if name not in DIMENSIONS:
+                unsupported.append(name)
+                continue
+            spec = spec or {}
+            rules[name] = DimensionRule(name, spec.get('enabled', True), spec.get('include'),
+                                        spec.get('exclude'), spec.get('dtypes'))
+        for name in DIMENSIONS:
+            rules.setdefault(name, DimensionRule(name))
+        return cls(rules, unsupported)
+
+    @property
+    def enabled_dimensions(self):
+        return [d for d in DIMENSIONS if self.rules[d].enabled]
+
+    def columns_to_load(self, table, columns, required=()):
+        """Header columns any enabled dimension targets by name, plus `required` ones (e.g. rule keys)."""
+        required = set(required)
+        return [c for c in columns
+                if c in required or any(self.rules[d].matches_name(table, c) for d in self.enabled_dimensions)]
+
+    def dimensions_for(self, table, column, dtype):
+        """Enabled dimensions whose globs and dtype filter match this column."""
+        return [d for d in self.enabled_dimensions
+                if self.rules[d].matches_name(table, column) and self.rules[d].matches_dtype(dtype)]
+
+    def describe(self):
+        return [self.rules[d].describe() for d in DIMENSIONS]
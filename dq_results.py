@@ -0,0 +1,341 @@
+"""
+Columnar Data Quality Results
+One typed row per checked column with a (columns x dimensions) matrix of valid-record
+counts. Scores, pass/fail flags, per-table summaries and the CSV frame are derived
+with NumPy; the human-readable "n/m valid" details and JSON records are only built
+when results are exported.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ('completeness', 'validity', 'uniqueness', 'accuracy', 'consistency', 'conformity')
+# Uniqueness is tracked but NOT included in the overall score / threshold
+SCORED_DIMENSIONS = tuple(d for d in DIMENSIONS if d != 'uniqueness')
+DETAIL_LABELS = {
+    'completeness': 'non-null',
+    'validity': 'valid',
+    'uniqueness': 'unique',
+    'accuracy': 'accurate',
+    'consistency': 'consistent',
+    'conformity': 'conform',
+}
+
+CSV_COLUMNS = [
+    "Table", "Column", "Data Type", "Total Rows", "Overall Score", "Status",
+    "Completeness Score", "Validity Score", "Uniqueness Score", "Accuracy Score",
+    "Consistency Score", "Conformity Score", "Scan", "Overall CI Low", "Overall CI High", "Threshold", "Note",
+]
+OVERALL_NOTE = "Overall score excludes Uniqueness"
+
+_SCORED_IDX = [DIMENSIONS.index(d) for d in SCORED_DIMENSIONS]
+
+# valid-count sentinel for a dimension the execution plan did not run on a column
+NOT_RUN = -1
+
+# How a column was scored: exact full scan, sample estimate, or sample escalated to a full scan
+SCAN_FULL, SCAN_SAMPLE, SCAN_ESCALATED = 0, 1, 2
+SCAN_LABELS = ('full', 'sample', 'escalated')
+
+
+def _scores(valid, total):
+    """Percentage scores rounded to 2 decimals; 0 for empty tables, NaN where not run."""
+    total = np.asarray(total, dtype=np.float64)[..., None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(total > 0, valid / total * 100, 0.0)
+    return np.where(valid == NOT_RUN, np.nan, np.round(scores, 2))
+
+
+def _overall(scores):
+    """Mean of the scored dimensions that ran (uniqueness excluded); NaN if none ran."""
+    scored = scores[..., _SCORED_IDX]
+    ran = (~np.isnan(scored)).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.round(np.nansum(scored, axis=-1) / ran, 2)
+
+
+def _overall_ci(ci, valid):
+    """Overall-score interval: mean of the bounds of the scored dimensions that ran."""
+    bounds = ci[..., _SCORED_IDX, :]
+    ran = (valid[..., _SCORED_IDX] != NOT_RUN).sum(axis=-1)[..., None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.round(np.nansum(bounds, axis=-2) / ran, 2)
+
+
+class ResultTable:
+    """
+    Growable column-oriented store of check results.
+
+    Per checked column: table index (into `table_names`), column name, dtype,
+    total rows and one valid-record count per dimension (NOT_RUN if skipped).
+    Columns where no gating dimension ran have a NaN overall score and are not failed.
+    Sampled columns store estimated valid counts plus a [low, high] score interval
+    per dimension (NaN for exact scans).
+    """
+
+    def __init__(self, threshold, run_timestamp=None, capacity=64):
+        self.threshold = float(threshold)
+        self.run_timestamp = run_timestamp or datetime.now().isoformat()
+        self.table_names = []
+        self._table_index = {}
+        self.column_names = []
+        self.data_types = []
+        self._table_idx = np.empty(capacity, dtype=np.int32)
+        self._total = np.empty(capacity, dtype=np.int64)
+        self._valid = np.empty((capacity, len(DIMENSIONS)), dtype=np.int64)
+        self._scan = np.empty(capacity, dtype=np.int8)
+        self._sample_rows = np.empty(capacity, dtype=np.int64)
+        self._ci = np.empty((capacity, len(DIMENSIONS), 2), dtype=np.float64)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self):
+        capacity = max(2 * len(self._total), 1)
+        for name in ('_table_idx', '_total', '_valid', '_scan', '_sample_rows', '_ci'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def add_column(self, table_name, column_name, data_type, total_rows, valid_counts,
+                   scan=SCAN_FULL, sample_rows=0, ci=None):
+        """
+        Append one checked column.
+
+        Parameters:
+        -----------
+        valid_counts : sequence of int
+            Valid-record count per dimension, in DIMENSIONS order (estimated when sampled)
+        scan : int
+            SCAN_FULL, SCAN_SAMPLE or SCAN_ESCALATED
+        sample_rows : int
+            Rows in the sample the estimate came from (0 for full scans)
+        ci : array-like, optional
+            (dimensions x 2) score interval in percent; NaN where exact or not run
+
+        Returns:
+        --------
+        int : Row index of the column
+        """
+        if self._n == len(self._total):
+            self._grow()
+        if table_name not in self._table_index:
+            self._table_index[table_name] = len(self.table_names)
+            self.table_names.append(table_name)
+        i = self._n
+        self._table_idx[i] = self._table_index[table_name]
+        self._total[i] = total_rows
+        self._valid[i] = valid_counts
+        self._scan[i] = scan
+        self._sample_rows[i] = sample_rows
+        self._ci[i] = np.nan if ci is None else ci
+        self.column_names.append(column_name)
+        self.data_types.append(data_type)
+        self._n += 1
+        return i
+
+    # --- typed views -------------------------------------------------------
+    @property
+    def table_idx(self):
+        return self._table_idx[:self._n]
+
+    @property
+    def total_rows(self):
+        return self._total[:self._n]
+
+    @property
+    def valid(self):
+        return self._valid[:self._n]
+
+    @property
+    def scan(self):
+        return self._scan[:self._n]
+
+    @property
+    def sample_rows(self):
+        return self._sample_rows[:self._n]
+
+    @property
+    def ci(self):
+        """(columns x dimensions x 2) score intervals; NaN for exact scores."""
+        return self._ci[:self._n]
+
+    @property
+    def overall_ci(self):
+        """(columns x 2) overall-score interval: mean of the scored dimensions' bounds."""
+        return np.where(self.scan[:, None] == SCAN_SAMPLE, _overall_ci(self.ci, self.valid), np.nan)
+
+    @property
+    def invalid(self):
+        return np.where(self.valid == NOT_RUN, NOT_RUN, self.total_rows[:, None] - self.valid)
+
+    @property
+    def scores(self):
+        """(columns x dimensions) percentage scores (NaN where the dimension did not run)."""
+        return _scores(self.valid, self.total_rows)
+
+    @property
+    def overall_scores(self):
+        return _overall(self.scores)
+
+    @property
+    def passed(self):
+        return ~(self.overall_scores < self.threshold)
+
+    def dimension_rows(self):
+        """Long format: one row per (table, column, dimension) with numeric counts."""
+        n, d = self.valid.shape
+        return pd.DataFrame({
+            'table_name': pd.Categorical.from_codes(np.repeat(self.table_idx, d), self.table_names),
+            'column_name': np.repeat(np.asarray(self.column_names, dtype=object), d),
+            'dimension': pd.Categorical.from_codes(np.tile(np.arange(d), n), DIMENSIONS),
+            'total_rows': np.repeat(self.total_rows, d),
+            'valid_records': self.valid.ravel(),
+            'score': self.scores.ravel(),
+        })
+
+    # --- aggregation -------------------------------------------------------
+    def summary(self):
+        """Overall and per-table pass/fail summary (dq_summary.json)."""
+        n_tables = len(self.table_names)
+        overall, passed = self.overall_scores, self.passed
+        scored = ~np.isnan(overall)
+        counts = np.bincount(self.table_idx, minlength=n_tables)
+        passed_counts = np.bincount(self.table_idx, weights=passed, minlength=n_tables).astype(np.int64)
+        scored_counts = np.bincount(self.table_idx, weights=scored, minlength=n_tables)
+        score_sums = np.bincount(self.table_idx, weights=np.where(scored, overall, 0.0), minlength=n_tables)
+
+        tables = {}
+        for t, name in enumerate(self.table_names):
+            average = round(float(score_sums[t] / scored_counts[t]), 2) if scored_counts[t] else 0.0
+            tables[name] = {
+                "total_columns": int(counts[t]),
+                "passed_columns": int(passed_counts[t]),
+                "failed_columns": int(counts[t] - passed_counts[t]),
+                "average_score": average,
+                "passed": bool(average >= self.threshold),
+            }
+        total, n_passed = len(self), int(passed.sum())
+        return {
+            "total_columns": total,
+            "passed_columns": n_passed,
+            "failed_columns": total - n_passed,
+            "overall_pass_rate": round(float(n_passed / total * 100) if total > 0 else 0, 2),
+            "threshold": self.threshold,
+            "total_tables": n_tables,
+            "tables": tables,
+            "sampled_columns": int((self.scan == SCAN_SAMPLE).sum()),
+            "escalated_columns": int((self.scan == SCAN_ESCALATED).sum()),
+            "timestamp": self.run_timestamp,
+        }
+
+    # --- export ------------------------------------------------------------
+    def record(self, i):
+        """Nested result dict for one column (the dq_results_detailed format)."""
+        total = int(self._total[i])
+        scores = _scores(self._valid[i], total)
+        overall = float(_overall(scores))
+        result = {
+            "table_name": self.table_names[self._table_idx[i]],
+            "column_name": self.column_names[i],
+            "data_type": self.data_types[i],
+            "total_rows": total,
+            "scan": SCAN_LABELS[self._scan[i]],
+        }
+        sampled = self._scan[i] == SCAN_SAMPLE
+        if sampled:
+            result["sample_rows"] = int(self._sample_rows[i])
+        for d, dim in enumerate(DIMENSIONS):
+            valid = int(self._valid[i, d])
+            if valid == NOT_RUN:
+                result[dim] = {"score": None, "valid_records": None, "invalid_records": None, "details": "not run"}
+                continue
+            result[dim] = {
+                "score": float(scores[d]),
+                "valid_records": valid,
+                "invalid_records": total - valid,
+                "details": f"{'~' if sampled else ''}{valid}/{total} {DETAIL_LABELS[dim]}",
+            }
+            if sampled:
+                result[dim]["ci"] = [float(self._ci[i, d, 0]), float(self._ci[i, d, 1])]
+        result["overall_score"] = None if np.isnan(overall) else overall
+        if sampled:
+            result["overall_ci"] = _overall_ci(self._ci[i], self._valid[i]).tolist()
+        result["overall_passed"] = bool(not overall < self.threshold)
+        result["timestamp"] = self.run_timestamp
+        return result
+
+    def records(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def to_frame(self):
+        """dq_results_summary.csv layout, built column-wise."""
+        scores = self.scores
+        frame = pd.DataFrame({
+            "Table": np.asarray(self.table_names, dtype=object)[self.table_idx] if len(self) else [],
+            "Column": self.column_names,
+            "Data Type": self.data_types,
+            "Total Rows": self.total_rows,
+            "Overall Score": self.overall_scores,
+            "Status": np.where(self.passed, "PASS", "FAIL"),
+        })
+        for d, dim in enumerate(DIMENSIONS):
+            frame[f"{dim.capitalize()} Score"] = scores[:, d]
+        overall_ci = self.overall_ci
+        frame["Scan"] = np.asarray(SCAN_LABELS, dtype=object)[self.scan] if len(self) else []
+        frame["Overall CI Low"] = overall_ci[:, 0]
+        frame["Overall CI High"] = overall_ci[:, 1]
+        frame["Threshold"] = self.threshold
+        frame["Note"] = OVERALL_NOTE
+        return frame[CSV_COLUMNS]
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            threshold=self.threshold,
+            run_timestamp=self.run_timestamp,
+            table_names=np.asarray(self.table_names, dtype=str),
+            column_names=np.asarray(self.column_names, dtype=str),
+            data_types=np.asarray(self.data_types, dtype=str),
+            table_idx=self.table_idx,
+            total_rows=self.total_rows,
+            valid=self.valid,
+            scan=self.scan,
+            sample_rows=self.sample_rows,
+            ci=self.ci,
+            dimensions=np.asarray(DIMENSIONS),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if tuple(data['dimensions']) != DIMENSIONS:
+                raise ValueError(f"{path} was written with dimensions {tuple(data['dimensions'])}")
+            table = cls(float(data['threshold']), str(data['run_timestamp']), capacity=max(len(data['total_rows']), 1))
+            table.table_names = data['table_names'].tolist()
+            table._table_index = {name: i for i, name in enumerate(table.table_names)}
+            table.column_names = data['column_names'].tolist()
+            table.data_types = data['data_types'].tolist()
+            n = len(data['total_rows'])
+            table._table_idx[:n] = data['table_idx']
+            table._total[:n] = data['total_rows']
+            table._valid[:n] = data['valid']
+            if 'scan' in data:
+                table._scan[:n] = data['scan']
+                table._sample_rows[:n] = data['sample_rows']
+                table._ci[:n] = data['ci']
+            else:  # written before sampling mode: all exact
+                table._scan[:n] = SCAN_FULL
+                table._sample_rows[:n] = 0
+                table._ci[:n] = np.nan
+            table._n = n
+        return table
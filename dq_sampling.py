@@ -0,0 +1,234 @@
+"""
+Sampling Mode for the Data Quality Checker
+Scores large tables on a uniform (or proportionally stratified) random sample and
+reports every dimension score with a Wilson confidence interval, corrected for
+sampling without replacement. A column is only passed or failed on the sample when
+its overall interval lies entirely on one side of the threshold; otherwise the
+caller escalates it to a full scan.
+
+Stratified samples use proportional allocation, so the pooled sample is
+self-weighting: the plain proportion is unbiased and the simple-random-sample
+interval is conservative.
+
+read_csv_sample draws the sample while streaming the CSV (pyarrow), so a large
+table is never materialized in pandas unless one of its columns is escalated.
+"""
+
+import io
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # sampled loading falls back to reading the whole CSV with pandas
+    pa = pa_csv = None
+
+# Bytes of CSV per streamed batch in read_csv_sample
+SAMPLE_BLOCK_SIZE = 16 << 20
+
+
+def sampling_config(config):
+    """`sampling` section of dq_config.yml with defaults filled in."""
+    cfg = {
+        'enabled': False,
+        'min_rows': 100_000,       # smaller tables are always scanned in full
+        'sample_size': 20_000,
+        'confidence': 0.95,
+        'stratify_by': {},         # {table: column}
+        'seed': 42,
+    }
+    cfg.update((config or {}).get('sampling') or {})
+    return cfg
+
+
+def z_score(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(valid, sample_rows, population_rows, z):
+    """
+    Wilson score interval (in percent) for valid / sample_rows, with the finite
+    population correction applied through the effective sample size.
+
+    Parameters:
+    -----------
+    valid : array-like of int
+        Valid rows in the sample (one entry per dimension)
+    sample_rows, population_rows : int
+        Sample size n and table size N
+    z : float
+        Normal quantile for the requested confidence
+
+    Returns:
+    --------
+    np.ndarray : (len(valid) x 2) [low, high] bounds in percent
+    """
+    valid = np.asarray(valid, dtype=np.float64)
+    n, N = float(sample_rows), float(population_rows)
+    fpc = (N - n) / (N - 1) if N > 1 else 0.0
+    if fpc <= 0:
+        exact = valid / n * 100
+        return np.stack([exact, exact], axis=-1)
+    n_eff = n / fpc
+    p = valid / n
+    denom = 1 + z * z / n_eff
+    centre = (p + z * z / (2 * n_eff)) / denom
+    half = z * np.sqrt(p * (1 - p) / n_eff + z * z / (4 * n_eff * n_eff)) / denom
+    low, high = np.clip(centre - half, 0, 1), np.clip(centre + half, 0, 1)
+    return np.round(np.stack([low, high], axis=-1) * 100, 2)
+
+
+def _allocate(stratum_sizes, sample_size):
+    """Proportional allocation; largest-remainder rounding keeps the total exactly at sample_size."""
+    quota = stratum_sizes * sample_size / stratum_sizes.sum()
+    alloc = np.floor(quota).astype(np.int64)
+    shortfall = sample_size - alloc.sum()
+    if shortfall > 0:
+        alloc[np.argsort(alloc - quota)[:shortfall]] += 1
+    return alloc
+
+
+def sample_positions(df, sample_size, stratify_by=None, seed=42):
+    """
+    Row positions of a uniform random sample, or of a proportionally allocated
+    stratified sample when `stratify_by` names a column of df (nulls form a stratum).
+    Positions are sorted so the sample keeps the table's row order.
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = len(df)
+    sample_size = min(sample_size, n_rows)
+    if not stratify_by or stratify_by not in df.columns:
+        return np.sort(rng.choice(n_rows, size=sample_size, replace=False))
+
+    codes, _ = pd.factorize(df[stratify_by], use_na_sentinel=False)
+    stratum_sizes = np.bincount(codes)
+    alloc = _allocate(stratum_sizes, sample_size)
+    order = np.argsort(codes, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(stratum_sizes)[:-1]])
+    picks = [order[start + rng.choice(size, size=take, replace=False)]
+             for start, size, take in zip(starts, stratum_sizes, alloc) if take > 0]
+    return np.sort(np.concatenate(picks)) if picks else np.array([], dtype=np.int64)
+
+
+class _Reservoir:
+    """Rows with the k smallest random keys offered so far: a uniform sample of k without replacement."""
+
+    def __init__(self, k):
+        self.k = k
+        self.cutoff = np.inf  # keys at or above it can no longer enter
+        self._keys, self._positions, self._rows = [], [], []
+        self._size = 0
+
+    def offer(self, keys, positions, rows):
+        self._keys.append(keys)
+        self._positions.append(positions)
+        self._rows.append(rows)
+        self._size += len(keys)
+        if self._size >= 2 * self.k:
+            self._compact(self.k)
+
+    def _compact(self, k):
+        keys = np.concatenate(self._keys) if self._keys else np.array([])
+        keep = np.argpartition(keys, k - 1)[:k] if len(keys) > k else np.arange(len(keys))
+        rows = pa.concat_tables(self._rows).take(keep) if self._rows else None
+        self._keys, self._positions = [keys[keep]], [np.concatenate(self._positions)[keep]]
+        self._rows = [rows] if rows is not None else []
+        self._size = len(keep)
+        if len(keep) == self.k:
+            self.cutoff = keys[keep].max()
+
+    def smallest(self, k):
+        """(row positions, pa.Table) of the k smallest keys."""
+        self._compact(min(k, self.k))
+        return self._positions[0], self._rows[0]
+
+
+def read_csv_sample(path, columns, sample_size, min_rows=0, stratify_by=None, seed=42):
+    """
+    Read `columns` of a CSV, keeping only a random sample of its rows when it is large.
+
+    The file is streamed in pyarrow batches with every value as raw text. Each row gets a
+    uniform random key and each stratum (every row, unless stratify_by names a column of
+    the file) keeps its sample_size smallest keys: a bottom-k reservoir, so memory stays
+    around the sample. At the end strata get proportionally allocated quotas as in
+    sample_positions. The kept rows, in file order, are parsed by pandas so dtypes match
+    a pd.read_csv of the table.
+
+    Parameters:
+    -----------
+    path : str or Path
+        CSV file
+    columns : list of str
+        Columns to load
+    sample_size : int
+        Rows to keep when the file has more than max(min_rows, sample_size) rows
+    stratify_by : str, optional
+        Column for proportional stratification (read even if not in `columns`)
+
+    Returns:
+    --------
+    tuple : (pd.DataFrame, total_rows) -- the whole table when total_rows <= max(min_rows, sample_size)
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    stratify_by = stratify_by if stratify_by in header else None
+    read = [c for c in header if c in columns or c == stratify_by]
+    reader = pa_csv.open_csv(
+        path, read_options=pa_csv.ReadOptions(block_size=SAMPLE_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(include_columns=read, column_types={c: pa.string() for c in read},
+                                              strings_can_be_null=False),
+    )
+    limit = max(min_rows, sample_size)
+    rng = np.random.default_rng(seed)
+    strata, reservoirs, sizes = {}, [], []
+    buffered, n_rows = [], 0
+    for batch in reader:
+        n = batch.num_rows
+        if n == 0:
+            continue
+        if n_rows + n <= limit:
+            buffered.append(batch)
+        else:
+            buffered = None
+        if stratify_by is None:
+            codes = np.zeros(n, dtype=np.int64)
+            if not reservoirs:
+                reservoirs.append(_Reservoir(sample_size))
+                sizes.append(0)
+        else:
+            batch_codes, uniques = pd.factorize(batch.column(stratify_by).to_numpy(zero_copy_only=False))
+            for value in uniques:
+                if value not in strata:
+                    strata[value] = len(reservoirs)
+                    reservoirs.append(_Reservoir(sample_size))
+                    sizes.append(0)
+            codes = np.array([strata[value] for value in uniques], dtype=np.int64)[batch_codes]
+        counts = np.bincount(codes, minlength=len(reservoirs))
+        for code in np.flatnonzero(counts):
+            sizes[code] += int(counts[code])
+        keys = rng.random(n)
+        cutoffs = np.array([reservoir.cutoff for reservoir in reservoirs])
+        candidates = np.flatnonzero(keys < cutoffs[codes])
+        if len(candidates):
+            # one take per batch, grouped by stratum; each reservoir gets a zero-copy slice
+            candidates = candidates[np.argsort(codes[candidates], kind='stable')]
+            rows = pa.Table.from_batches([batch.take(pa.array(candidates))])
+            present, starts, lengths = np.unique(codes[candidates], return_index=True, return_counts=True)
+            for code, start, length in zip(present, starts, lengths):
+                picked = candidates[start:start + length]
+                reservoirs[code].offer(keys[picked], n_rows + picked, rows.slice(start, length))
+        n_rows += n
+
+    if buffered is not None:
+        table = pa.Table.from_batches(buffered, schema=reader.schema)
+    else:
+        alloc = _allocate(np.asarray(sizes), sample_size)
+        picks = [reservoir.smallest(take) for reservoir, take in zip(reservoirs, alloc) if take > 0]
+        positions = np.concatenate([p for p, _ in picks])
+        table = pa.concat_tables([rows for _, rows in picks]).take(pa.array(np.argsort(positions)))
+    table = table.select([c for c in read if c in columns])
+    sink = pa.BufferOutputStream()
+    pa_csv.write_csv(table, sink)
+    return pd.read_csv(io.BytesIO(sink.getvalue().to_pybytes())), n_rows
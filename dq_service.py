@@ -0,0 +1,284 @@
+"""
+Long-running Data Quality Service
+Accepts DQ check jobs over a small local HTTP API, queues them by priority and runs
+them on a fixed pool of worker threads inside one process. Each job reuses
+DataQualityChecker: results stream to the job's sinks and progress list as each
+column completes, and every finished job is appended to the shared score history
+(dq_history.sqlite). pandas, the config parser and the column stats cache are
+loaded once for the lifetime of the service instead of once per feed.
+
+API (JSON):
+    POST /jobs                {"path": <csv file or dir>, "config": ..., "priority": 0,
+                               "result_formats": [...], "sampling": {...}}  -> 202 job
+    GET  /jobs                all jobs (status, timings, progress)
+    GET  /jobs/<id>           one job, incl. summary once finished
+    GET  /jobs/<id>/results   column results streamed so far
+    GET  /health              queue depth and worker count
+
+Usage:
+    python dq_service.py --port 8765 --workers 2
+"""
+
+import argparse
+import itertools
+import json
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from column_stats import StatsCache
+from dq_history import HISTORY_FILE
+from dq_sinks import NumpyEncoder
+from run_dq_check import DataQualityChecker
+
+SERVICE_DIR = Path("Great_Expectation/service")
+DEFAULT_CONFIG = "great_expectation/config/dq_config.yml"
+STAGES = ('queued', 'load', 'check', 'save')
+_STOP = object()
+
+
+class QueueFull(Exception):
+    """More jobs are waiting than the service accepts."""
+
+
+class Job:
+    """One submitted check: its inputs, lifecycle, per-stage timings and streamed results."""
+
+    def __init__(self, job_id, path, config, priority=0, result_formats=None, sampling=None):
+        self.job_id = job_id
+        self.path = str(path)
+        self.config = str(config)
+        self.priority = int(priority)
+        self.result_formats = result_formats
+        self.sampling = sampling
+        self.status = 'queued'
+        self.submitted_at = datetime.now().isoformat()
+        self.timings = {}
+        self.columns = []
+        self.summary = None
+        self.error = None
+        self._clock = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def stage_done(self, stage):
+        now = time.perf_counter()
+        self.timings[stage] = round(now - self._clock, 3)
+        self._clock = now
+
+    def add_column(self, result):
+        with self._lock:
+            self.columns.append(result)
+
+    def to_dict(self, results=False):
+        with self._lock:
+            info = {
+                'job_id': self.job_id,
+                'status': self.status,
+                'path': self.path,
+                'config': self.config,
+                'priority': self.priority,
+                'submitted_at': self.submitted_at,
+                'timings': dict(self.timings),
+                'columns_done': len(self.columns),
+                'error': self.error,
+            }
+            if self.summary is not None:
+                info['summary'] = self.summary
+            if results:
+                info['results'] = list(self.columns)
+        return info
+
+
+class DQService:
+    """Priority job queue plus worker pool around DataQualityChecker."""
+
+    def __init__(self, root=SERVICE_DIR, workers=2, max_queued=100, default_config=DEFAULT_CONFIG):
+        self.root = Path(root)
+        self.workers = int(workers)
+        self.max_queued = int(max_queued)
+        self.default_config = default_config
+        self.history_path = self.root / HISTORY_FILE
+        # Shared by every job so unchanged columns are never re-sorted
+        self.stats_cache = StatsCache(self.root / "column_stats.json")
+        self.jobs = {}
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._threads = []
+
+    # --- lifecycle -----------------------------------------------------------
+    def start(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"dq-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, wait=True):
+        """Let queued jobs finish, then stop the workers."""
+        for _ in self._threads:
+            self._queue.put((float('inf'), next(self._seq), _STOP))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    # --- jobs ------------------------------------------------------------------
+    def submit(self, path, config=None, priority=0, result_formats=None, sampling=None):
+        """
+        Queue a check of a CSV file or a directory of CSVs.
+
+        Parameters:
+        -----------
+        priority : int
+            Higher runs first; equal priorities run in submission order
+
+        Returns:
+        --------
+        Job : the queued job
+        """
+        config = config or self.default_config
+        if not os.path.exists(path):
+            raise ValueError(f"Data path not found: {path}")
+        if not os.path.exists(config):
+            raise ValueError(f"Config not found: {config}")
+        with self._lock:
+            waiting = sum(job.status == 'queued' for job in self.jobs.values())
+            if waiting >= self.max_queued:
+                raise QueueFull(f"{waiting} jobs already queued (max {self.max_queued})")
+            seq = next(self._seq)
+            job = Job(f"{seq:06d}", path, config, priority, result_formats, sampling)
+            self.jobs[job.job_id] = job
+        self._queue.put((-job.priority, seq, job))
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def health(self):
+        statuses = [job.status for job in list(self.jobs.values())]
+        return {
+            'workers': self.workers,
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running'),
+            'finished': statuses.count('succeeded') + statuses.count('failed'),
+        }
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self.run_job(job)
+            finally:
+                self._queue.task_done()
+
+    def run_job(self, job):
+        """Load -> check -> save for one job; stage timings and failures are recorded on the job."""
+        job.status = 'running'
+        job.stage_done('queued')
+        try:
+            if os.path.isdir(job.path):
+                data_dir, files = job.path, None
+            else:
+                data_dir, files = os.path.dirname(job.path) or '.', [os.path.basename(job.path)]
+            checker = DataQualityChecker(config_path=job.config, data_dir=data_dir,
+                                         output_dir=str(self.root / "jobs" / job.job_id),
+                                         result_formats=job.result_formats, sampling=job.sampling,
+                                         stats_cache_path=None, history_path=str(self.history_path),
+                                         drift_report_path=None)
+            # Only the stats cache and the score history are shared between jobs; consistency key
+            # indexes (incl. the geolocation zips) come from this job's loaded tables, and the
+            # profiler's drift report is left out since it describes a different load
+            checker.stats_cache = self.stats_cache
+            checker.on_column = job.add_column
+
+            tables = checker.load_all_tables(files)
+            job.stage_done('load')
+            if not tables:
+                raise ValueError(f"No checkable CSV data in {job.path}")
+            checker.check_loaded_tables(tables)
+            job.stage_done('check')
+            checker.save_results()  # also persists the shared stats cache
+            job.stage_done('save')
+            job.summary = json.loads(json.dumps(checker.summary, cls=NumpyEncoder))
+            job.status = 'succeeded'
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = 'failed'
+        return job
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None  # set by make_server
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, cls=NumpyEncoder).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            return self._send(200, self.service.health())
+        if self.path == "/jobs":
+            return self._send(200, [job.to_dict() for job in list(self.service.jobs.values())])
+        match = re.fullmatch(r"/jobs/([\w-]+)(/results)?", self.path)
+        job = self.service.get(match.group(1)) if match else None
+        if job is None:
+            return self._send(404, {'error': f"Not found: {self.path}"})
+        return self._send(200, job.to_dict(results=bool(match.group(2))))
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            return self._send(404, {'error': f"Not found: {self.path}"})
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            job = self.service.submit(payload["path"], payload.get("config"), payload.get("priority", 0),
+                                      payload.get("result_formats"), payload.get("sampling"))
+        except QueueFull as e:
+            return self._send(429, {'error': str(e)})
+        except (KeyError, ValueError, TypeError) as e:
+            return self._send(400, {'error': f"Invalid job: {e}"})
+        return self._send(202, job.to_dict())
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def make_server(service, host="127.0.0.1", port=8765):
+    handler = type("DQServiceHandler", (_Handler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run data quality checks as a local job service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="Jobs run concurrently")
+    parser.add_argument("--max-queued", type=int, default=100, help="Queued jobs before submissions get 429")
+    parser.add_argument("--root", default=str(SERVICE_DIR), help="Job outputs, history and stats cache")
+    args = parser.parse_args()
+
+    service = DQService(args.root, args.workers, args.max_queued).start()
+    server = make_server(service, args.host, args.port)
+    print("=" * 80)
+    print(f"🚀 DQ service on http://{args.host}:{args.port}/ ({args.workers} workers)")
+    print(f"   POST /jobs {{\"path\": \"data/kaggle-raw/olist_orders_dataset.csv\", \"priority\": 1}}")
+    print("=" * 80)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping: finishing queued jobs...")
+    finally:
+        server.server_close()
+        service.stop()
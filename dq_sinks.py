@@ -0,0 +1,174 @@
+"""
+Streaming Result Sinks for the Data Quality Checker
+Each column result is written as soon as it is produced (newline-delimited JSON,
+appended CSV rows, optional Parquet row groups). Sinks receive the nested record
+exported from dq_results.ResultTable, so run_dq_check never builds the full list
+of result dicts.
+"""
+
+import csv
+import json
+from pathlib import Path
+
+import numpy as np
+
+from dq_results import CSV_COLUMNS, DIMENSIONS, OVERALL_NOTE
+
+
+class NumpyEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, (np.integer, np.int64)):
+            return int(obj)
+        if isinstance(obj, (np.floating, np.float64)):
+            return float(obj)
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.bool_):
+            return bool(obj)
+        return super().default(obj)
+
+
+def flat_row(result, threshold):
+    """One dq_results_summary.csv row for a column result."""
+    row = {
+        "Table": result["table_name"],
+        "Column": result["column_name"],
+        "Data Type": result["data_type"],
+        "Total Rows": result["total_rows"],
+        "Overall Score": result["overall_score"],
+        "Status": "PASS" if result["overall_passed"] else "FAIL",
+    }
+    for dim in DIMENSIONS:
+        row[f"{dim.capitalize()} Score"] = result[dim]["score"]
+    row["Scan"] = result["scan"]
+    row["Overall CI Low"], row["Overall CI High"] = result.get("overall_ci") or (None, None)
+    row["Threshold"] = threshold
+    row["Note"] = OVERALL_NOTE
+    return row
+
+
+class JsonLinesSink:
+    """dq_results_detailed.jsonl: one compact JSON document per column result."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "w")
+        self.count = 0
+
+    def write(self, result):
+        self._f.write(json.dumps(result, cls=NumpyEncoder) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+
+
+class CsvSink:
+    """dq_results_summary.csv: header once, then one row appended per column result."""
+
+    def __init__(self, path, threshold):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._f = open(self.path, "w", newline="")
+        self._writer = csv.DictWriter(self._f, fieldnames=CSV_COLUMNS)
+        self._writer.writeheader()
+        self.count = 0
+
+    def write(self, result):
+        self._writer.writerow(flat_row(result, self.threshold))
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+
+
+class ParquetSink:
+    """
+    dq_results_detailed.parquet: flattened results written in row groups of
+    `row_group_size`, so only one group is buffered at a time. Needs pyarrow.
+    """
+
+    def __init__(self, path, threshold, row_group_size=1000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.row_group_size = row_group_size
+        fields = [
+            ("table_name", pa.string()), ("column_name", pa.string()), ("data_type", pa.string()),
+            ("total_rows", pa.int64()), ("overall_score", pa.float64()), ("overall_passed", pa.bool_()),
+        ]
+        for dim in DIMENSIONS:
+            fields += [(f"{dim}_score", pa.float64()), (f"{dim}_valid", pa.int64()), (f"{dim}_invalid", pa.int64())]
+        fields += [("scan", pa.string()), ("sample_rows", pa.int64()),
+                   ("overall_ci_low", pa.float64()), ("overall_ci_high", pa.float64()), ("timestamp", pa.string())]
+        self.schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self._buffer = {name: [] for name in self.schema.names}
+        self.count = 0
+
+    def write(self, result):
+        buf = self._buffer
+        for key in ("table_name", "column_name", "data_type", "total_rows",
+                    "overall_score", "overall_passed", "scan", "timestamp"):
+            buf[key].append(result[key])
+        buf["sample_rows"].append(result.get("sample_rows"))
+        low, high = result.get("overall_ci") or (None, None)
+        buf["overall_ci_low"].append(low)
+        buf["overall_ci_high"].append(high)
+        for dim in DIMENSIONS:
+            buf[f"{dim}_score"].append(result[dim]["score"])
+            buf[f"{dim}_valid"].append(result[dim]["valid_records"])
+            buf[f"{dim}_invalid"].append(result[dim]["invalid_records"])
+        self.count += 1
+        if len(buf["table_name"]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer["table_name"]:
+            return
+        self._writer.write_table(self._pa.Table.from_pydict(self._buffer, schema=self.schema))
+        self._buffer = {name: [] for name in self.schema.names}
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def open_sinks(output_dir, threshold, formats=("jsonl", "csv")):
+    """
+    Open one sink per requested format under output_dir.
+
+    Parameters:
+    -----------
+    output_dir : str or Path
+        Directory for the result files
+    threshold : float
+        Pass threshold, repeated in the CSV / used for Parquet flags
+    formats : iterable of str
+        Any of 'jsonl', 'csv', 'parquet'
+
+    Returns:
+    --------
+    list : Open sink objects (each has write(result), close() and count)
+    """
+    output_dir = Path(output_dir)
+    factories = {
+        "jsonl": lambda: JsonLinesSink(output_dir / "dq_results_detailed.jsonl"),
+        "csv": lambda: CsvSink(output_dir / "dq_results_summary.csv", threshold),
+        "parquet": lambda: ParquetSink(output_dir / "dq_results_detailed.parquet", threshold),
+    }
+    unknown = set(formats) - set(factories)
+    if unknown:
+        raise ValueError(f"Unknown result format(s): {sorted(unknown)}; expected {sorted(factories)}")
+    return [factories[fmt]() for fmt in formats]
+
+
+def read_jsonl(path):
+    """Load the detailed results back (one dict per line)."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
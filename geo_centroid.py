@@ -0,0 +1,141 @@
+"""
+Zip Prefix Centroids for the Geolocation Dataset
+Local (pandas/NumPy) equivalent of the dbt model util_geo_zip_centroid: one row per
+zip code prefix with the most frequent city/state and the centroid of its distinct
+coordinates. The DQ checker builds it once per run from the loaded geolocation table
+for its location consistency rules (dq_consistency.py), instead of re-deriving the
+city / state of every zip row by row.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+GEOLOCATION_CSV = "olist_geolocation_dataset.csv"
+
+_GEO_COLUMNS = {
+    'geolocation_zip_code_prefix': 'zip',
+    'geolocation_city': 'city',
+    'geolocation_state': 'state',
+    'geolocation_lat': 'lat',
+    'geolocation_lng': 'lng',
+}
+# Columns build_zip_lookup reads, i.e. what a caller must keep loaded to pass geo_df
+GEO_COLUMNS = list(_GEO_COLUMNS)
+
+
+class ZipCentroidLookup:
+    """
+    Sorted zip array plus aligned city/state/latitude/longitude arrays.
+    Lookups are a vectorized binary search (np.searchsorted).
+    """
+
+    def __init__(self, zips, city, state, latitude, longitude):
+        self.zips = np.asarray(zips, dtype=np.int64)
+        self.city = np.asarray(city)
+        self.state = np.asarray(state)
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.zips)
+
+    def positions(self, zip_codes):
+        """Index of each zip code in the lookup arrays, -1 where the zip is unknown."""
+        keys = pd.to_numeric(pd.Series(zip_codes), errors='coerce').to_numpy(dtype=np.float64)
+        if len(self.zips) == 0:
+            return np.full(len(keys), -1)
+        known = ~np.isnan(keys)
+        keys = np.where(known, keys, -1).astype(np.int64)
+        pos = np.minimum(np.searchsorted(self.zips, keys), len(self.zips) - 1)
+        return np.where(known & (self.zips[pos] == keys), pos, -1)
+
+    def contains(self, zip_codes):
+        """Boolean mask: which zip codes have a centroid."""
+        return self.positions(zip_codes) >= 0
+
+    def lookup(self, zip_codes):
+        """
+        Resolve zip codes to (city, state, latitude, longitude).
+
+        Returns:
+        --------
+        pd.DataFrame : One row per input zip code; unknown zips get nulls
+        """
+        pos = self.positions(zip_codes)
+        found = pos >= 0
+        result = {'zip_prefix': pd.Series(zip_codes).to_numpy()}
+        for name in ('city', 'state', 'latitude', 'longitude'):
+            values = getattr(self, name)
+            column = np.full(len(pos), np.nan if values.dtype.kind == 'f' else None,
+                             dtype=np.float64 if values.dtype.kind == 'f' else object)
+            column[found] = values[pos[found]]
+            result[name] = column
+        return pd.DataFrame(result)
+
+    def to_frame(self):
+        """Same shape as the util_geo_zip_centroid mart (zip_prefix as 5-digit string)."""
+        return pd.DataFrame({
+            'zip_prefix': pd.Series(self.zips).astype(str).str.zfill(5),
+            'city': self.city,
+            'state': self.state,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+        })
+
+
+def build_zip_lookup(geo_df):
+    """
+    Build the zip -> (city, state, lat, lng) lookup from a raw geolocation frame.
+
+    A single groupby over the raw rows collapses them into (zip, city, state, lat, lng)
+    combinations with counts; the modes and centroid are then taken from that much
+    smaller frame. Semantics follow util_geo_zip_centroid.sql:
+      - city / state are lower-cased (as in stg_geolocation)
+      - most frequent city and state per zip, ties broken alphabetically
+      - latitude / longitude are the mean over the zip's DISTINCT coordinates
+
+    Parameters:
+    -----------
+    geo_df : pd.DataFrame
+        olist_geolocation_dataset with its original column names
+
+    Returns:
+    --------
+    ZipCentroidLookup
+    """
+    geo = geo_df[list(_GEO_COLUMNS)].rename(columns=_GEO_COLUMNS)
+    geo = geo.assign(
+        zip=pd.to_numeric(geo['zip'], errors='coerce'),
+        city=geo['city'].str.lower(),
+        state=geo['state'].str.lower(),
+    ).dropna(subset=['zip'])
+
+    combos = geo.groupby(['zip', 'city', 'state', 'lat', 'lng'], sort=False, dropna=False).size()
+    combos = combos.rename('n').reset_index()
+
+    def _mode(column):
+        counts = combos.groupby(['zip', column], sort=False, dropna=True)['n'].sum().reset_index()
+        counts = counts.sort_values(['zip', 'n', column], ascending=[True, False, True], kind='mergesort')
+        return counts.drop_duplicates('zip').set_index('zip')[column]
+
+    points = combos.drop_duplicates(['zip', 'lat', 'lng'])
+    centroid = points.groupby('zip', sort=True)[['lat', 'lng']].mean()
+
+    result = centroid.join(_mode('city')).join(_mode('state'))
+    return ZipCentroidLookup(
+        zips=result.index.to_numpy(dtype=np.int64),
+        city=result['city'].fillna('').to_numpy(dtype=str),
+        state=result['state'].fillna('').to_numpy(dtype=str),
+        latitude=result['lat'].to_numpy(),
+        longitude=result['lng'].to_numpy(),
+    )
+
+
+def load_zip_lookup(data_dir="data/kaggle-raw"):
+    """Zip centroids of data_dir's geolocation CSV (only the needed columns are read); None if absent."""
+    csv_path = Path(data_dir) / GEOLOCATION_CSV
+    if not csv_path.exists():
+        return None
+    return build_zip_lookup(pd.read_csv(csv_path, usecols=list(_GEO_COLUMNS)))
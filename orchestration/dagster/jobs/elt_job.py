@@ -1,13 +1,121 @@
+import json
 import os
 import subprocess
-from dagster import job, op, In, Out, Nothing
+import time
+from dagster import job, op, Field, In, Out, Output, Nothing
 from resources import MELTANO_PROJECT_DIR
+import parquet_load
+import source_fingerprints
 
+# Local Parquet staging area and rows/sec history for both load paths
+PARQUET_STAGING_DIR = MELTANO_PROJECT_DIR / "output" / "parquet"
+LOAD_THROUGHPUT_LOG = MELTANO_PROJECT_DIR / "output" / "load_throughput.jsonl"
+# Source CSV fingerprints as of the last successful run
+FINGERPRINT_STATE = MELTANO_PROJECT_DIR / "output" / "source_fingerprints.json"
+DBT_SOURCE_NAME = "brazilian_ecommerce"
+
+
+@op(
+    out={
+        "changes": Out(dict, is_required=False),
+        "no_changes": Out(dict, is_required=False),
+    },
+    config_schema={
+        "force": Field(bool, default_value=False, description="Load every entity even if unchanged."),
+    },
+)
+def check_source_fingerprints(context):
+    # Pre-flight: fingerprint each tap-csv source and only continue with entities that changed
+    files = parquet_load.load_tap_csv_files(MELTANO_PROJECT_DIR)
+    result = source_fingerprints.fingerprint_sources(files, source_fingerprints.load_state(FINGERPRINT_STATE))
+    if context.op_config["force"]:
+        result["changed"] = sorted(result["fingerprints"])
+        result["unchanged"] = []
+    for entity in result["missing"]:
+        context.log.warning(f"Source file for '{entity}' not found; skipping it")
+    context.log.info(f"Changed: {result['changed'] or 'none'} | unchanged: {result['unchanged'] or 'none'}")
+
+    if result["changed"]:
+        result["all_entities"] = [f["entity"] for f in files]
+        yield Output(result, "changes")
+    else:
+        yield Output(result, "no_changes")
+
+
+@op
+def record_noop(context, no_changes: dict):
+    # Nothing changed since the last successful run: extract/load and dbt are skipped
+    context.instance.add_run_tags(context.run_id, {"elt/outcome": "no-op"})
+    context.log.info(
+        f"No-op run: {len(no_changes['unchanged'])} source files unchanged since the last successful load"
+    )
+
+
+@op(ins={"start": In(Nothing), "changes": In(dict)})
+def save_source_fingerprints(context, changes: dict):
+    # Only persisted after load + dbt build succeeded, so a failed run is retried next night
+    source_fingerprints.save_state(FINGERPRINT_STATE, changes["fingerprints"])
+    context.instance.add_run_tags(context.run_id, {"elt/outcome": "loaded"})
+    context.log.info(f"Saved fingerprints for {len(changes['fingerprints'])} sources to {FINGERPRINT_STATE}")
+
+
+def _log_throughput(context, record):
+    previous = parquet_load.append_throughput(LOAD_THROUGHPUT_LOG, record)
+    context.log.info(
+        f"{record['load_path']} load: {record['rows']:,} rows in {record['seconds']}s "
+        f"({record['rows_per_second']:,} rows/s)"
+    )
+    if previous and previous.get("rows_per_second") and record["rows_per_second"]:
+        context.log.info(
+            f"vs last {previous['load_path']} load ({previous['recorded_at']}): "
+            f"{previous['rows_per_second']:,} rows/s -> "
+            f"{record['rows_per_second'] / previous['rows_per_second']:.1f}x"
+        )
+
+
+def _parquet_extract_load(context, files):
+    # CSV -> compressed Parquet (typed from catalog.json) -> one BigQuery load job per entity
+    schemas = parquet_load.load_catalog_schemas(MELTANO_PROJECT_DIR / "catalog.json")
+    bq = parquet_load.load_target_bigquery_config(MELTANO_PROJECT_DIR)
+    target = parquet_load.BigQueryTarget(
+        bq["project"], bq["dataset"], bq.get("location", "US"), bq.get("credentials_path")
+    )
+    context.log.info(f"Loading {len(files)} entities via Parquet staging in {PARQUET_STAGING_DIR}")
+    record = parquet_load.run_parquet_load(files, schemas, target, PARQUET_STAGING_DIR, log=context.log.info)
+    _log_throughput(context, record)
+
+
+@op(
+    required_resource_keys={"meltano"},
+    ins={"changes": In(dict)},
+    out=Out(Nothing),
+    config_schema={
+        "load_path": Field(
+            str,
+            default_value="singer",
+            description="'singer' (meltano run tap-csv target-bigquery) or 'parquet' "
+                        "(local Parquet staging, one BigQuery load job per entity).",
+        ),
+    },
+)
+def extract_load(context, changes: dict):
+    # Only entities whose source CSV changed since the last successful run
+    files = [f for f in parquet_load.load_tap_csv_files(MELTANO_PROJECT_DIR) if f["entity"] in changes["changed"]]
+    load_path = context.op_config["load_path"]
+    if load_path == "parquet":
+        _parquet_extract_load(context, files)
+        return
+    if load_path != "singer":
+        raise ValueError(f"Unknown load_path '{load_path}', expected 'singer' or 'parquet'")
 
-@op(required_resource_keys={"meltano"}, out=Out(Nothing))
-def extract_load(context):
     # Clear Meltano cache to avoid stale configuration issues
     env = os.environ.copy()
+    if len(files) < len(changes["all_entities"]):
+        # Meltano reads plugin settings from env: restrict tap-csv to the changed files
+        env["TAP_CSV_FILES"] = json.dumps([
+            {"entity": f["entity"], "path": str(f["path"]), "keys": f["keys"], "encoding": f["encoding"]}
+            for f in files
+        ])
     meltano_dir = MELTANO_PROJECT_DIR / ".meltano"
     if meltano_dir.exists():
         context.log.info(f"Clearing Meltano cache at {meltano_dir}")
@@ -35,6 +143,7 @@ def extract_load(context):
 
     # Run Meltano EL: tap-csv -> BigQuery via CLI to ensure clear success/failure
     context.log.info(f"Running Meltano EL in {MELTANO_PROJECT_DIR}")
+    started = time.perf_counter()
     completed = subprocess.run(
         ["meltano", "run", "tap-csv", "target-bigquery"],
         cwd=str(MELTANO_PROJECT_DIR),
@@ -48,15 +157,48 @@ def extract_load(context):
         context.log.error(completed.stderr)
         raise RuntimeError(f"Meltano run failed with exit code {completed.returncode}")
 
+    _log_throughput(context, parquet_load.throughput_record(
+        "singer", parquet_load.count_csv_rows(files), time.perf_counter() - started, target="bigquery"
+    ))
+
 
-@op(required_resource_keys={"dbt"}, ins={"start": In(Nothing)})
-def transform_and_test(context):  # start is implicit; only used to enforce order
+@op(
+    required_resource_keys={"dbt"},
+    ins={"start": In(Nothing), "changes": In(dict)},
+    config_schema={
+        "full_refresh": Field(
+            bool,
+            default_value=False,
+            description="Rebuild incremental fact models from scratch (dbt --full-refresh).",
+        ),
+        "incremental_lookback_days": Field(
+            int,
+            default_value=3,
+            description="Days of order activity re-merged into incremental facts to catch late updates.",
+        ),
+    },
+)
+def transform_and_test(context, changes: dict):  # start is implicit; only used to enforce order
     # dbt build = run + test (serves as transform and DQ checks)
-    context.resources.dbt.cli(["build"], context=context).wait()
+    # Fact models are incremental: nightly runs only merge new/updated orders
+    # unless a full refresh is requested in the run config.
+    args = ["build"]
+    if context.op_config["full_refresh"]:
+        context.log.info("Full refresh requested: rebuilding incremental models from scratch")
+        args.append("--full-refresh")
+    elif len(changes["changed"]) < len(changes["all_entities"]):
+        # Only models downstream of the reloaded sources
+        args += ["--select"] + [f"source:{DBT_SOURCE_NAME}.{entity}+" for entity in changes["changed"]]
+    dbt_vars = {"incremental_lookback_days": context.op_config["incremental_lookback_days"]}
+    args += ["--vars", json.dumps(dbt_vars)]
+    context.resources.dbt.cli(args, context=context).wait()
 
 
 @job
 def elt_job():
-    transform_and_test(start=extract_load())
+    changes, no_changes = check_source_fingerprints()
+    record_noop(no_changes)
+    transformed = transform_and_test(start=extract_load(changes), changes=changes)
+    save_source_fingerprints(start=transformed, changes=changes)
 
 
@@ -0,0 +1,265 @@
+"""
+Bulk Parquet load path for the raw CSV entities.
+
+Alternative to `meltano run tap-csv target-bigquery`: each CSV configured for
+tap-csv in meltano.yml is converted locally to a compressed Parquet file, typed
+from the tap's catalog.json, and submitted as ONE load job per entity. Records
+never go through Singer JSON serialization.
+
+Targets are pluggable so the path can be exercised locally:
+    python parquet_load.py --meltano-dir ../../meltano-csv --duckdb /tmp/raw.duckdb
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import yaml
+
+# JSON-schema (Singer catalog) -> Arrow. tap-csv declares every column as a
+# nullable string; staging models SAFE_CAST from there, so we keep that contract.
+_JSON_SCHEMA_TYPES = {
+    "string": pa.string(),
+    "integer": pa.int64(),
+    "number": pa.float64(),
+    "boolean": pa.bool_(),
+}
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def load_tap_csv_files(meltano_dir: Path) -> list[dict]:
+    """Entity configs (entity, absolute path, keys, encoding) from the tap-csv block of meltano.yml."""
+    meltano_dir = Path(meltano_dir)
+    with open(meltano_dir / "meltano.yml") as f:
+        project = yaml.safe_load(f)
+    extractor = next(e for e in project["plugins"]["extractors"] if e["name"] == "tap-csv")
+    files = []
+    for file_cfg in extractor["config"]["files"]:
+        files.append({
+            "entity": file_cfg["entity"],
+            "path": (meltano_dir / file_cfg["path"]).resolve(),
+            "keys": file_cfg.get("keys", []),
+            "encoding": file_cfg.get("encoding", "utf-8"),
+        })
+    return files
+
+
+def load_target_bigquery_config(meltano_dir: Path) -> dict:
+    """project / dataset / location / credentials_path of the target-bigquery loader."""
+    with open(Path(meltano_dir) / "meltano.yml") as f:
+        project = yaml.safe_load(f)
+    loader = next(l for l in project["plugins"]["loaders"] if l["name"] == "target-bigquery")
+    return loader["config"]
+
+
+def load_catalog_schemas(catalog_path: Path) -> dict[str, pa.Schema]:
+    """Arrow schema per stream from a Singer catalog.json."""
+    with open(catalog_path) as f:
+        catalog = json.load(f)
+    schemas = {}
+    for stream in catalog.get("streams", []):
+        fields = []
+        for name, prop in stream["schema"]["properties"].items():
+            types = [t for t in prop.get("type", ["string"]) if t != "null"] or ["string"]
+            if types[0] == "string" and prop.get("format") == "date-time":
+                arrow_type = pa.timestamp("us")
+            else:
+                arrow_type = _JSON_SCHEMA_TYPES.get(types[0], pa.string())
+            # catalog was discovered before utf-8-sig decoding; drop any BOM
+            fields.append(pa.field(name.lstrip("\ufeff"), arrow_type, nullable=True))
+        schemas[stream["tap_stream_id"]] = pa.schema(fields)
+    return schemas
+
+
+def csv_to_parquet(file_cfg: dict, schema: pa.Schema | None, staging_dir: Path,
+                   compression: str = PARQUET_COMPRESSION) -> tuple[Path, int]:
+    """
+    Stream one CSV into a compressed Parquet file (batch by batch, constant memory).
+
+    Columns missing from the catalog schema are read as strings, like tap-csv does.
+    Empty fields stay empty strings, matching what the Singer path loads.
+    """
+    staging_dir = Path(staging_dir)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    out_path = staging_dir / f"{file_cfg['entity']}.parquet"
+
+    with open(file_cfg["path"], encoding=file_cfg["encoding"]) as f:
+        header = next(csv.reader(f))
+    column_types = {name: (schema.field(name).type if schema is not None and name in schema.names else pa.string())
+                    for name in header}
+
+    reader = pacsv.open_csv(
+        file_cfg["path"],
+        read_options=pacsv.ReadOptions(encoding=file_cfg["encoding"], use_threads=True),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=False),
+    )
+    rows = 0
+    with pq.ParquetWriter(out_path, reader.schema, compression=compression) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return out_path, rows
+
+
+class DuckDBTarget:
+    """Local stand-in for BigQuery: one CREATE OR REPLACE per entity."""
+
+    name = "duckdb"
+
+    def __init__(self, database: str = ":memory:", schema: str = "brazilian_ecommerce"):
+        import duckdb
+        self.con = duckdb.connect(database)
+        self.schema = schema
+        self.con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+
+    def load(self, entity: str, parquet_path: Path) -> int:
+        self.con.execute(
+            f'CREATE OR REPLACE TABLE {self.schema}."{entity}" AS SELECT * FROM read_parquet(?)',
+            [str(parquet_path)],
+        )
+        return self.con.execute(f'SELECT COUNT(*) FROM {self.schema}."{entity}"').fetchone()[0]
+
+
+class BigQueryTarget:
+    """One BigQuery Parquet load job per entity, replacing the table (tap-csv is FULL_TABLE)."""
+
+    name = "bigquery"
+
+    def __init__(self, project: str, dataset: str, location: str = "US", credentials_path: str | None = None):
+        from google.cloud import bigquery
+        self.bigquery = bigquery
+        if credentials_path and Path(credentials_path).exists():
+            self.client = bigquery.Client.from_service_account_json(credentials_path, project=project)
+        else:
+            self.client = bigquery.Client(project=project)
+        self.table_prefix = f"{project}.{dataset}"
+        self.location = location
+
+    def load(self, entity: str, parquet_path: Path) -> int:
+        job_config = self.bigquery.LoadJobConfig(
+            source_format=self.bigquery.SourceFormat.PARQUET,
+            write_disposition=self.bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
+        with open(parquet_path, "rb") as f:
+            job = self.client.load_table_from_file(
+                f, f"{self.table_prefix}.{entity}", job_config=job_config, location=self.location
+            )
+        job.result()
+        return job.output_rows
+
+
+def run_parquet_load(files: list[dict], schemas: dict[str, pa.Schema], target, staging_dir: Path,
+                     log=print) -> dict:
+    """
+    Convert and load every entity; returns per-entity and total throughput.
+    """
+    entities = []
+    started = time.perf_counter()
+    for file_cfg in files:
+        entity_start = time.perf_counter()
+        parquet_path, rows = csv_to_parquet(file_cfg, schemas.get(file_cfg["entity"]), staging_dir)
+        converted = time.perf_counter()
+        loaded_rows = target.load(file_cfg["entity"], parquet_path)
+        finished = time.perf_counter()
+        stats = {
+            "entity": file_cfg["entity"],
+            "rows": rows,
+            "loaded_rows": loaded_rows,
+            "parquet_bytes": parquet_path.stat().st_size,
+            "convert_seconds": round(converted - entity_start, 3),
+            "load_seconds": round(finished - converted, 3),
+            "rows_per_second": round(rows / (finished - entity_start), 1) if finished > entity_start else None,
+        }
+        entities.append(stats)
+        log(f"{stats['entity']}: {rows:,} rows -> {stats['parquet_bytes'] / 1024**2:.1f} MB parquet, "
+            f"{stats['rows_per_second']:,} rows/s")
+    return throughput_record("parquet", sum(e["rows"] for e in entities), time.perf_counter() - started,
+                             target=target.name, entities=entities)
+
+
+def count_csv_rows(files: list[dict]) -> int:
+    """Data rows across the configured CSVs (quoted newlines handled)."""
+    total = 0
+    for file_cfg in files:
+        with open(file_cfg["path"], encoding=file_cfg["encoding"], newline="") as f:
+            total += max(sum(1 for _ in csv.reader(f)) - 1, 0)
+    return total
+
+
+def throughput_record(load_path: str, rows: int, seconds: float, **extra) -> dict:
+    return {
+        "load_path": load_path,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        **extra,
+    }
+
+
+def append_throughput(log_path: Path, record: dict) -> dict | None:
+    """
+    Append a run to the throughput log and return the most recent run of the
+    OTHER load path, so callers can report parquet vs singer rows/sec.
+    """
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    previous = None
+    if log_path.exists():
+        with open(log_path) as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["load_path"] != record["load_path"]:
+                    previous = entry
+    with open(log_path, "a") as f:
+        f.write(json.dumps({k: v for k, v in record.items() if k != "entities"}) + "\n")
+    return previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the tap-csv entities through local Parquet staging")
+    parser.add_argument("--meltano-dir", default="meltano-csv")
+    parser.add_argument("--staging-dir", default=None, help="defaults to <meltano-dir>/output/parquet")
+    parser.add_argument("--duckdb", default=None, help="load into this DuckDB file instead of BigQuery")
+    parser.add_argument("--singer-loader", default=None,
+                        help="also time `meltano run tap-csv <loader>` for a rows/sec comparison")
+    args = parser.parse_args()
+
+    meltano_dir = Path(args.meltano_dir)
+    staging_dir = Path(args.staging_dir) if args.staging_dir else meltano_dir / "output" / "parquet"
+    files = [f for f in load_tap_csv_files(meltano_dir) if f["path"].exists()]
+    schemas = load_catalog_schemas(meltano_dir / "catalog.json")
+
+    if args.duckdb:
+        target = DuckDBTarget(args.duckdb)
+    else:
+        bq = load_target_bigquery_config(meltano_dir)
+        target = BigQueryTarget(bq["project"], bq["dataset"], bq.get("location", "US"), bq.get("credentials_path"))
+
+    result = run_parquet_load(files, schemas, target, staging_dir)
+    print(f"\nparquet -> {target.name}: {result['rows']:,} rows in {result['seconds']}s "
+          f"({result['rows_per_second']:,} rows/s)")
+
+    if args.singer_loader:
+        import subprocess
+        start = time.perf_counter()
+        subprocess.run(["meltano", "run", "tap-csv", args.singer_loader], cwd=str(meltano_dir), check=True)
+        singer = throughput_record("singer", count_csv_rows(files), time.perf_counter() - start,
+                                   target=args.singer_loader)
+        print(f"singer  -> {args.singer_loader}: {singer['rows']:,} rows in {singer['seconds']}s "
+              f"({singer['rows_per_second']:,} rows/s)")
+        if singer["rows_per_second"]:
+            print(f"speedup: {result['rows_per_second'] / singer['rows_per_second']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
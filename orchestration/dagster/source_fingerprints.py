@@ -0,0 +1,77 @@
+"""
+Content fingerprints for the raw CSV sources.
+
+The nightly ELT run compares each tap-csv file against the fingerprint stored
+after the last successful run and only loads entities whose content changed.
+Size + mtime are checked first so untouched files are never re-read; a file
+that was merely touched is re-hashed and still counts as unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_state(state_path: Path) -> dict:
+    state_path = Path(state_path)
+    if not state_path.exists():
+        return {}
+    with open(state_path) as f:
+        return json.load(f).get("entities", {})
+
+
+def save_state(state_path: Path, fingerprints: dict) -> None:
+    """Atomically replace the stored fingerprints (only called after a successful run)."""
+    state_path = Path(state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"saved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                   "entities": fingerprints}, f, indent=2, sort_keys=True)
+    tmp_path.replace(state_path)
+
+
+def fingerprint_sources(files: list[dict], previous: dict) -> dict:
+    """
+    Fingerprint every configured source file against the previous state.
+
+    Parameters:
+    -----------
+    files : list of dict
+        tap-csv entity configs (entity, path, ...) as returned by parquet_load.load_tap_csv_files
+    previous : dict
+        {entity: {'sha256', 'size', 'mtime_ns'}} from the last successful run
+
+    Returns:
+    --------
+    dict : {'fingerprints': {entity: {...}}, 'changed': [entity, ...],
+            'unchanged': [entity, ...], 'missing': [entity, ...]}
+    """
+    fingerprints, changed, unchanged, missing = {}, [], [], []
+    for file_cfg in files:
+        entity, path = file_cfg["entity"], Path(file_cfg["path"])
+        if not path.exists():
+            missing.append(entity)
+            continue
+        stat = path.stat()
+        before = previous.get(entity)
+        if before and before["size"] == stat.st_size and before["mtime_ns"] == stat.st_mtime_ns:
+            sha = before["sha256"]
+        else:
+            sha = file_sha256(path)
+        fingerprints[entity] = {"sha256": sha, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        (unchanged if before and before["sha256"] == sha else changed).append(entity)
+    return {"fingerprints": fingerprints, "changed": changed, "unchanged": unchanged, "missing": missing}
@@ -0,0 +1,256 @@
+"""
+Stage-Level Timing and Memory Trace
+Spans around pipeline stages (and per table / column inside them) record wall time,
+CPU time and resident memory; optionally also the tracemalloc peak of Python-level
+allocations and a cProfile of each top-level stage. The trace is written in Chrome
+trace format ("X" complete events) so it opens in chrome://tracing or Perfetto, and
+the slowest profiled stage can be dumped as a .prof file for pstats / snakeviz.
+
+    tracer = Tracer(tracemalloc=True, cprofile=True)
+    with tracer.span('load'):
+        for name in files:
+            with tracer.span('load_table', category='table', table=name):
+                ...
+    tracer.write('data_profiling_output/profile_trace.json')
+
+Memory fields (MB):
+    rss_start / rss_end : resident set size when the span opened / closed (Linux)
+    rss_peak_growth     : growth of the process high-water mark during the span
+    py_peak / py_delta  : tracemalloc peak above the span's start and net change
+                          (only with tracemalloc=True; process-wide, so spans running
+                          concurrently on other threads are included)
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc as _tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is not reported
+    resource = None
+
+_MB = 1024 * 1024
+# ru_maxrss is in KB on Linux, bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss():
+    """Resident set size in bytes, None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss():
+    """Process high-water RSS in bytes, None without getrusage."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+def _mb(value):
+    return None if value is None else round(value / _MB, 2)
+
+
+class Span:
+    """One timed region; times are perf_counter seconds, memory in bytes."""
+
+    def __init__(self, name, category, args, depth, thread):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.depth = depth
+        self.thread = thread
+        self.start = time.perf_counter()
+        self.wall = self.cpu = None
+        self._cpu_start = time.process_time()
+        self.rss_start = current_rss()
+        self._peak_start = peak_rss()
+        self.rss_end = self.rss_peak_growth = None
+        self.py_start = self.py_peak = self.py_delta = None
+        self._py_max = 0
+        self.profile = None
+
+    def finish(self):
+        self.wall = time.perf_counter() - self.start
+        self.cpu = time.process_time() - self._cpu_start
+        self.rss_end = current_rss()
+        peak = peak_rss()
+        if peak is not None and self._peak_start is not None:
+            self.rss_peak_growth = peak - self._peak_start
+
+    def metrics(self):
+        metrics = {
+            'wall_ms': round(self.wall * 1000, 3),
+            'cpu_ms': round(self.cpu * 1000, 3),
+            'rss_start_mb': _mb(self.rss_start),
+            'rss_end_mb': _mb(self.rss_end),
+            'rss_peak_growth_mb': _mb(self.rss_peak_growth),
+        }
+        if self.py_peak is not None:
+            metrics['py_peak_mb'] = _mb(self.py_peak)
+            metrics['py_delta_mb'] = _mb(self.py_delta)
+        return metrics
+
+
+class Tracer:
+    """
+    Collects spans from any thread (each thread nests its own spans).
+
+    Parameters:
+    -----------
+    enabled : bool
+        False makes span() a no-op (used as the default when no tracer is passed)
+    tracemalloc : bool
+        Track Python allocation peaks per span (slows allocation-heavy code)
+    cprofile : bool
+        cProfile every top-level span; write() dumps the slowest one
+    """
+
+    def __init__(self, enabled=True, tracemalloc=False, cprofile=False):
+        self.enabled = enabled
+        self.tracemalloc = tracemalloc
+        self.cprofile = cprofile
+        self.spans = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owns_tracemalloc = enabled and tracemalloc and not _tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            _tracemalloc.start()
+
+    def close(self):
+        """Stop tracemalloc if this tracer started it (spans recorded so far are kept)."""
+        if self._owns_tracemalloc:
+            _tracemalloc.stop()
+            self._owns_tracemalloc = False
+        self.tracemalloc = False
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, category='stage', **args):
+        """Time the enclosed block; extra keyword args are stored on the trace event."""
+        if not self.enabled:
+            yield None
+            return
+        stack = self._stack()
+        if self.tracemalloc:
+            # reset_peak() is global: fold the peak so far into the enclosing span first
+            _, peak = _tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]._py_max = max(stack[-1]._py_max, peak)
+            _tracemalloc.reset_peak()
+        span = Span(name, category, args, len(stack), threading.get_ident())
+        if self.tracemalloc:
+            span.py_start, _ = _tracemalloc.get_traced_memory()
+        profile = cProfile.Profile() if self.cprofile and not stack else None
+        stack.append(span)
+        try:
+            if profile is not None:
+                try:
+                    profile.enable()
+                    span.profile = profile
+                except ValueError:  # another profiler is active (e.g. a concurrent job)
+                    profile = None
+            yield span
+        finally:
+            if profile is not None:
+                profile.disable()
+            stack.pop()
+            span.finish()
+            if self.tracemalloc:
+                current, peak = _tracemalloc.get_traced_memory()
+                span._py_max = max(span._py_max, peak)
+                span.py_peak = span._py_max - span.py_start
+                span.py_delta = current - span.py_start
+                if stack:
+                    stack[-1]._py_max = max(stack[-1]._py_max, span._py_max)
+            with self._lock:
+                self.spans.append(span)
+
+    def slowest(self, depth=0):
+        """Slowest finished span at `depth` (0 = top-level stages), or None."""
+        spans = [s for s in self.spans if s.depth == depth]
+        return max(spans, key=lambda s: s.wall) if spans else None
+
+    def events(self):
+        """Chrome trace 'X' events (microseconds since the tracer was created)."""
+        pid = os.getpid()
+        return [{
+            'name': s.name,
+            'cat': s.category,
+            'ph': 'X',
+            'ts': round((s.start - self._origin) * 1e6, 1),
+            'dur': round(s.wall * 1e6, 1),
+            'pid': pid,
+            'tid': s.thread,
+            'args': {**{k: v if isinstance(v, (int, float, bool)) or v is None else str(v) for k, v in s.args.items()},
+                     **s.metrics()},
+        } for s in sorted(self.spans, key=lambda s: s.start)]
+
+    def write(self, path):
+        """
+        Write the Chrome trace JSON; with cprofile, also <path stem>.prof for the slowest stage.
+
+        Returns:
+        --------
+        tuple : (trace path, .prof path or None)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        slowest = max((s for s in self.spans if s.profile is not None), key=lambda s: s.wall, default=None)
+        prof_path = None
+        if slowest is not None:
+            prof_path = path.with_suffix('.prof')
+            slowest.profile.dump_stats(prof_path)
+        with open(path, 'w') as f:
+            json.dump({
+                'traceEvents': self.events(),
+                'displayTimeUnit': 'ms',
+                'otherData': {
+                    'peak_rss_mb': _mb(peak_rss()),
+                    'tracemalloc': self.tracemalloc,
+                    'cprofile_span': slowest.name if slowest is not None else None,
+                },
+            }, f, indent=1)
+        return path, prof_path
+
+    def report(self, top=5):
+        """Printable lines: every top-level stage, then the slowest nested spans."""
+        lines = []
+        for s in sorted((s for s in self.spans if s.depth == 0), key=lambda s: s.start):
+            m = s.metrics()
+            memory = f"peak +{m['rss_peak_growth_mb']} MB" if m['rss_peak_growth_mb'] is not None else ""
+            if 'py_peak_mb' in m:
+                memory += f", py peak {m['py_peak_mb']} MB"
+            lines.append(f"{s.name:<24s} {m['wall_ms'] / 1000:8.2f}s wall {m['cpu_ms'] / 1000:8.2f}s cpu  {memory}")
+        nested = sorted((s for s in self.spans if s.depth > 0), key=lambda s: s.wall, reverse=True)[:top]
+        for s in nested:
+            label = ' '.join(str(v) for v in s.args.values())
+            lines.append(f"  slowest {s.name}: {label} {s.wall:.2f}s")
+        return lines
+
+    def profile_stats(self):
+        """pstats of the slowest profiled stage sorted by cumulative time, or None."""
+        spans = [s for s in self.spans if s.profile is not None]
+        if not spans:
+            return None
+        return pstats.Stats(max(spans, key=lambda s: s.wall).profile).sort_stats('cumulative')
+
+
+NULL_TRACER = Tracer(enabled=False)
@@ -0,0 +1,209 @@
+"""
+Precomputed Plot Bins for the Profiling Figures
+One NumPy pass per column turns the loaded tables into small fixed-size arrays:
+
+    hist        : fixed-edge histogram per numeric column (HIST_BINS bins over [min, max];
+                  one bin per value for integer columns with a short range)
+    hexbin      : 2D hexagonal-bin counts for the numeric relationships
+                  (price vs freight, installments vs payment value), same lattice as
+                  matplotlib's hexbin so the renderer reproduces the cells exactly
+    review_scores : counts per review score
+
+The arrays are cached in data_profiling_output/plot_bins.npz; the PNG renderer and
+the dashboard plot from them, so plotting cost no longer depends on the row count.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BINS_FILE = Path("data_profiling_output/plot_bins.npz")
+HIST_BINS = 50
+HEXBIN_GRIDSIZE = 40
+# (name, table, x column, y column) for the relationship plots
+HEXBIN_PAIRS = (
+    ('price_vs_freight', 'olist_order_items_dataset', 'price', 'freight_value'),
+    ('installments_vs_value', 'olist_order_payments_dataset', 'payment_installments', 'payment_value'),
+)
+REVIEWS_TABLE = 'olist_order_reviews_dataset'
+
+
+def _values(series):
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values[~np.isnan(values)]
+
+
+def histogram(series, bins=HIST_BINS):
+    """
+    Fixed-edge histogram of a numeric column.
+
+    Returns:
+    --------
+    dict : counts, edges, mean, std (ddof=1) and n; None if the column has no values
+    """
+    values = _values(series)
+    if len(values) == 0:
+        return None
+    lo, hi = values.min(), values.max()
+    if pd.api.types.is_integer_dtype(series) and hi - lo < bins:
+        edges = np.arange(lo - 0.5, hi + 1.5)  # one bin per integer value
+    else:
+        edges = np.linspace(lo, hi if hi > lo else lo + 1, bins + 1)
+    # Uniform edges: bin index by arithmetic + bincount instead of np.histogram's search
+    width = edges[1] - edges[0]
+    index = np.minimum(((values - edges[0]) / width).astype(np.int64), len(edges) - 2)
+    return {
+        'counts': np.bincount(index, minlength=len(edges) - 1),
+        'edges': edges,
+        'mean': values.mean(),
+        'std': values.std(ddof=1) if len(values) > 1 else np.nan,
+        'n': len(values),
+    }
+
+
+def hexbin(x, y, gridsize=HEXBIN_GRIDSIZE):
+    """
+    Hexagonal-bin counts of (x, y) pairs on matplotlib's hexbin lattice.
+
+    Returns:
+    --------
+    dict : x / y centers and counts of the non-empty cells, extent, gridsize, n and the
+           Pearson correlation of the full columns; None if no pair is complete
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+    if len(x) == 0:
+        return None
+    nx = gridsize
+    ny = int(nx / np.sqrt(3))
+    extent = np.array([x.min(), x.max(), y.min(), y.max()])
+    xmin, xmax, ymin, ymax = _nonsingular(*extent[:2]) + _nonsingular(*extent[2:])
+    padding = 1e-9 * (xmax - xmin)
+    xmin, xmax = xmin - padding, xmax + padding
+    sx, sy = (xmax - xmin) / nx, (ymax - ymin) / ny
+
+    # Two offset rectangular lattices; each point goes to the nearer lattice centre
+    ix, iy = (x - xmin) / sx, (y - ymin) / sy
+    ix1, iy1 = np.round(ix).astype(np.int64), np.round(iy).astype(np.int64)
+    ix2, iy2 = np.floor(ix).astype(np.int64), np.floor(iy).astype(np.int64)
+    d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+    d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+    first = d1 < d2
+    counts1 = np.bincount(ix1[first] * (ny + 1) + iy1[first], minlength=(nx + 1) * (ny + 1))
+    counts2 = np.bincount(ix2[~first] * ny + iy2[~first], minlength=nx * ny)
+
+    i1, j1 = np.divmod(np.arange((nx + 1) * (ny + 1)), ny + 1)
+    i2, j2 = np.divmod(np.arange(nx * ny), ny)
+    cx = np.concatenate([xmin + sx * i1, xmin + sx * (i2 + 0.5)])
+    cy = np.concatenate([ymin + sy * j1, ymin + sy * (j2 + 0.5)])
+    counts = np.concatenate([counts1, counts2])
+    filled = counts > 0
+    return {
+        'x': cx[filled],
+        'y': cy[filled],
+        'counts': counts[filled],
+        'extent': extent,
+        'gridsize': gridsize,
+        'n': len(x),
+        'corr': np.corrcoef(x, y)[0, 1] if len(x) > 1 else np.nan,
+    }
+
+
+def _nonsingular(lo, hi):
+    """Widen a zero-width range the way matplotlib does (expander=0.1)."""
+    if hi > lo:
+        return lo, hi
+    pad = 0.1 * abs(lo) if lo else 0.1
+    return lo - pad, hi + pad
+
+
+def value_counts(series):
+    """Sorted distinct values and their counts (nulls dropped)."""
+    counts = series.value_counts().sort_index()
+    return {'values': counts.index.to_numpy(), 'counts': counts.to_numpy()}
+
+
+class PlotBins:
+    """Binned arrays for every profiling figure, keyed like the figures they feed."""
+
+    def __init__(self, hists=None, hexbins=None, review_scores=None):
+        self.hists = hists or {}      # {table: {column: histogram dict}}
+        self.hexbins = hexbins or {}  # {name: hexbin dict}
+        self.review_scores = review_scores
+
+    @staticmethod
+    def columns(df):
+        """Columns the bins are built from: every numeric one (histograms, hexbin pairs, review scores)."""
+        return list(df.select_dtypes(include=[np.number]).columns)
+
+    def add_table(self, table_name, df, bins=HIST_BINS, gridsize=HEXBIN_GRIDSIZE):
+        """Bin one table's numeric columns, its relationship pairs and (reviews) the scores."""
+        columns = {}
+        for column in self.columns(df):
+            result = histogram(df[column], bins)
+            if result is not None:
+                columns[column] = result
+        self.hists[table_name] = columns
+        for name, table, x, y in HEXBIN_PAIRS:
+            if table == table_name and x in df.columns and y in df.columns:
+                result = hexbin(df[x], df[y], gridsize)
+                if result is not None:
+                    self.hexbins[name] = result
+        if table_name == REVIEWS_TABLE and 'review_score' in df.columns:
+            self.review_scores = value_counts(df['review_score'])
+
+    @classmethod
+    def compute(cls, datasets, bins=HIST_BINS, gridsize=HEXBIN_GRIDSIZE):
+        """Bin every numeric column, the relationship pairs and the review scores."""
+        plot_bins = cls()
+        for table_name, df in datasets.items():
+            plot_bins.add_table(table_name, df, bins, gridsize)
+        return plot_bins
+
+    def save(self, path=BINS_FILE):
+        """One npz entry per array, named kind|table|column|field."""
+        arrays = {}
+        for table, columns in self.hists.items():
+            arrays[f"table|{table}"] = np.array(list(columns), dtype=str)
+            for column, result in columns.items():
+                for field, value in result.items():
+                    arrays[f"hist|{table}|{column}|{field}"] = np.asarray(value)
+        for name, result in self.hexbins.items():
+            for field, value in result.items():
+                arrays[f"hexbin|{name}|{field}"] = np.asarray(value)
+        if self.review_scores is not None:
+            for field, value in self.review_scores.items():
+                arrays[f"reviews|{field}"] = np.asarray(value)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path=BINS_FILE):
+        """Cached bins, or None if the profiler has not written them yet."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        hists, hexbins, review_scores, order = {}, {}, None, {}
+        with np.load(path) as data:
+            for key in data.files:
+                kind, *parts = key.split('|')
+                value = data[key]
+                value = value.item() if value.ndim == 0 else value
+                if kind == 'table':
+                    order[parts[0]] = value.tolist()
+                elif kind == 'hist':
+                    table, column, field = parts
+                    hists.setdefault(table, {}).setdefault(column, {})[field] = value
+                elif kind == 'hexbin':
+                    hexbins.setdefault(parts[0], {})[parts[1]] = value
+                elif kind == 'reviews':
+                    review_scores = review_scores or {}
+                    review_scores[parts[0]] = value
+        # tables in stored order, columns in their dataset order
+        hists = {table: {c: hists.get(table, {})[c] for c in columns} for table, columns in order.items()}
+        return cls(hists, hexbins, review_scores)
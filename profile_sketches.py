@@ -0,0 +1,174 @@
+"""
+Bounded-Memory Sketches for Approximate Column Profiling
+Used by calculate_column_profile(approximate=True) for large / high-cardinality
+columns (olist_geolocation_dataset, ID columns). Each sketch consumes the column in
+fixed-size chunks and keeps state whose size does not depend on the number of
+distinct values:
+
+    HyperLogLog    : distinct count, 2^14 one-byte registers, ~0.81 % relative std error
+    FrequentItems  : Misra-Gries (Space-Saving family) heavy hitters, `capacity` counters;
+                     every reported count is low by at most `error`
+    QuantileSketch : KLL-style compactor levels of `k` items; rank error ~1.3 % at k=200
+
+Everything is vectorized with NumPy / pandas per chunk.
+"""
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 65_536
+
+
+def _chunks(series, size=CHUNK_ROWS):
+    for start in range(0, len(series), size):
+        yield series.iloc[start:start + size]
+
+
+def _bit_length(x):
+    """Exact bit length of each uint64 (0 -> 0), by binary search over shifts."""
+    x = x.copy()
+    n = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= (np.uint64(1) << np.uint64(shift))
+        n[big] += shift
+        x[big] >>= np.uint64(shift)
+    return n + (x > 0)
+
+
+class HyperLogLog:
+    """Distinct-count estimate from 64-bit value hashes."""
+
+    def __init__(self, precision=14):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, series):
+        hashes = pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy()
+        if len(hashes) == 0:
+            return
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # rank = position of the leftmost 1-bit in the remaining 64 - p bits
+        rank = ((64 - self.p) - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int((self.registers == 0).sum())
+        if raw <= 2.5 * self.m and zeros:
+            return self.m * np.log(self.m / zeros)  # linear counting for small cardinalities
+        return raw
+
+    @property
+    def relative_error(self):
+        """One standard error, relative to the estimate."""
+        return 1.04 / np.sqrt(self.m)
+
+
+class FrequentItems:
+    """
+    Misra-Gries summary: at most `capacity` counters; each count underestimates the
+    true frequency by at most `error` (<= rows / (capacity + 1)).
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.error = 0
+
+    def update(self, series):
+        chunk = series.value_counts(dropna=True)
+        if len(chunk) == 0:
+            return
+        counts = chunk if self.counts.empty else self.counts.add(chunk, fill_value=0)
+        if len(counts) > self.capacity:
+            # Decrement everything by the (capacity + 1)-th largest count and drop non-positive counters
+            cut = counts.nlargest(self.capacity + 1).iloc[-1]
+            counts = counts[counts > cut] - cut
+            self.error += int(cut)
+        self.counts = counts.astype(np.int64)
+
+    def top(self, n=10):
+        return self.counts.sort_values(ascending=False, kind='stable').head(n)
+
+
+class QuantileSketch:
+    """
+    KLL-style quantile sketch: level h holds at most `k` items of weight 2^h; a full
+    level is sorted and every other item (random offset) is promoted to the next level.
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.levels = []
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        level, items = 0, values
+        while len(items):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            buffer = np.concatenate([self.levels[level], items])
+            if len(buffer) <= self.k:
+                self.levels[level] = buffer
+                return
+            buffer.sort()
+            keep = len(buffer) % 2  # an odd item stays at this level
+            self.levels[level] = buffer[len(buffer) - keep:]
+            items = buffer[self._rng.integers(2):len(buffer) - keep:2]
+            level += 1
+
+    def quantiles(self, qs):
+        if self.n == 0:
+            return [None] * len(qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side='left')
+        return values[order][np.minimum(positions, len(values) - 1)].tolist()
+
+    @property
+    def rank_error(self):
+        """Normalized rank error (~99 % confidence) for this k, after the KLL analysis."""
+        return 2.296 / self.k ** 0.9723
+
+
+def approximate_metrics(series, top_n=10, capacity=1024, k=200):
+    """
+    Distinct count, heavy hitters and (numeric) quartiles of a column in one chunked pass.
+
+    Returns:
+    --------
+    dict : distinct_count, distinct_count_error (1 std error, absolute), top values and
+           counts, frequency_error (max undercount), quartiles and quantile_rank_error
+    """
+    hll, frequent = HyperLogLog(), FrequentItems(capacity)
+    numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    quantiles = QuantileSketch(k) if numeric else None
+    for chunk in _chunks(series):
+        hll.update(chunk)
+        frequent.update(chunk)
+        if quantiles is not None:
+            quantiles.update(chunk.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    distinct = int(round(hll.estimate()))
+    top = frequent.top(top_n)
+    metrics = {
+        'distinct_count': distinct,
+        'distinct_count_error': round(distinct * hll.relative_error, 1),
+        'top_values': list(top.index),
+        'top_frequencies': top.to_numpy().tolist(),
+        'frequency_error': frequent.error,
+        'q1_25': None, 'q2_50_median': None, 'q3_75': None, 'quantile_rank_error': None,
+    }
+    if quantiles is not None:
+        metrics['q1_25'], metrics['q2_50_median'], metrics['q3_75'] = quantiles.quantiles([0.25, 0.5, 0.75])
+        metrics['quantile_rank_error'] = round(quantiles.rank_error, 4)
+    return metrics
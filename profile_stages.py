@@ -0,0 +1,82 @@
+"""
+Per-Table Inputs of the Stages After Column Profiling
+Drift, plot bins and the reports need much less than the loaded
+tables. Each stage declares the columns it reads and reduces them to a small result
+while its table is in memory:
+
+    table_stats   : every column -> rows, columns, deep memory (MB)
+    drift         : every column -> one column_sketch per column (quantiles / top-k)
+    plot_bins     : numeric columns -> PlotBins histograms, hexbin cells, review counts
+
+profile_all_datasets(stages=StageInputs()) passes each table through add() right after
+profiling it and then drops it, so peak memory is about the largest table instead of
+the sum of all of them.
+"""
+
+import pandas as pd
+
+from dq_drift import table_sketches
+from profile_bins import PlotBins
+
+STAGES = ('table_stats', 'drift', 'plot_bins')
+TABLE_STATS_COLUMNS = ['rows', 'columns', 'memory_mb']
+
+
+def table_totals(df):
+    """Rows, columns and deep memory usage (MB) of one table."""
+    return {'rows': df.shape[0], 'columns': df.shape[1], 'memory_mb': df.memory_usage(deep=True).sum() / 1024**2}
+
+
+def stats_frame(totals):
+    """{table: table_totals(...)} as a DataFrame of rows, columns, memory_mb indexed by table_name."""
+    return pd.DataFrame(list(totals.values()), columns=TABLE_STATS_COLUMNS,
+                        index=pd.Index(list(totals), name='table_name'))
+
+
+def stage_columns(stage, table_name, df):
+    """Columns of `table_name` that `stage` reads; None if the stage does not use the table."""
+    if stage in ('table_stats', 'drift'):
+        return list(df.columns)
+    if stage == 'plot_bins':
+        return PlotBins.columns(df)
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+class StageInputs:
+    """Small per-table products for the later stages, filled one table at a time."""
+
+    def __init__(self):
+        self.totals = {}
+        self.sketches = {}
+        self.bins = PlotBins()
+
+    def add(self, table_name, df, profiles=None):
+        """
+        Reduce one loaded table for every stage.
+
+        Parameters:
+        -----------
+        table_name : str
+            Table (CSV stem)
+        df : pd.DataFrame
+            The full table; only each stage's declared columns are read
+        profiles : list of dict, optional
+            The table's calculate_column_profile rows (reused by the drift sketches)
+        """
+        for stage in STAGES:
+            columns = stage_columns(stage, table_name, df)
+            if columns is None:
+                continue
+            frame = df if len(columns) == len(df.columns) else df[columns]
+            if stage == 'table_stats':
+                self.totals[table_name] = table_totals(frame)
+            elif stage == 'drift':
+                profile_df = pd.DataFrame(profiles) if profiles else None
+                self.sketches.update(table_sketches({table_name: frame}, profile_df))
+            elif stage == 'plot_bins':
+                self.bins.add_table(table_name, frame)
+
+    @property
+    def table_stats(self):
+        """Per-table totals in load order, shaped like data_profiling_analysis.dataset_stats."""
+        return stats_frame(self.totals)
@@ -0,0 +1,151 @@
+"""
+Typed, Indexed Profiling Results
+data_profiling_analysis.main writes the column profiles to a Parquet file next to
+data_profiling_results.csv. Rows are sorted by (table_name, column_name), counts stay
+int64 (nullable), and top_10_values / top_10_frequencies are native list columns, so
+loading needs no CSV parsing or literal_eval. ProfileStore answers the viewers' lookups
+by binary search over the sorted keys instead of boolean scans over the frame.
+
+Usage:
+    store = ProfileStore.open()
+    store.get('olist_order_items_dataset', 'price')['top_10_values']
+    store.table('olist_sellers_dataset')     # one table's rows, in profile order
+    store.frame                              # every row, in profile order
+"""
+
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # the CSV stays the fallback artifact without Arrow
+    pa = pq = None
+
+PROFILE_FILE = Path("data_profiling_results.parquet")
+CSV_FILE = Path("data_profiling_results.csv")
+ORDER_COLUMN = 'profile_order'
+ROW_GROUP_ROWS = 64
+
+_STRING_COLUMNS = ('table_name', 'column_name', 'data_type', 'most_frequent_value', 'profile_mode')
+_INT_COLUMNS = (
+    'total_count', 'null_count', 'not_null_count', 'nan_count', 'distinct_count', 'unique_count',
+    'not_unique_count', 'zero_count', 'min_length', 'max_length', 'highest_frequency',
+    'lowest_frequency', 'frequency_error',
+)
+
+
+def _field_type(column, series):
+    if column in _STRING_COLUMNS:
+        return pa.string()
+    if column in _INT_COLUMNS:
+        return pa.int64()
+    if column == 'top_10_values':
+        return pa.list_(pa.string())  # values of any column type, rendered as text
+    if column == 'top_10_frequencies':
+        return pa.list_(pa.int64())
+    if column == ORDER_COLUMN:
+        return pa.int32()
+    # other metrics are numeric; anything else (e.g. a mixed min_value) is kept as text
+    return pa.float64() if pd.api.types.is_numeric_dtype(series) else pa.string()
+
+
+def _to_arrow(column, series):
+    kind = _field_type(column, series)
+    if kind == pa.string():
+        series = series.map(lambda v: None if v is None or (not isinstance(v, str) and pd.isna(v)) else str(v))
+    elif kind == pa.list_(pa.string()):
+        series = series.map(lambda v: None if not isinstance(v, list) else [str(x) for x in v])
+    elif kind == pa.list_(pa.int64()):
+        series = series.map(lambda v: None if not isinstance(v, list) else [int(x) for x in v])
+    return pa.array(series if pd.api.types.is_numeric_dtype(series) else series.astype(object),
+                    type=kind, from_pandas=True)
+
+
+def write_profile_artifact(profile_df, path=PROFILE_FILE):
+    """
+    Write the profiles as Parquet, sorted by (table_name, column_name).
+
+    Parameters:
+    -----------
+    profile_df : pd.DataFrame
+        Output of profile_all_datasets (one row per column, in profile order)
+    path : Path
+        Target file
+
+    Returns:
+    --------
+    Path or None : the written file, None when pyarrow is not installed
+    """
+    if pq is None:
+        return None
+    frame = profile_df.reset_index(drop=True)
+    frame[ORDER_COLUMN] = range(len(frame))
+    frame = frame.sort_values(['table_name', 'column_name'], kind='stable')
+    table = pa.Table.from_arrays([_to_arrow(column, frame[column]) for column in frame.columns],
+                                 names=list(frame.columns))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # small row groups keep per-table min/max statistics useful for filter pushdown
+    pq.write_table(table, path, row_group_size=ROW_GROUP_ROWS)
+    return path
+
+
+class ProfileStore:
+    """Profiles sorted by (table_name, column_name) with binary-search lookups."""
+
+    def __init__(self, frame):
+        if ORDER_COLUMN not in frame.columns:
+            frame = frame.assign(**{ORDER_COLUMN: np.arange(len(frame))})
+        # every row in the order it was profiled, for the viewers' aggregate views
+        self.frame = frame.sort_values(ORDER_COLUMN).drop(columns=ORDER_COLUMN).reset_index(drop=True)
+        frame = frame.sort_values(['table_name', 'column_name'], kind='stable').reset_index(drop=True)
+        self._sorted = frame
+        self._tables = frame['table_name'].tolist()
+        self._keys = list(zip(self._tables, frame['column_name'].tolist()))
+
+    @classmethod
+    def open(cls, path=PROFILE_FILE, csv_path=CSV_FILE, tables=None):
+        """
+        Load the Parquet artifact (only `tables` if given), or the CSV when Arrow or the
+        artifact is missing; list columns are then left as the CSV's text.
+        """
+        if pq is not None and Path(path).exists():
+            filters = [('table_name', 'in', list(tables))] if tables else None
+            # nullable int64 instead of float64 for counts that are empty in approximate mode
+            frame = pq.read_table(path, filters=filters).to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        else:
+            frame = pd.read_csv(csv_path)
+            if tables:
+                frame = frame[frame['table_name'].isin(list(tables))]
+        return cls(frame)
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def metrics(self):
+        """Metric columns in profile order."""
+        return list(self.frame.columns)
+
+    def tables(self):
+        """Table names in profile order."""
+        return list(dict.fromkeys(self.frame['table_name']))
+
+    def get(self, table_name, column_name):
+        """One column's profile as a dict; KeyError if it was not profiled."""
+        i = bisect_left(self._keys, (table_name, column_name))
+        if i == len(self._keys) or self._keys[i] != (table_name, column_name):
+            raise KeyError(f"{table_name}.{column_name} not profiled")
+        row = self._sorted.iloc[i].to_dict()
+        row.pop(ORDER_COLUMN, None)
+        return {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in row.items()}
+
+    def table(self, table_name):
+        """One table's rows in profile order."""
+        lo, hi = bisect_left(self._tables, table_name), bisect_right(self._tables, table_name)
+        rows = self._sorted.iloc[lo:hi].sort_values(ORDER_COLUMN).drop(columns=ORDER_COLUMN)
+        return rows.reset_index(drop=True)
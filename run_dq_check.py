@@ -1,70 +1,167 @@
+import sys
+
+if __name__ == "__main__":
+    # Same as `python dq.py check`: arguments (and --help) are handled before the
+    # pandas / numpy / yaml imports below, which dq only loads to run the checks
+    from dq import main as dq_main
+    sys.exit(dq_main(['check'] + sys.argv[1:]))
+
 import pandas as pd
 import numpy as np
 import json
 import os
 import yaml
-from datetime import datetime
-import re
+from functools import partial
+from column_stats import CACHE_FILE as STATS_CACHE_FILE, StatsCache, count_inliers, outlier_bounds
+from dq_conformity import ConformityRules
+from dq_drift import DRIFT_DIR, REPORT_FILE as DRIFT_REPORT_FILE, load_report, summarize as summarize_drift
+from dq_history import HISTORY_FILE, HistoryStore
+from dq_consistency import GEO_TABLE, ConsistencyEngine, KeyIndex, required_columns
+from dq_plan import ExecutionPlan
+from dq_results import DIMENSIONS, NOT_RUN, SCAN_ESCALATED, SCAN_FULL, SCAN_SAMPLE, SCORED_DIMENSIONS, ResultTable
+from dq_sampling import pa_csv, read_csv_sample, sample_positions, sampling_config, wilson_interval, z_score
+from dq_sinks import NumpyEncoder, open_sinks
+from geo_centroid import GEO_COLUMNS, build_zip_lookup
+from pipeline_trace import Tracer
+
+RESULTS_TABLE_FILE = "dq_results.npz"
+TRACE_FILE = "dq_trace.json"
 
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (np.integer, np.int64)):
-            return int(obj)
-        if isinstance(obj, (np.floating, np.float64)):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, np.bool_):
-            return bool(obj)
-        return super().default(obj)
 
 class DataQualityChecker:
-    def __init__(self, config_path="great_expectation/config/dq_config.yml", data_dir="data/kaggle-raw"):
+    def __init__(self, config_path="great_expectation/config/dq_config.yml", data_dir="data/kaggle-raw",
+                 output_dir="Great_Expectation", result_formats=None, sampling=None,
+                 stats_cache_path=STATS_CACHE_FILE, history_path=None,
+                 drift_report_path=DRIFT_DIR / DRIFT_REPORT_FILE, tracer=None):
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
         self.threshold = float(self.config.get('threshold', 98.0))
+        # Which dimensions run on which table.column (globs / dtype filters in `checks`)
+        self.plan = ExecutionPlan.from_config(self.config)
+        self.conformity = ConformityRules.from_config(self.config)
+        # Outlier method for accuracy (iqr / mad / zscore); quantiles shared with the profiler's cache
+        accuracy = (self.config.get('checks') or {}).get('accuracy') or {}
+        self.accuracy_method = accuracy.get('method', 'iqr')
+        self.accuracy_k = accuracy.get('k')
+        outlier_bounds({'count': 0}, self.accuracy_method)  # fail fast on an unknown method
+        self.stats_cache = StatsCache(stats_cache_path)
+        # Sample large tables and escalate undecided columns to a full scan (off by default)
+        self.sampling = sampling_config({'sampling': sampling} if sampling is not None else self.config)
+        # Tables loaded as a sample: {table: (total rows, CSV path, loaded columns)}
+        self._samples = {}
         self.data_dir = data_dir
-        self.results = []
+        self.output_dir = output_dir
+        # Append-only per-run score history (trend queries, drift / regression alerts)
+        self.history_path = history_path or os.path.join(output_dir, HISTORY_FILE)
+        # Latest drift report written by the profiler (sketch comparison with the previous load)
+        self.drift_report_path = drift_report_path
+        # jsonl / csv / parquet; each column result is streamed to every sink as it is produced
+        self.result_formats = result_formats or self.config.get('result_formats', ['jsonl', 'csv'])
+        self.results = ResultTable(self.threshold)
+        self.sinks = []
         self.summary = {}
+        self.consistency = None
+        # Optional callback(result record) per scored column, e.g. job progress in dq_service
+        self.on_column = None
+        # load / check / save spans per table and column, written to <output_dir>/dq_trace.json
+        self.tracer = tracer or Tracer()
     
-    def load_all_tables(self):
+    def load_all_tables(self, files=None):
+        """Load the olist CSVs in data_dir, or only `files` (paths relative to data_dir or absolute)"""
         tables = {}
         if not os.path.exists(self.data_dir):
             print(f"❌ Data directory not found: {self.data_dir}")
             return tables
         
-        csv_files = [f for f in os.listdir(self.data_dir) if f.endswith(".csv") and not f.startswith('.')]
-        csv_files = [f for f in csv_files if 'olist_' in f or 'product_category' in f]
+        if files is None:
+            csv_files = [f for f in os.listdir(self.data_dir) if f.endswith(".csv") and not f.startswith('.')]
+            csv_files = [f for f in csv_files if 'olist_' in f or 'product_category' in f]
+        else:
+            csv_files = list(files)
         
         if not csv_files:
             print(f"❌ No CSV files found in: {self.data_dir}")
             return tables
         
+        # Columns read by consistency rules must be loaded even where no check targets them
+        required = {}
+        if 'consistency' in self.plan.enabled_dimensions:
+            rules = self.config.get('consistency') or {}
+            required = required_columns(rules.get('references', []), rules.get('row_rules', []),
+                                        rules.get('locations', []))
+        
+        # In sampling mode large tables are sampled while the CSV streams in (needs pyarrow)
+        cfg = self.sampling
+        sample_on_load = cfg['enabled'] and pa_csv is not None
+        self._samples = {}
+        
         print(f"📊 Loading {len(csv_files)} raw data files from: {self.data_dir}/")
-        for csv_file in csv_files:
-            table_name = csv_file.replace("_dataset.csv", "").replace(".csv", "")
-            file_path = os.path.join(self.data_dir, csv_file)
-            try:
-                df = pd.read_csv(file_path)
-                tables[table_name] = df
-                print(f"   ✓ {table_name}: {len(df):,} rows, {len(df.columns)} columns")
-            except Exception as e:
-                print(f"   ❌ Error loading {csv_file}: {e}")
+        with self.tracer.span('load', tables=len(csv_files)):
+            for csv_file in csv_files:
+                table_name = os.path.basename(csv_file).replace("_dataset.csv", "").replace(".csv", "")
+                file_path = os.path.join(self.data_dir, csv_file)
+                try:
+                    header = pd.read_csv(file_path, nrows=0).columns
+                    usecols = self.plan.columns_to_load(table_name, header, required.get(table_name, ()))
+                    if not usecols:
+                        print(f"   ⏭️  {table_name}: no planned checks, not loaded")
+                        continue
+                    with self.tracer.span('load_table', category='table', table=table_name):
+                        if sample_on_load:
+                            df, total_rows = read_csv_sample(file_path, usecols, cfg['sample_size'], cfg['min_rows'],
+                                                             (cfg['stratify_by'] or {}).get(table_name), cfg['seed'])
+                        else:
+                            df = pd.read_csv(file_path, usecols=usecols)
+                            total_rows = len(df)
+                    tables[table_name] = df
+                    if total_rows > len(df):
+                        self._samples[table_name] = (total_rows, file_path, usecols)
+                        print(f"   ✓ {table_name}: sample of {len(df):,} / {total_rows:,} rows, {len(df.columns)} columns")
+                    else:
+                        print(f"   ✓ {table_name}: {len(df):,} rows, {len(df.columns)} columns")
+                except Exception as e:
+                    print(f"   ❌ Error loading {csv_file}: {e}")
         return tables
 
+    def build_consistency_engine(self, tables):
+        """Referential, intra-row and location rules from the `consistency` config section, sharing key indexes"""
+        rules = self.config.get('consistency') or {}
+        references, locations = rules.get('references', []), rules.get('locations', [])
+        # Parent key indexes and the zip lookup are built from this run's loaded tables (one each,
+        # shared by every rule that uses them); rules on a table that is not loaded are skipped.
+        # A parent loaded only as a sample is indexed from its key columns, read in full.
+        def loaded(table, *columns):
+            return table in tables and set(columns).issubset(tables[table].columns)
+
+        key_indexes, zip_lookup = {}, None
+        for table_name, (_, file_path, _) in self._samples.items():
+            # only for rules whose child side is loaded too
+            keys = [ref['parent'].rpartition('.')[2] for ref in references
+                    if ref['parent'].rpartition('.')[0] == table_name and loaded(*ref['child'].rpartition('.')[::2])]
+            keys = [column for column in dict.fromkeys(keys) if loaded(table_name, column)]
+            geo = (table_name == GEO_TABLE and loaded(table_name, *GEO_COLUMNS)
+                   and any(loaded(location['table'], location['zip']) for location in locations))
+            if not keys and not geo:
+                continue
+            columns = set(keys) | (set(GEO_COLUMNS) if geo else set())
+            with self.tracer.span('load_keys', category='table', table=table_name):
+                full = pd.read_csv(file_path, usecols=list(columns))
+            key_indexes.update({(table_name, column): KeyIndex.from_series(full[column]) for column in keys})
+            if geo:
+                zip_lookup = build_zip_lookup(full)
+        engine = ConsistencyEngine(tables, references, rules.get('row_rules', []), key_indexes=key_indexes,
+                                   locations=locations, zip_lookup=zip_lookup)
+        for skipped in engine.skipped:
+            print(f"   ⚠️  Consistency rule skipped (table/column not loaded): {skipped}")
+        return engine
+
+    # Each check returns the number of valid records for the column;
+    # scores and "n/m" details are derived by ResultTable.
+
     def check_completeness(self, df, column):
-        total = int(len(df))
-        non_null = int(df[column].notna().sum())
-        score = round(float((non_null / total * 100) if total > 0 else 0), 2)
-        return {
-            "score": score,
-            "valid_records": non_null,
-            "invalid_records": total - non_null,
-            "details": f"{non_null}/{total} non-null"
-        }
+        return int(df[column].notna().sum())
     
     def check_validity(self, df, column):
-        total = int(len(df))
         valid_count = 0
         
         if pd.api.types.is_numeric_dtype(df[column]):
@@ -74,210 +171,239 @@ class DataQualityChecker:
         else:
             valid_count = int(df[column].notna().sum())
         
-        score = round(float((valid_count / total * 100) if total > 0 else 0), 2)
-        return {
-            "score": score,
-            "valid_records": valid_count,
-            "invalid_records": total - valid_count,
-            "details": f"{valid_count}/{total} valid"
-        }
+        return valid_count
     
     def check_uniqueness(self, df, column):
         """Uniqueness check - NOT included in threshold calculation"""
-        total = int(len(df))
-        unique_count = int(df[column].nunique())
-        duplicate_count = total - unique_count
-        score = round(float((unique_count / total * 100) if total > 0 else 0), 2)
-        return {
-            "score": score,
-            "valid_records": unique_count,
-            "invalid_records": duplicate_count,
-            "details": f"{unique_count}/{total} unique"
-        }
+        return int(df[column].nunique())
     
     def check_accuracy(self, df, column):
-        total = int(len(df))
-        
         if pd.api.types.is_numeric_dtype(df[column]):
-            Q1 = df[column].quantile(0.25)
-            Q3 = df[column].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            accurate_count = int(((df[column] >= lower_bound) & (df[column] <= upper_bound)).sum())
+            stats = self.stats_cache.get(df[column])
+            accurate_count = count_inliers(df[column], outlier_bounds(stats, self.accuracy_method, self.accuracy_k))
         else:
             accurate_count = int(df[column].notna().sum())
         
-        score = round(float((accurate_count / total * 100) if total > 0 else 0), 2)
-        return {
-            "score": score,
-            "valid_records": accurate_count,
-            "invalid_records": total - accurate_count,
-            "details": f"{accurate_count}/{total} accurate"
-        }
+        return accurate_count
     
-    def check_consistency(self, df, column):
-        total = int(len(df))
-        consistent_count = int(df[column].notna().sum())
-        score = round(float((consistent_count / total * 100) if total > 0 else 0), 2)
-        return {
-            "score": score,
-            "valid_records": consistent_count,
-            "invalid_records": total - consistent_count,
-            "details": f"{consistent_count}/{total} consistent"
-        }
+    def check_consistency(self, df, column, table_name=None, sample=False):
+        # Columns with configured rules: rows satisfying all of them; otherwise non-null.
+        # `sample`: df holds only some of the table's rows.
+        if self.consistency is not None and self.consistency.has_rules(table_name, column):
+            return self.consistency.consistent_count(table_name, column, sample=df if sample else None)
+        return int(df[column].notna().sum())
     
     def check_conformity(self, df, column):
-        total = int(len(df))
-        col_lower = column.lower()
-        
-        if 'email' in col_lower:
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            conforming_count = int(df[column].astype(str).str.match(email_pattern).sum())
-        elif 'date' in col_lower or 'time' in col_lower:
-            try:
-                pd.to_datetime(df[column], errors='coerce')
-                conforming_count = int(df[column].notna().sum())
-            except:
-                conforming_count = int(df[column].notna().sum())
-        else:
-            conforming_count = int(df[column].notna().sum())
-        
-        score = round(float((conforming_count / total * 100) if total > 0 else 0), 2)
-        return {
-            "score": score,
-            "valid_records": conforming_count,
-            "invalid_records": total - conforming_count,
-            "details": f"{conforming_count}/{total} conform"
-        }
+        # Format rule assigned by column name / dtype (hex ids, zips, UF codes, ISO timestamps, lat/lng)
+        return self.conformity.count(column, df[column])
     
-    def run_checks(self):
+    def run_checks(self, files=None):
         print("\n🔍 Running comprehensive data quality checks on RAW DATA...")
         print(f"   Threshold: {self.threshold}%")
         print(f"   Note: Uniqueness is tracked but NOT included in pass/fail threshold")
-        print(f"   Data Source: {self.data_dir}/\n")
+        print(f"   Data Source: {self.data_dir}/")
+        print("   Execution plan:")
+        for line in self.plan.describe():
+            print(f"     - {line}")
+        for name in self.plan.unsupported:
+            print(f"   ⚠️  Check '{name}' is configured but not implemented; ignored")
+        if self.sampling['enabled']:
+            print(f"   Sampling: {self.sampling['sample_size']:,} rows per table with > {self.sampling['min_rows']:,} rows, "
+                  f"{self.sampling['confidence']:.0%} confidence (uniqueness not estimated from samples)")
+        print()
         
-        tables = self.load_all_tables()
+        tables = self.load_all_tables(files)
         
         if not tables:
             print("\n❌ No data to check. Exiting...")
             return
         
-        for table_name, df in tables.items():
-            print(f"\n📋 Checking table: {table_name}")
-            for column in df.columns:
-                completeness = self.check_completeness(df, column)
-                validity = self.check_validity(df, column)
-                uniqueness = self.check_uniqueness(df, column)
-                accuracy = self.check_accuracy(df, column)
-                consistency = self.check_consistency(df, column)
-                conformity = self.check_conformity(df, column)
-                
-                # Calculate overall score WITHOUT uniqueness (5 dimensions only)
-                overall_score = round(float((
-                    completeness["score"] + 
-                    validity["score"] + 
-                    accuracy["score"] + 
-                    consistency["score"] + 
-                    conformity["score"]
-                ) / 5), 2)
-                
-                result = {
-                    "table_name": table_name,
-                    "column_name": column,
-                    "data_type": str(df[column].dtype),
-                    "total_rows": int(len(df)),
-                    "completeness": completeness,
-                    "validity": validity,
-                    "uniqueness": uniqueness,  # Tracked but not in overall score
-                    "accuracy": accuracy,
-                    "consistency": consistency,
-                    "conformity": conformity,
-                    "overall_score": overall_score,
-                    "overall_passed": bool(overall_score >= self.threshold),
-                    "timestamp": datetime.now().isoformat()
-                }
-                self.results.append(result)
-                
-                status = "✅ PASS" if result["overall_passed"] else "❌ FAIL"
-                print(f"   {status} {column}: {overall_score}% (Uniqueness: {uniqueness['score']}% - informational)")
+        self.check_loaded_tables(tables)
+    
+    def check_loaded_tables(self, tables):
+        """Score already-loaded tables, streaming each column to the sinks (and `on_column`)"""
+        self.consistency = (self.build_consistency_engine(tables)
+                            if 'consistency' in self.plan.enabled_dimensions else None)
+        self.results = ResultTable(self.threshold)
+        self.sinks = open_sinks(self.output_dir, self.threshold, self.result_formats)
+        print(f"💾 Streaming results to {self.output_dir}/ ({', '.join(self.result_formats)})")
+        try:
+            with self.tracer.span('check', tables=len(tables)):
+                self._check_tables(tables)
+        finally:
+            for sink in self.sinks:
+                sink.close()
         
         print(f"\n✓ Analyzed {len(self.results)} columns across {len(tables)} tables\n")
         self.calculate_summary()
     
-    def calculate_summary(self):
-        total = len(self.results)
-        passed = sum(1 for r in self.results if r["overall_passed"])
+    def _table_checks(self, table_name, sample=False):
+        return {dim: partial(self.check_consistency, table_name=table_name, sample=sample) if dim == 'consistency'
+                else getattr(self, f"check_{dim}") for dim in DIMENSIONS}
+    
+    def _load_full_table(self, table_name, tables):
+        """Replace a table loaded as a sample by the whole CSV (on its first escalated column)"""
+        _, file_path, usecols = self._samples.pop(table_name)
+        with self.tracer.span('load_table', category='table', table=table_name, escalated=True):
+            df = pd.read_csv(file_path, usecols=usecols)
+        # The consistency engine shares `tables`, so its full-table rule masks now see every row
+        tables[table_name] = df
+        print(f"   ⤴️  {table_name}: full table loaded for escalation ({len(df):,} rows)")
+        return df
+    
+    def _sample_table(self, table_name, df):
+        """Sample positions for a large table in sampling mode, else None (full scan)"""
+        cfg = self.sampling
+        if not cfg['enabled'] or len(df) <= max(cfg['min_rows'], cfg['sample_size']):
+            return None
+        stratify_by = (cfg['stratify_by'] or {}).get(table_name)
+        return sample_positions(df, cfg['sample_size'], stratify_by, cfg['seed'])
+    
+    def _estimate_column(self, checks, dims, sample, column, total_rows):
+        """
+        Score a column on the sample.
+
+        Returns:
+        --------
+        tuple : (estimated valid counts, (dims x 2) CI in percent, decided) -- decided is
+                False when the overall interval straddles the threshold
+        """
+        n = len(sample)
+        # Uniqueness cannot be scaled from a sample; only scored on full scans
+        sample_dims = [d for d in dims if d != 'uniqueness']
+        sample_valid = np.array([checks[d](sample, column) if d in sample_dims else NOT_RUN for d in DIMENSIONS])
+        ran = sample_valid != NOT_RUN
+        estimated = np.where(ran, np.round(sample_valid / n * total_rows), NOT_RUN).astype(np.int64)
         
-        tables = {}
-        for r in self.results:
-            tn = r["table_name"]
-            if tn not in tables:
-                tables[tn] = {"total_columns": 0, "passed_columns": 0, "failed_columns": 0, "scores": []}
-            tables[tn]["total_columns"] += 1
-            tables[tn]["passed_columns" if r["overall_passed"] else "failed_columns"] += 1
-            tables[tn]["scores"].append(r["overall_score"])
+        # Simultaneous intervals (Bonferroni over the gating dimensions) so the mean of the
+        # bounds is a valid interval for the overall score
+        n_scored = max(sum(d in sample_dims for d in SCORED_DIMENSIONS), 1)
+        z = z_score(1 - (1 - self.sampling['confidence']) / n_scored)
+        ci = np.full((len(DIMENSIONS), 2), np.nan)
+        ci[ran] = wilson_interval(sample_valid[ran], n, total_rows, z)
         
-        for tn in tables:
-            avg = sum(tables[tn]["scores"]) / len(tables[tn]["scores"])
-            tables[tn]["average_score"] = round(float(avg), 2)
-            tables[tn]["passed"] = bool(tables[tn]["average_score"] >= self.threshold)
+        scored = [DIMENSIONS.index(d) for d in SCORED_DIMENSIONS if d in sample_dims]
+        if not scored:
+            return estimated, ci, True
+        low, high = ci[scored, 0].mean(), ci[scored, 1].mean()
+        return estimated, ci, bool(low >= self.threshold or high < self.threshold)
+    
+    def _check_tables(self, tables):
+        for table_name, df in list(tables.items()):
+            if table_name in self._samples:
+                # Loaded as a sample; the full table is only read if a column escalates
+                sample, total_rows = df, self._samples[table_name][0]
+            else:
+                positions = self._sample_table(table_name, df)
+                sample = df.iloc[positions] if positions is not None else None
+                total_rows = len(df)
+            with self.tracer.span('check_table', category='table', table=table_name, rows=total_rows):
+                label = f" (sample of {len(sample):,} / {total_rows:,} rows)" if sample is not None else ""
+                print(f"\n📋 Checking table: {table_name}{label}")
+                checks = self._table_checks(table_name)
+                sample_checks = self._table_checks(table_name, sample=True) if sample is not None else None
+                for column in list(df.columns):
+                    dims = self.plan.dimensions_for(table_name, column, df[column].dtype)
+                    if not dims:
+                        continue  # loaded only for consistency rules
+                    
+                    with self.tracer.span('check_column', category='column', table=table_name, column=column):
+                        scan, ci = SCAN_FULL, None
+                        if sample is not None:
+                            valid_counts, ci, decided = self._estimate_column(sample_checks, dims, sample, column,
+                                                                              total_rows)
+                            scan = SCAN_SAMPLE
+                            if not decided:
+                                scan, ci = SCAN_ESCALATED, None
+                        if scan != SCAN_SAMPLE:
+                            if table_name in self._samples:
+                                df = self._load_full_table(table_name, tables)
+                            valid_counts = [checks[dim](df, column) if dim in dims else NOT_RUN for dim in DIMENSIONS]
+                        i = self.results.add_column(table_name, column, str(df[column].dtype), total_rows, valid_counts,
+                                                    scan=scan, sample_rows=len(sample) if scan == SCAN_SAMPLE else 0, ci=ci)
+                    
+                    # Nested record is only built for export (overall score excludes uniqueness)
+                    result = self.results.record(i)
+                    for sink in self.sinks:
+                        sink.write(result)
+                    if self.on_column is not None:
+                        self.on_column(result)
+                    
+                    status = "✅ PASS" if result["overall_passed"] else "❌ FAIL"
+                    overall = "n/a" if result["overall_score"] is None else f"{result['overall_score']}%"
+                    if scan == SCAN_SAMPLE and result["overall_score"] is not None:
+                        low, high = result["overall_ci"]
+                        overall = f"~{overall} [{low}, {high}]"
+                    elif scan == SCAN_ESCALATED:
+                        overall += " (interval straddled threshold, full scan)"
+                    uniqueness = result["uniqueness"]["score"]
+                    note = f" (Uniqueness: {uniqueness}% - informational)" if uniqueness is not None else ""
+                    print(f"   {status} {column}: {overall}{note}")
         
-        self.summary = {
-            "total_columns": total,
-            "passed_columns": passed,
-            "failed_columns": total - passed,
-            "overall_pass_rate": round(float(passed/total*100) if total > 0 else 0, 2),
-            "threshold": float(self.threshold),
-            "total_tables": len(tables),
-            "tables": tables,
-            "timestamp": datetime.now().isoformat()
-        }
+        if self.consistency is not None and self.consistency.rules:
+            print("\n🔗 Consistency rules:")
+            for rule in self.consistency.rule_report():
+                status = "✅" if rule["violations"] == 0 else "❌"
+                print(f"   {status} {rule['rule']}: {rule['violations']:,} violations in {rule['rows']:,} rows")
+    
+    def calculate_summary(self):
+        self.summary = self.results.summary()
+        if self.consistency is not None:
+            self.summary["consistency_rules"] = self.consistency.rule_report()
+            self.summary["consistency_rules_not_run"] = list(self.consistency.skipped)
+        drift = load_report(self.drift_report_path) if self.drift_report_path else None
+        if drift is not None:
+            self.summary["drift"] = summarize_drift(drift)
     
     def save_results(self):
-        os.makedirs("Great_Expectation", exist_ok=True)
         print("💾 Saving results...")
-        with open("Great_Expectation/dq_results_detailed.json", "w") as f:
-            json.dump(self.results, f, indent=2, cls=NumpyEncoder)
-        print(f"   ✓ dq_results_detailed.json ({len(self.results)} records)")
-        with open("Great_Expectation/dq_summary.json", "w") as f:
-            json.dump(self.summary, f, indent=2, cls=NumpyEncoder)
-        print(f"   ✓ dq_summary.json")
-        
-        csv_data = [{
-            "Table": r["table_name"],
-            "Column": r["column_name"],
-            "Data Type": r["data_type"],
-            "Total Rows": r["total_rows"],
-            "Overall Score": r["overall_score"],
-            "Status": "PASS" if r["overall_passed"] else "FAIL",
-            "Completeness Score": r["completeness"]["score"],
-            "Validity Score": r["validity"]["score"],
-            "Uniqueness Score": r["uniqueness"]["score"],
-            "Accuracy Score": r["accuracy"]["score"],
-            "Consistency Score": r["consistency"]["score"],
-            "Conformity Score": r["conformity"]["score"],
-            "Threshold": self.threshold,
-            "Note": "Overall score excludes Uniqueness"
-        } for r in self.results]
-        
-        pd.DataFrame(csv_data).to_csv("Great_Expectation/dq_results_summary.csv", index=False)
-        print(f"   ✓ dq_results_summary.csv\n")
+        with self.tracer.span('save'):
+            for sink in self.sinks:
+                print(f"   ✓ {sink.path.name} ({sink.count} records)")
+            with HistoryStore(self.history_path) as history:
+                self.summary["history_run_id"] = history.record_run(self.results)
+                self.summary["alerts"] = history.alerts(self.summary["history_run_id"])
+            print(f"   ✓ {os.path.basename(self.history_path)} (run #{self.summary['history_run_id']})")
+            with open(os.path.join(self.output_dir, "dq_summary.json"), "w") as f:
+                json.dump(self.summary, f, indent=2, cls=NumpyEncoder)
+            print(f"   ✓ dq_summary.json")
+            self.results.save(os.path.join(self.output_dir, RESULTS_TABLE_FILE))
+            print(f"   ✓ {RESULTS_TABLE_FILE} (columnar table for the dashboard)")
+            stats_path = self.stats_cache.save()
+            if stats_path is not None:
+                print(f"   ✓ {stats_path} ({self.stats_cache.hits} cached / {self.stats_cache.misses} computed column stats)")
+        trace_path, prof_path = self.tracer.write(os.path.join(self.output_dir, TRACE_FILE))
+        self.tracer.close()
+        print(f"   ✓ {trace_path.name} (load / check / save spans per table and column)")
+        if prof_path is not None:
+            print(f"   ✓ {prof_path.name} (cProfile of the slowest stage)")
+        print()
+        if self.summary["alerts"]:
+            print(f"🚨 {len(self.summary['alerts'])} score alerts vs previous runs:")
+            for alert in self.summary["alerts"]:
+                print(f"   ❌ [{alert['kind']}] {alert['table_name']}.{alert['column_name']}: {alert['message']}")
+            print()
 
-if __name__ == "__main__":
+def main(trace_memory=False, cprofile=False):
+    """Check the raw olist CSVs, save the results and print the pass rate and stage timings"""
     print("=" * 80)
     print("DATA QUALITY CHECK - RAW DATA (data/kaggle-raw)")
     print("=" * 80 + "\n")
     
-    checker = DataQualityChecker(data_dir="data/kaggle-raw")
+    checker = DataQualityChecker(data_dir="data/kaggle-raw",
+                                 tracer=Tracer(tracemalloc=trace_memory, cprofile=cprofile))
     checker.run_checks()
     
-    if checker.results:
+    if len(checker.results):
         checker.save_results()
         print("=" * 80)
         print(f"✅ COMPLETE! Pass Rate: {checker.summary['overall_pass_rate']}%")
         print(f"   Passed: {checker.summary['passed_columns']}/{checker.summary['total_columns']} columns")
         print(f"   Note: Overall score based on 5 dimensions (excludes Uniqueness)")
         print("=" * 80)
-        print("\n📁 Results saved in: Great_Expectation/")
-        print("\n🚀 Run dashboard: python data_quality_dashboard.py")
\ No newline at end of file
+        print(f"\n📁 Results saved in: {checker.output_dir}/")
+        print("\n⏱️  Stage timings:")
+        for line in checker.tracer.report():
+            print(f"   {line}")
+        print("\n🚀 Run dashboard: python data_quality_dashboard.py")
+    return checker
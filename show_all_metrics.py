@@ -2,9 +2,11 @@
 Display all available profiling metrics
 """
 import pandas as pd
+from profile_store import ProfileStore
 
-# Load the profiling results
-profile_df = pd.read_csv('data_profiling_results.csv')
+# Load the profiling results (typed Parquet artifact; CSV if it is missing)
+store = ProfileStore.open()
+profile_df = store.frame
 
 print("\n" + "="*100)
 print("ALL PROFILING METRICS CALCULATED")
@@ -13,7 +15,7 @@ print("="*100)
 print("\n📊 Complete List of Metrics (Column Names in CSV):")
 print("-"*100)
 
-metrics = list(profile_df.columns)
+metrics = store.metrics
 for i, metric in enumerate(metrics, 1):
     print(f"{i:2d}. {metric}")
 
@@ -98,17 +100,14 @@ print("EXAMPLE: Full Profile of a Single Column")
 print("="*100)
 
 # Show complete profile of one interesting column
-example = profile_df[
-    (profile_df['table_name'] == 'olist_order_items_dataset') & 
-    (profile_df['column_name'] == 'price')
-].iloc[0]
+example = store.get('olist_order_items_dataset', 'price')
 
 print(f"\n🔸 Table: {example['table_name']}")
 print(f"🔸 Column: {example['column_name']}\n")
 
 for metric in metrics[2:]:  # Skip table_name and column_name
     value = example[metric]
-    if pd.notna(value):
+    if isinstance(value, list) or pd.notna(value):
         if isinstance(value, float):
             print(f"   {metric:30s} : {value:.4f}")
         else:
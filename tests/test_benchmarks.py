@@ -0,0 +1,80 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.run_benchmarks import compare, main, run_benchmarks  # noqa: E402
+from benchmarks.synthetic_olist import KAGGLE_ROWS, generate_tables, rows_for, write_tables  # noqa: E402
+
+
+class SyntheticOlistTest(unittest.TestCase):
+    def test_deterministic_and_scaled(self):
+        first, second = generate_tables(0.01, seed=4), generate_tables(0.01, seed=4)
+        for name, df in first.items():
+            pd.testing.assert_frame_equal(df, second[name])
+            self.assertEqual(len(df), rows_for(name, 0.01))
+        self.assertFalse(first['olist_orders_dataset'].equals(generate_tables(0.01, seed=5)['olist_orders_dataset']))
+        self.assertEqual(rows_for('olist_geolocation_dataset', 10), KAGGLE_ROWS['olist_geolocation_dataset'] * 10)
+
+    def test_keys_and_formats(self):
+        tables = generate_tables(0.02)
+        orders, items = tables['olist_orders_dataset'], tables['olist_order_items_dataset']
+        reviews = tables['olist_order_reviews_dataset']
+        orphans = ~items['order_id'].isin(orders['order_id'])
+        self.assertGreater(len(items), 0)
+        self.assertLess(orphans.mean(), 0.01)
+        self.assertTrue(reviews['order_id'].isin(orders['order_id']).all())
+        self.assertTrue(orders['order_id'].str.fullmatch(r'[0-9a-f]{32}').all())
+        self.assertTrue(orders['order_purchase_timestamp'].str.fullmatch(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d').all())
+        self.assertTrue(orders['order_delivered_customer_date'].isna().any())
+        self.assertTrue(reviews['review_score'].between(1, 5).all())
+
+    def test_write_tables_reuses_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            files = write_tables(tmp, 0.001)
+            self.assertEqual(files, [f"{name}.csv" for name in KAGGLE_ROWS])
+            mtime = (Path(tmp) / files[0]).stat().st_mtime_ns
+            write_tables(tmp, 0.001)
+            self.assertEqual((Path(tmp) / files[0]).stat().st_mtime_ns, mtime)
+
+
+class BenchmarkRunTest(unittest.TestCase):
+    def test_tiny_run_writes_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "results.json"
+            code = main(["--scale", "0.002", "--repeat", "1", "--data-dir", str(Path(tmp) / "data"),
+                         "--output", str(out)])
+            self.assertEqual(code, 0)
+            report = json.loads(out.read_text())
+        cases = report['results']['0.002']
+        for name in ('dq.run_checks', 'dq.check_consistency', 'profile.calculate_column_profile',
+                     'profile.profile_all_datasets', 'report.html'):
+            self.assertIn(name, cases)
+            self.assertGreater(cases[name]['rows'], 0)
+            self.assertGreaterEqual(cases[name]['wall_median_s'], 0)
+        self.assertEqual(report['meta']['pandas'], pd.__version__)
+        self.assertEqual(report['meta']['tables']['0.002']['olist_orders_dataset'], 199)
+
+    def test_only_filters_cases(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run_benchmarks([0.001], repeat=2, only='dq.check_*', data_root=tmp, verbose=False)
+        cases = report['results']['0.001']
+        self.assertEqual(len(cases), 6)
+        self.assertTrue(all(c['repeat'] == 2 for c in cases.values()))
+
+    def test_compare_flags_slowdowns(self):
+        baseline = {'results': {'1': {'a': {'wall_median_s': 1.0}, 'b': {'wall_median_s': 2.0}}}}
+        current = {'results': {'1': {'a': {'wall_median_s': 1.05}, 'b': {'wall_median_s': 3.0},
+                                     'new': {'wall_median_s': 9.0}}}}
+        regressions = compare(baseline, current, tolerance=0.10)
+        self.assertEqual([r['case'] for r in regressions], ['b'])
+        self.assertEqual(regressions[0]['ratio'], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from column_stats import StatsCache, column_fingerprint, compute_stats, count_inliers, outlier_bounds  # noqa: E402
+from data_profiling_analysis import calculate_column_profile  # noqa: E402
+
+
+class ComputeStatsTest(unittest.TestCase):
+    def test_matches_pandas(self):
+        series = pd.Series(np.random.default_rng(0).normal(50, 10, 1001)).where(lambda s: s > 30)
+        stats = compute_stats(series)
+        clean = series.dropna()
+        self.assertEqual(stats["count"], len(clean))
+        self.assertAlmostEqual(stats["mean"], clean.mean())
+        self.assertAlmostEqual(stats["std"], clean.std())
+        for key, q in (("q25", 0.25), ("q50", 0.5), ("q75", 0.75), ("q99", 0.99)):
+            self.assertAlmostEqual(stats[key], clean.quantile(q))
+        self.assertAlmostEqual(stats["mad"], (clean - clean.median()).abs().median())
+
+    def test_empty_column(self):
+        stats = compute_stats(pd.Series([np.nan, np.nan]))
+        self.assertEqual(stats["count"], 0)
+        self.assertIsNone(stats["q50"])
+        self.assertIsNone(outlier_bounds(stats, "iqr"))
+
+
+class OutlierTest(unittest.TestCase):
+    def setUp(self):
+        self.series = pd.Series([10.0, 11, 12, 13, 14, 15, 1000, None])
+        self.stats = compute_stats(self.series)
+
+    def test_iqr_matches_legacy_rule(self):
+        q1, q3 = self.series.quantile(0.25), self.series.quantile(0.75)
+        legacy = int(((self.series >= q1 - 1.5 * (q3 - q1)) & (self.series <= q3 + 1.5 * (q3 - q1))).sum())
+        self.assertEqual(count_inliers(self.series, outlier_bounds(self.stats, "iqr")), legacy)
+
+    def test_methods(self):
+        self.assertEqual(count_inliers(self.series, outlier_bounds(self.stats, "mad")), 6)
+        # the outlier inflates the std, so a z-score rule keeps it at k=3
+        self.assertEqual(count_inliers(self.series, outlier_bounds(self.stats, "zscore")), 7)
+        with self.assertRaises(ValueError):
+            outlier_bounds(self.stats, "grubbs")
+
+
+class StatsCacheTest(unittest.TestCase):
+    def test_fingerprint_tracks_content_not_index(self):
+        a = pd.Series([1.0, 2.0, 3.0])
+        self.assertEqual(column_fingerprint(a), column_fingerprint(pd.Series([1.0, 2.0, 3.0], index=[7, 8, 9])))
+        self.assertNotEqual(column_fingerprint(a), column_fingerprint(pd.Series([3.0, 2.0, 1.0])))
+        self.assertNotEqual(column_fingerprint(a), column_fingerprint(pd.Series([1, 2, 3])))
+
+    def test_persisted_cache_is_shared(self):
+        df = pd.DataFrame({"price": [1.0, 2.0, 3.0, 4.0, 100.0]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "column_stats.json"
+            cache = StatsCache(path)
+            first = calculate_column_profile(df, "price", "olist_order_items", cache)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            cache.save()
+
+            reloaded = StatsCache(path)
+            stats = reloaded.get(df["price"])
+            self.assertEqual((reloaded.hits, reloaded.misses), (1, 0))
+            self.assertEqual(stats["q75"], first["q3_75"])
+
+    def test_profile_matches_pandas(self):
+        df = pd.DataFrame({"n": [1, 2, 2, 5, None]})
+        profile = calculate_column_profile(df, "n", "t")
+        clean = df["n"].dropna()
+        self.assertEqual(profile["median"], clean.median())
+        self.assertEqual(profile["q1_25"], clean.quantile(0.25))
+        self.assertAlmostEqual(profile["std_dev"], clean.std())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import dq  # noqa: E402
+
+# Wall-clock budgets (seconds), best of a few runs to ride out a busy machine
+HELP_BUDGET = 0.3
+# Import cost of the profiling / DQ modules on top of pandas, numpy, pyarrow and yaml
+METRICS_IMPORT_BUDGET = 0.3
+PLOTTING = ('matplotlib', 'seaborn', 'dash', 'plotly')
+
+
+def _python(code):
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    if out.returncode != 0:
+        raise AssertionError(out.stderr)
+    return out.stdout.strip()
+
+
+def _best_of(runs, fn):
+    return min(fn() for _ in range(runs))
+
+
+class ImportBudgetTest(unittest.TestCase):
+    def test_help_imports_no_data_stack(self):
+        loaded = _python(
+            "import contextlib, io, sys, dq\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    try:\n"
+            "        dq.main(['profile', '--help'])\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            "print(','.join(m for m in ('pandas', 'numpy', 'yaml', 'pyarrow') + %r if m in sys.modules))" % (PLOTTING,)
+        )
+        self.assertEqual(loaded, '')
+
+    def test_help_within_budget(self):
+        def run():
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(ROOT / 'dq.py'), '--help'], capture_output=True, check=True)
+            return time.perf_counter() - start
+        self.assertLess(_best_of(3, run), HELP_BUDGET)
+
+    def test_script_help_imports_no_data_stack(self):
+        loaded = _python(
+            "import contextlib, io, runpy, sys\n"
+            "sys.argv = ['run_dq_check.py', '--help']\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    try:\n"
+            "        runpy.run_path('run_dq_check.py', run_name='__main__')\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            "print(','.join(m for m in ('pandas', 'numpy', 'yaml', 'pyarrow') + %r if m in sys.modules))" % (PLOTTING,)
+        )
+        self.assertEqual(loaded, '')
+
+        def run():
+            start = time.perf_counter()
+            out = subprocess.run([sys.executable, str(ROOT / 'run_dq_check.py'), '--help'], capture_output=True, text=True, check=True)
+            self.assertIn('--trace-memory', out.stdout)
+            return time.perf_counter() - start
+        self.assertLess(_best_of(3, run), HELP_BUDGET)
+
+    def test_metrics_modules_skip_plotting_and_fit_budget(self):
+        def run():
+            out = _python(
+                "import sys, time\n"
+                "import pandas, numpy, pyarrow, yaml\n"
+                "start = time.perf_counter()\n"
+                "import data_profiling_analysis, run_dq_check\n"
+                "elapsed = time.perf_counter() - start\n"
+                "print(elapsed, ','.join(m for m in %r if m in sys.modules))" % (PLOTTING,)
+            )
+            elapsed, _, loaded = out.partition(' ')
+            self.assertEqual(loaded, '')
+            return float(elapsed)
+        self.assertLess(_best_of(3, run), METRICS_IMPORT_BUDGET)
+
+
+class CommandTest(unittest.TestCase):
+    def test_parser(self):
+        args = dq.build_parser().parse_args(['profile', '--metrics-only', '--workers', '0'])
+        self.assertTrue(args.metrics_only)
+        self.assertEqual((args.workers, args.approximate, args.cprofile), (0, 'off', False))
+        self.assertEqual(dq.build_parser().parse_args(['check', '--cprofile']).run, dq._check)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            dq.build_parser().parse_args([])
+
+    def test_report_without_artifacts(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()) as out:
+                    self.assertEqual(dq.main(['report']), 1)
+            finally:
+                os.chdir(cwd)
+        self.assertIn('run the profiler first', out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import dq_conformity  # noqa: E402
+from dq_conformity import ConformityRules  # noqa: E402
+
+
+class ConformityRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.rules = ConformityRules()
+
+    def test_rule_assignment(self):
+        cases = [
+            ("order_id", pd.Series(["a"]), "hex32_id"),
+            ("order_item_id", pd.Series([1]), "not_null"),
+            ("customer_zip_code_prefix", pd.Series([1001]), "zip_prefix"),
+            ("seller_state", pd.Series(["SP"]), "br_state"),
+            ("order_purchase_timestamp", pd.Series(["x"]), "iso_timestamp"),
+            ("order_approved_at", pd.Series(["x"]), "iso_timestamp"),
+            ("shipping_limit_date", pd.Series(["x"]), "iso_timestamp"),
+            ("geolocation_lat", pd.Series([1.0]), "latitude"),
+            ("geolocation_lng", pd.Series([1.0]), "longitude"),
+            ("product_category_name", pd.Series(["x"]), "not_null"),
+        ]
+        for column, series, rule in cases:
+            self.assertEqual(self.rules.rule_for(column, series), rule, column)
+
+    def test_counts(self):
+        ids = pd.Series(["3442f8959a84dea7ee197c632cb2df15", "3442F8959A84DEA7EE197C632CB2DF15", "abc", None])
+        self.assertEqual(self.rules.count("seller_id", ids), 1)
+        self.assertEqual(self.rules.count("customer_zip_code_prefix", pd.Series([1001, 13023, 123456, None])), 2)
+        self.assertEqual(self.rules.count("customer_zip_code_prefix", pd.Series(["01001", "1001", None])), 1)
+        self.assertEqual(self.rules.count("seller_state", pd.Series(["SP", "rj", "XX", None])), 2)
+        timestamps = pd.Series(["2017-10-02 10:56:33", "2017-02-30 10:00:00", "2017-10-02", "02/10/2017", None])
+        self.assertEqual(self.rules.count("order_purchase_timestamp", timestamps), 2)
+        self.assertEqual(self.rules.count("geolocation_lat", pd.Series([-23.5, 40.0, None])), 1)
+        self.assertEqual(self.rules.count("geolocation_lng", pd.Series([-46.6, 10.0])), 1)
+
+    def test_pandas_fallback_matches_arrow(self):
+        series = pd.Series(["3442f8959a84dea7ee197c632cb2df15", "zz", None, "2017-10-02 10:56:33"])
+        arrow = [dq_conformity._regex_mask(series, r).tolist() for r in ("hex32_id", "iso_timestamp")]
+        saved = dq_conformity.pc
+        dq_conformity.pc = None
+        try:
+            fallback = [dq_conformity._regex_mask(series, r).tolist() for r in ("hex32_id", "iso_timestamp")]
+        finally:
+            dq_conformity.pc = saved
+        self.assertEqual(arrow, fallback)
+
+    def test_config_assignments(self):
+        rules = ConformityRules.from_config({"conformity": {"assignments": [{"pattern": "code", "rule": "br_state"}]}})
+        self.assertEqual(rules.rule_for("code", pd.Series(["SP"])), "br_state")
+        self.assertEqual(rules.rule_for("order_id", pd.Series(["x"])), "not_null")
+        with self.assertRaises(ValueError):
+            ConformityRules([{"pattern": "*", "rule": "nope"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
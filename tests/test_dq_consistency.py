@@ -0,0 +1,232 @@
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dq_consistency import ConsistencyEngine, KeyIndex, parse_row_rule, required_columns  # noqa: E402
+from geo_centroid import GEO_COLUMNS  # noqa: E402
+from run_dq_check import DataQualityChecker  # noqa: E402
+
+
+def _tables():
+    return {
+        "olist_orders": pd.DataFrame({
+            "order_id": ["o1", "o2", "o3"],
+            "order_purchase_timestamp": ["2018-01-02 10:00:00", "2018-01-05 10:00:00", "2018-01-07 10:00:00"],
+            "order_delivered_customer_date": ["2018-01-10 10:00:00", "2018-01-01 10:00:00", None],
+        }),
+        "olist_order_items": pd.DataFrame({
+            "order_id": ["o1", "o1", "o9", None],
+            "price": [10.0, -1.0, 3.0, 4.0],
+        }),
+        "olist_order_payments": pd.DataFrame({"order_id": ["o2", "o3"]}),
+        "olist_customers": pd.DataFrame({"customer_zip_code_prefix": [1001, 1002, 99999]}),
+        "olist_geolocation": pd.DataFrame({"geolocation_zip_code_prefix": [1001, 1001, 1002]}),
+    }
+
+
+REFERENCES = [
+    {"child": "olist_order_items.order_id", "parent": "olist_orders.order_id"},
+    {"child": "olist_order_payments.order_id", "parent": "olist_orders.order_id"},
+    {"child": "olist_customers.customer_zip_code_prefix", "parent": "olist_geolocation.geolocation_zip_code_prefix"},
+    {"child": "olist_sellers.seller_id", "parent": "olist_orders.order_id"},
+]
+ROW_RULES = [
+    {"table": "olist_orders", "rule": "order_delivered_customer_date >= order_purchase_timestamp"},
+    {"table": "olist_order_items", "rule": "price >= 0"},
+]
+
+
+class KeyIndexTest(unittest.TestCase):
+    def test_numeric_and_string_keys(self):
+        index = KeyIndex.from_series(pd.Series([5, 3, 3, None]))
+        np.testing.assert_array_equal(index.keys, [3, 5])
+        found, present = index.contains(pd.Series(["3", "4", None]))
+        np.testing.assert_array_equal(found, [True, False, False])
+        np.testing.assert_array_equal(present, [True, True, False])
+
+        # fractional keys are not truncated onto integers on either side
+        index = KeyIndex.from_series(pd.Series([1.0, 2.5]))
+        np.testing.assert_array_equal(index.keys, [1])
+        found, present = index.contains(pd.Series([1.5, 1.0, 2.0, np.nan]))
+        np.testing.assert_array_equal(found, [False, True, False, False])
+        np.testing.assert_array_equal(present, [True, True, True, False])
+
+        index = KeyIndex.from_series(pd.Series(["b", "a", None]))
+        found, _ = index.contains(pd.Series(["a", "c"]))
+        np.testing.assert_array_equal(found, [True, False])
+
+    def test_parse_row_rule(self):
+        self.assertEqual(parse_row_rule("a >= b"), ("a", ">=", "b"))
+        self.assertEqual(parse_row_rule("price>0"), ("price", ">", "0"))
+        with self.assertRaises(ValueError):
+            parse_row_rule("a between b and c")
+
+
+class ConsistencyEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = ConsistencyEngine(_tables(), REFERENCES, ROW_RULES)
+
+    def test_referential_counts(self):
+        # o9 is an orphan; the null key is not a referential violation
+        self.assertEqual(self.engine.consistent_count("olist_order_items", "order_id"), 3)
+        self.assertEqual(self.engine.consistent_count("olist_order_payments", "order_id"), 2)
+        self.assertEqual(self.engine.consistent_count("olist_customers", "customer_zip_code_prefix"), 2)
+
+    def test_row_rules(self):
+        # o2 delivered before purchase; o3 not delivered yet (null -> not a violation)
+        self.assertEqual(self.engine.consistent_count("olist_orders", "order_delivered_customer_date"), 2)
+        self.assertEqual(self.engine.consistent_count("olist_order_items", "price"), 3)
+
+    def test_parent_index_built_once_and_shared(self):
+        self.engine.consistent_count("olist_order_items", "order_id")
+        index = self.engine.index("olist_orders", "order_id")
+        self.engine.consistent_count("olist_order_payments", "order_id")
+        self.assertIs(self.engine.index("olist_orders", "order_id"), index)
+
+    def test_missing_tables_skipped(self):
+        self.assertEqual(self.engine.skipped, ["olist_sellers.seller_id ⊂ olist_orders.order_id"])
+        self.assertFalse(self.engine.has_rules("olist_sellers", "seller_id"))
+
+    def test_rule_report(self):
+        self.assertEqual(self.engine.rule_report(), [])  # nothing evaluated yet
+        self.engine.consistent_count("olist_order_items", "order_id")
+        self.engine.consistent_count("olist_order_items", "price")
+        report = {r["rule"]: r["violations"] for r in self.engine.rule_report()}
+        self.assertEqual(report["olist_order_items.order_id ⊂ olist_orders.order_id"], 1)
+        self.assertEqual(report["olist_order_items: price >= 0"], 1)
+
+
+class LocationRuleTest(unittest.TestCase):
+    def setUp(self):
+        self.tables = {
+            "olist_geolocation": pd.DataFrame({
+                "geolocation_zip_code_prefix": [1001, 1001, 1001, 2002],
+                "geolocation_city": ["São Paulo", "sao paulo", "osasco", "rio de janeiro"],
+                "geolocation_state": ["SP", "SP", "SP", "RJ"],
+                "geolocation_lat": [-23.5, -23.5, -23.6, -22.9],
+                "geolocation_lng": [-46.6, -46.6, -46.7, -43.2],
+            }),
+            "olist_sellers": pd.DataFrame({
+                "seller_zip_code_prefix": [1001, 1001, 2002, 9999, None],
+                "seller_city": ["sao paulo", "osasco", "Rio de Janeiro ", "x", "y"],
+                "seller_state": ["SP", "RJ", "RJ", "SP", None],
+            }),
+        }
+        self.locations = [{"table": "olist_sellers", "zip": "seller_zip_code_prefix",
+                           "city": "seller_city", "state": "seller_state"}]
+
+    def test_city_and_state_match_the_zip_lookup(self):
+        engine = ConsistencyEngine(self.tables, locations=self.locations)
+        # osasco and the RJ state are not the zip's most frequent city / state;
+        # unknown or null zips are left to the referential rule
+        self.assertEqual(engine.consistent_count("olist_sellers", "seller_city"), 4)
+        self.assertEqual(engine.consistent_count("olist_sellers", "seller_state"), 4)
+        self.assertEqual(engine.consistent_count("olist_sellers", "seller_city",
+                                                 sample=self.tables["olist_sellers"].iloc[:2]), 1)
+        lookup = engine.zip_lookup()
+        engine.consistent_count("olist_sellers", "seller_state")
+        self.assertIs(engine.zip_lookup(), lookup)
+        self.assertEqual({r["rule"]: r["violations"] for r in engine.rule_report()}, {
+            "olist_sellers.seller_city = olist_geolocation city of seller_zip_code_prefix": 1,
+            "olist_sellers.seller_state = olist_geolocation state of seller_zip_code_prefix": 1,
+        })
+
+    def test_skipped_without_geolocation(self):
+        del self.tables["olist_geolocation"]
+        engine = ConsistencyEngine(self.tables, locations=self.locations)
+        self.assertFalse(engine.has_rules("olist_sellers", "seller_city"))
+        self.assertEqual(len(engine.skipped), 2)
+
+    def test_required_columns(self):
+        required = required_columns(locations=self.locations)
+        self.assertEqual(required["olist_sellers"], {"seller_zip_code_prefix", "seller_city", "seller_state"})
+        self.assertEqual(required["olist_geolocation"], set(GEO_COLUMNS))
+
+
+CHECKER_CONFIG = (
+    "threshold: 90\n"
+    "consistency:\n"
+    "  references:\n"
+    "    - {child: olist_order_items.order_id, parent: olist_orders.order_id}\n"
+    "    - {child: olist_customers.customer_zip_code_prefix, "
+    "parent: olist_geolocation.geolocation_zip_code_prefix}\n"
+)
+ZIP_RULE = "olist_customers.customer_zip_code_prefix ⊂ olist_geolocation.geolocation_zip_code_prefix"
+
+
+class CheckerConsistencyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "dq_config.yml").write_text(CHECKER_CONFIG)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _check(self, name, tables):
+        data_dir = self.root / name
+        data_dir.mkdir()
+        for table, df in tables.items():
+            df.to_csv(data_dir / f"{table}_dataset.csv", index=False)
+        checker = DataQualityChecker(config_path=str(self.root / "dq_config.yml"), data_dir=str(data_dir),
+                                     output_dir=str(self.root / name / "out"), stats_cache_path=None,
+                                     drift_report_path=None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            checker.run_checks()
+            checker.calculate_summary()
+        records = {(r["table_name"], r["column_name"]): r for r in checker.results.records()}
+        return checker, records
+
+    def test_checker_scores_consistency_from_rules(self):
+        checker, records = self._check("raw", _tables())
+        self.assertEqual(records[("olist_order_items", "order_id")]["consistency"]["valid_records"], 3)
+        self.assertEqual(records[("olist_customers", "customer_zip_code_prefix")]["consistency"]["valid_records"], 2)
+        # no rules -> non-null baseline
+        self.assertEqual(records[("olist_order_items", "price")]["consistency"]["valid_records"], 4)
+        self.assertEqual(len(checker.summary["consistency_rules"]), 2)
+        self.assertEqual(checker.summary["consistency_rules_not_run"], [])
+
+    def test_zip_references_use_each_runs_geolocation(self):
+        self._check("first", _tables())
+        other = _tables()
+        other["olist_customers"] = pd.DataFrame({"customer_zip_code_prefix": [5555, 5555, 1001]})
+        other["olist_geolocation"] = pd.DataFrame({"geolocation_zip_code_prefix": [5555, 6666]})
+        _, records = self._check("second", other)
+        # 1001 is only in the first run's geolocation table
+        self.assertEqual(records[("olist_customers", "customer_zip_code_prefix")]["consistency"]["valid_records"], 2)
+
+    def test_zip_references_not_run_without_geolocation(self):
+        tables = _tables()
+        del tables["olist_geolocation"]
+        checker, records = self._check("no_geo", tables)
+        self.assertEqual(checker.summary["consistency_rules_not_run"], [ZIP_RULE])
+        self.assertEqual([r["rule"] for r in checker.summary["consistency_rules"]],
+                         ["olist_order_items.order_id ⊂ olist_orders.order_id"])
+        # no rule ran on the column -> non-null baseline
+        self.assertEqual(records[("olist_customers", "customer_zip_code_prefix")]["consistency"]["valid_records"], 3)
+
+    def test_location_rules_load_geolocation_and_score_cities(self):
+        (self.root / "dq_config.yml").write_text(
+            CHECKER_CONFIG + "  locations:\n"
+            "    - {table: olist_customers, zip: customer_zip_code_prefix, city: customer_city}\n")
+        tables = _tables()
+        tables["olist_customers"] = tables["olist_customers"].assign(customer_city=["sao paulo", "rio", "x"])
+        tables["olist_geolocation"] = tables["olist_geolocation"].assign(
+            geolocation_city=["São Paulo", "sao paulo", "niteroi"], geolocation_state="SP",
+            geolocation_lat=-23.5, geolocation_lng=-46.6)
+        checker, records = self._check("locations", tables)
+        self.assertEqual(records[("olist_customers", "customer_city")]["consistency"]["valid_records"], 2)
+        self.assertIn("olist_customers.customer_city = olist_geolocation city of customer_zip_code_prefix",
+                      [r["rule"] for r in checker.summary["consistency_rules"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
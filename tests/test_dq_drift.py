@@ -0,0 +1,88 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dq_drift import SketchStore, column_sketch, compare_columns, detect_drift, schema_changes  # noqa: E402
+from run_dq_check import DataQualityChecker  # noqa: E402
+
+
+def _load(seed, price_shift=0.0, states=("SP", "RJ", "MG"), weights=(0.6, 0.3, 0.1)):
+    rng = np.random.default_rng(seed)
+    n = 5_000
+    return {
+        "olist_order_items": pd.DataFrame({
+            "price": rng.lognormal(4 + price_shift, 0.5, n),
+            "seller_state": rng.choice(states, n, p=weights),
+        })
+    }
+
+
+class SketchTest(unittest.TestCase):
+    def test_sketches_are_compact(self):
+        tables = _load(0)["olist_order_items"]
+        numeric = column_sketch(tables["price"], {"percent_null": 0.0, "distinct_count": 5000})
+        self.assertEqual(len(numeric["quantiles"]), 101)
+        self.assertEqual(numeric["distinct_count"], 5000)
+        categorical = column_sketch(tables["seller_state"])
+        self.assertEqual(set(categorical["top_k"]), {"SP", "RJ", "MG"})
+        self.assertAlmostEqual(sum(categorical["top_k"].values()) + categorical["other"], 1.0)
+
+    def test_same_distribution_is_stable(self):
+        a, b = _load(0)["olist_order_items"], _load(1)["olist_order_items"]
+        for column in ("price", "seller_state"):
+            result = compare_columns(column_sketch(a[column]), column_sketch(b[column]))
+            self.assertEqual(result["status"], "stable", column)
+            self.assertLess(result["psi"], 0.1)
+
+    def test_shift_is_detected(self):
+        a = _load(0)["olist_order_items"]
+        b = _load(1, price_shift=0.5, weights=(0.2, 0.3, 0.5))["olist_order_items"]
+        price = compare_columns(column_sketch(a["price"]), column_sketch(b["price"]))
+        self.assertEqual(price["status"], "major")
+        self.assertGreater(price["ks"], 0.3)
+        state = compare_columns(column_sketch(a["seller_state"]), column_sketch(b["seller_state"]))
+        self.assertEqual(state["status"], "major")
+        self.assertIsNone(state["ks"])
+        self.assertTrue(0 < state["js"] <= 1)
+
+    def test_schema_changes(self):
+        before = {"t": {"a": {"dtype": "int64"}, "b": {"dtype": "object"}}, "gone": {}}
+        after = {"t": {"a": {"dtype": "float64"}, "c": {"dtype": "object"}}, "new": {}}
+        changes = {(c["table_name"], c["column_name"], c["change"]) for c in schema_changes(before, after)}
+        self.assertEqual(changes, {
+            ("gone", None, "table_removed"), ("new", None, "table_added"),
+            ("t", "b", "column_removed"), ("t", "c", "column_added"), ("t", "a", "dtype_changed"),
+        })
+
+
+class DetectDriftTest(unittest.TestCase):
+    def test_compares_against_stored_sketches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = detect_drift(_load(0), directory=tmp, load_id="20261001T060000")
+            self.assertIsNone(first["previous_load_id"])
+            second = detect_drift(_load(1, price_shift=0.5), directory=tmp, load_id="20261002T060000")
+            self.assertEqual(second["previous_load_id"], "20261001T060000")
+            status = {c["column_name"]: c["status"] for c in second["columns"]}
+            self.assertEqual(status, {"price": "major", "seller_state": "stable"})
+            self.assertEqual(SketchStore(tmp).loads(), ["20261001T060000", "20261002T060000"])
+            self.assertTrue((Path(tmp) / "drift_report.json").exists())
+
+            # the DQ summary picks up the latest report
+            root = Path(tmp)
+            (root / "raw").mkdir()
+            _load(2)["olist_order_items"].to_csv(root / "raw" / "olist_order_items_dataset.csv", index=False)
+            (root / "dq_config.yml").write_text("threshold: 90\n")
+            checker = DataQualityChecker(config_path=str(root / "dq_config.yml"), data_dir=str(root / "raw"),
+                                         output_dir=str(root / "out"), drift_report_path=root / "drift_report.json")
+            checker.run_checks()
+            self.assertEqual(checker.summary["drift"]["major"], ["olist_order_items.price"])
+
+
+if __name__ == "__main__":
+    unittest.main()
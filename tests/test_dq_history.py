@@ -0,0 +1,79 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dq_history import HistoryStore  # noqa: E402
+from dq_results import NOT_RUN, ResultTable  # noqa: E402
+
+
+def _run(day, scores):
+    """ResultTable with completeness-only scores (out of 100 rows) per (table, column)."""
+    table = ResultTable(90, run_timestamp=f"2026-10-{day:02d}T06:00:00")
+    for (table_name, column), valid in scores.items():
+        table.add_column(table_name, column, "float64", 100, [valid] + [NOT_RUN] * 5)
+    return table
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(Path(self.tmp.name) / "history.sqlite")
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_trend_returns_last_n_runs_oldest_first(self):
+        for day, valid in enumerate([100, 99, 98, 97], start=1):
+            self.store.record_run(_run(day, {("orders", "order_id"): valid, ("orders", "price"): 50}))
+        trend = self.store.trend("orders", "order_id", last=3)
+        self.assertEqual(trend["score"].tolist(), [99.0, 98.0, 97.0])
+        self.assertEqual(trend["run_at"].iloc[-1], "2026-10-04T06:00:00")
+        self.assertFalse(self.store.trend("orders", "price")["passed"].any())
+        self.assertTrue(np.isnan(self.store.trend("orders", "price", dimension="accuracy")["score"]).all())
+        runs = self.store.runs()
+        self.assertEqual(runs["run_date"].tolist(), ["2026-10-01", "2026-10-02", "2026-10-03", "2026-10-04"])
+        self.assertEqual(runs["pass_rate"].iloc[0], 50.0)
+        with self.assertRaises(ValueError):
+            self.store.trend("orders", "order_id", dimension="freshness")
+
+    def test_alerts(self):
+        history = [
+            {("t", "stable"): 99, ("t", "regresses"): 95, ("t", "drops"): 80, ("t", "drifts"): 100},
+            {("t", "stable"): 99, ("t", "regresses"): 95, ("t", "drops"): 80, ("t", "drifts"): 98},
+            {("t", "stable"): 99, ("t", "regresses"): 95, ("t", "drops"): 80, ("t", "drifts"): 96},
+            {("t", "stable"): 99, ("t", "regresses"): 89, ("t", "drops"): 70, ("t", "drifts"): 93},
+        ]
+        for day, scores in enumerate(history, start=1):
+            run_id = self.store.record_run(_run(day, scores))
+        self.assertEqual(self.store.alerts(window=1), self.store.alerts(run_id, window=1))
+        kinds = {a["column_name"]: a["kind"] for a in self.store.alerts(run_id, drop=4)}
+        # drifts falls < 4 points per run but 5 points below its 3-run baseline
+        self.assertEqual(kinds, {"regresses": "regression", "drops": "drop", "drifts": "drift"})
+
+    def test_alerts_baseline_skips_other_feeds_runs(self):
+        self.store.record_run(_run(1, {("orders", "order_id"): 100}))
+        self.store.record_run(_run(2, {("sellers", "seller_id"): 100}))
+        run_id = self.store.record_run(_run(3, {("orders", "order_id"): 50}))
+        self.store.record_run(_run(4, {("sellers", "seller_id"): 99}))
+        alerts = self.store.alerts(run_id)
+        self.assertEqual([(a["column_name"], a["kind"], a["previous"]) for a in alerts],
+                         [("order_id", "regression", 100.0)])
+        # columns without a score in between are skipped, not treated as the previous run
+        self.store.record_run(_run(5, {("orders", "order_id"): NOT_RUN}))
+        run_id = self.store.record_run(_run(6, {("orders", "order_id"): 40}))
+        self.assertEqual([(a["kind"], a["previous"]) for a in self.store.alerts(run_id)], [("drop", 50.0)])
+
+    def test_first_run_has_no_alerts(self):
+        self.assertEqual(self.store.alerts(), [])
+        run_id = self.store.record_run(_run(1, {("t", "c"): 10}))
+        self.assertEqual(self.store.alerts(run_id), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
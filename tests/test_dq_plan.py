@@ -0,0 +1,101 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dq_plan import ExecutionPlan  # noqa: E402
+from dq_results import NOT_RUN, ResultTable  # noqa: E402
+from run_dq_check import DataQualityChecker  # noqa: E402
+
+CONFIG = """
+threshold: 90
+checks:
+  completeness: {enabled: true}
+  uniqueness: {enabled: false}
+  accuracy: {enabled: true, include: ["olist_order_items.*"], dtypes: [numeric]}
+  validity: {enabled: true, include: ["olist_orders.*", "olist_order_items.*"], exclude: ["*.*_id"]}
+  consistency: {enabled: false}
+  conformity: {enabled: true, include: ["olist_orders.*_timestamp"]}
+  timeliness: {enabled: true}
+"""
+
+
+class ExecutionPlanTest(unittest.TestCase):
+    def setUp(self):
+        import yaml
+        self.plan = ExecutionPlan.from_config(yaml.safe_load(CONFIG))
+
+    def test_dimensions_per_column(self):
+        self.assertEqual(self.plan.dimensions_for("olist_order_items", "price", np.dtype("float64")),
+                         ["completeness", "validity", "accuracy"])
+        self.assertEqual(self.plan.dimensions_for("olist_order_items", "order_id", np.dtype("O")),
+                         ["completeness"])
+        self.assertEqual(self.plan.dimensions_for("olist_orders", "order_purchase_timestamp", np.dtype("O")),
+                         ["completeness", "validity", "conformity"])
+        self.assertNotIn("uniqueness", self.plan.enabled_dimensions)
+        self.assertEqual(self.plan.unsupported, ["timeliness"])
+
+    def test_missing_config_runs_everything(self):
+        plan = ExecutionPlan.from_config({"threshold": 98})
+        self.assertEqual(len(plan.dimensions_for("t", "c", np.dtype("O"))), 6)
+
+    def test_columns_to_load(self):
+        plan = ExecutionPlan.from_config({"checks": {d: {"include": ["olist_orders.order_*"]} for d in
+                                                     ("completeness", "validity", "uniqueness", "accuracy",
+                                                      "consistency", "conformity")}})
+        self.assertEqual(plan.columns_to_load("olist_orders", ["order_id", "customer_id"]), ["order_id"])
+        self.assertEqual(plan.columns_to_load("olist_orders", ["order_id", "customer_id"], {"customer_id"}),
+                         ["order_id", "customer_id"])
+        self.assertEqual(plan.columns_to_load("olist_sellers", ["seller_id"]), [])
+
+
+class PlannedCheckerTest(unittest.TestCase):
+    def test_disabled_and_untargeted_checks_never_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            data_dir = root / "raw"
+            data_dir.mkdir()
+            pd.DataFrame({"order_id": ["a", "b"], "price": [1.0, 2.0]}).to_csv(
+                data_dir / "olist_order_items_dataset.csv", index=False)
+            pd.DataFrame({"order_id": ["a", "b"], "order_purchase_timestamp": ["2018-01-01", None]}).to_csv(
+                data_dir / "olist_orders_dataset.csv", index=False)
+            config = root / "dq_config.yml"
+            config.write_text(CONFIG)
+            checker = DataQualityChecker(config_path=str(config), data_dir=str(data_dir),
+                                         output_dir=str(root / "out"))
+
+            def fail(*args, **kwargs):
+                raise AssertionError("disabled check touched the data")
+            checker.check_uniqueness = fail
+            checker.check_consistency = fail
+            checker.run_checks()
+
+            records = {(r["table_name"], r["column_name"]): r for r in checker.results.records()}
+            price = records[("olist_order_items", "price")]
+            self.assertIsNone(price["uniqueness"]["score"])
+            self.assertEqual(price["accuracy"]["valid_records"], 2)
+            self.assertIsNone(records[("olist_orders", "order_id")]["conformity"]["score"])
+            self.assertEqual(records[("olist_orders", "order_purchase_timestamp")]["overall_score"],
+                             round((50 + 50 + 50) / 3, 2))
+
+
+class NotRunScoresTest(unittest.TestCase):
+    def test_overall_ignores_not_run(self):
+        table = ResultTable(threshold=90)
+        table.add_column("t", "a", "object", 10, [10, 5, NOT_RUN, NOT_RUN, NOT_RUN, NOT_RUN])
+        table.add_column("t", "b", "object", 10, [NOT_RUN, NOT_RUN, 3, NOT_RUN, NOT_RUN, NOT_RUN])
+        self.assertEqual(table.overall_scores[0], 75.0)
+        self.assertTrue(np.isnan(table.overall_scores[1]))
+        np.testing.assert_array_equal(table.passed, [False, True])
+        summary = table.summary()
+        self.assertEqual(summary["tables"]["t"]["average_score"], 75.0)
+        self.assertIsNone(table.record(1)["overall_score"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dq_results import CSV_COLUMNS, DIMENSIONS, NOT_RUN, SCAN_SAMPLE, ResultTable  # noqa: E402
+
+
+def _legacy_record(table, column, dtype, total, valid, threshold):
+    """Score arithmetic of the original per-column dict results."""
+    labels = ['non-null', 'valid', 'unique', 'accurate', 'consistent', 'conform']
+    result = {"table_name": table, "column_name": column, "data_type": dtype, "total_rows": total}
+    for dim, v, label in zip(DIMENSIONS, valid, labels):
+        result[dim] = {
+            "score": round(float((v / total * 100) if total > 0 else 0), 2),
+            "valid_records": v,
+            "invalid_records": total - v,
+            "details": f"{v}/{total} {label}",
+        }
+    overall = round(float(sum(result[d]["score"] for d in DIMENSIONS if d != 'uniqueness') / 5), 2)
+    result["overall_score"] = overall
+    result["overall_passed"] = bool(overall >= threshold)
+    return result
+
+
+class ResultTableTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.rows = []
+        self.table = ResultTable(threshold=95, capacity=2)  # forces growth
+        for t in range(3):
+            for c in range(5):
+                total = int(rng.integers(0, 1000)) if c else 0
+                valid = [int(rng.integers(0, total + 1)) for _ in DIMENSIONS]
+                row = (f"t{t}", f"c{c}", "object", total, valid)
+                self.rows.append(row)
+                self.table.add_column(*row)
+
+    def test_records_match_legacy_dicts(self):
+        for i, row in enumerate(self.rows):
+            expected = _legacy_record(*row, threshold=95)
+            record = self.table.record(i)
+            record.pop("timestamp")
+            self.assertEqual(record.pop("scan"), "full")
+            self.assertEqual(record, expected)
+
+    def test_vectorized_scores_match_records(self):
+        frame = self.table.to_frame()
+        self.assertEqual(list(frame.columns), CSV_COLUMNS)
+        for i, record in enumerate(self.table.records()):
+            self.assertEqual(frame.loc[i, "Overall Score"], record["overall_score"])
+            self.assertEqual(frame.loc[i, "Status"], "PASS" if record["overall_passed"] else "FAIL")
+            self.assertEqual(frame.loc[i, "Accuracy Score"], record["accuracy"]["score"])
+
+    def test_summary(self):
+        summary = self.table.summary()
+        self.assertEqual(summary["total_columns"], 15)
+        self.assertEqual(summary["total_tables"], 3)
+        records = [r for r in self.table.records() if r["table_name"] == "t1"]
+        expected = round(sum(r["overall_score"] for r in records) / len(records), 2)
+        self.assertAlmostEqual(summary["tables"]["t1"]["average_score"], expected)
+        self.assertEqual(summary["passed_columns"], sum(r["overall_passed"] for r in self.table.records()))
+
+    def test_long_format(self):
+        long = self.table.dimension_rows()
+        self.assertEqual(len(long), 15 * len(DIMENSIONS))
+        self.assertEqual(int(long["valid_records"].sum()), int(self.table.valid.sum()))
+
+    def test_save_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.table.save(Path(tmp) / "dq_results.npz")
+            loaded = ResultTable.load(path)
+        self.assertEqual(loaded.summary(), self.table.summary())
+        self.assertTrue(loaded.to_frame().equals(self.table.to_frame()))
+
+    def test_sampled_record_ci_matches_batch(self):
+        rng = np.random.default_rng(3)
+        for c in range(4):
+            valid = [int(v) for v in rng.integers(0, 500, len(DIMENSIONS))]
+            if c % 2:
+                valid[DIMENSIONS.index('accuracy')] = NOT_RUN
+            low = rng.uniform(50, 90, len(DIMENSIONS))
+            ci = np.stack([low, low + 5], axis=1)
+            ci[np.asarray(valid) == NOT_RUN] = np.nan
+            self.table.add_column("sampled", f"s{c}", "int64", 500, valid,
+                                  scan=SCAN_SAMPLE, sample_rows=200, ci=ci)
+        overall_ci = self.table.overall_ci
+        for i, record in enumerate(self.table.records()):
+            if record["scan"] == "sample":
+                self.assertEqual(record["overall_ci"], overall_ci[i].tolist())
+            else:
+                self.assertNotIn("overall_ci", record)
+                self.assertTrue(np.isnan(overall_ci[i]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
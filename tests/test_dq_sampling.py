@@ -0,0 +1,157 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import dq_sampling  # noqa: E402
+from dq_sampling import read_csv_sample, sample_positions, wilson_interval, z_score  # noqa: E402
+from run_dq_check import DataQualityChecker  # noqa: E402
+
+
+class IntervalTest(unittest.TestCase):
+    def test_interval_brackets_estimate_and_shrinks(self):
+        z = z_score(0.95)
+        small = wilson_interval([90], 100, 1_000_000, z)[0]
+        large = wilson_interval([9000], 10_000, 1_000_000, z)[0]
+        self.assertTrue(small[0] < 90 < small[1])
+        self.assertTrue(large[0] < 90 < large[1])
+        self.assertLess(large[1] - large[0], small[1] - small[0])
+
+    def test_all_valid_sample_is_not_a_point(self):
+        low, high = wilson_interval([500], 500, 1_000_000, z_score(0.95))[0]
+        self.assertLess(low, 100)
+        self.assertEqual(high, 100)
+
+    def test_census_is_exact(self):
+        np.testing.assert_array_equal(wilson_interval([40], 50, 50, 1.96), [[80.0, 80.0]])
+
+
+class SamplePositionsTest(unittest.TestCase):
+    def test_uniform(self):
+        df = pd.DataFrame({"x": range(1000)})
+        pos = sample_positions(df, 100, seed=1)
+        self.assertEqual(len(np.unique(pos)), 100)
+        self.assertTrue(np.all(np.diff(pos) > 0))
+
+    def test_stratified_proportional(self):
+        df = pd.DataFrame({"status": ["delivered"] * 900 + ["canceled"] * 90 + [None] * 10})
+        pos = sample_positions(df, 100, stratify_by="status", seed=1)
+        self.assertEqual(len(np.unique(pos)), 100)
+        counts = df.iloc[pos]["status"].fillna("null").value_counts()
+        self.assertEqual(counts["delivered"], 90)
+        self.assertEqual(counts["canceled"], 9)
+        self.assertEqual(counts["null"], 1)
+
+
+@unittest.skipIf(dq_sampling.pa is None, "pyarrow not installed")
+class ReadCsvSampleTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "t.csv"
+        n = 50_000
+        pd.DataFrame({
+            "id": np.arange(n),
+            "status": np.where(np.arange(n) % 10 == 0, "canceled", np.where(np.arange(n) % 100 == 1, None, "ok")),
+            "note": np.where(np.arange(n) % 3 == 0, 'said "hi",\nthen left', None),
+        }).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_small_table_is_read_whole(self):
+        df, total = read_csv_sample(self.path, ["id", "note"], 1_000, min_rows=50_000)
+        self.assertEqual(total, 50_000)
+        pd.testing.assert_frame_equal(df, pd.read_csv(self.path, usecols=["id", "note"]))
+
+    def test_stratified_sample_in_file_order(self):
+        df, total = read_csv_sample(self.path, ["id", "note"], 1_000, stratify_by="status", seed=3)
+        self.assertEqual((total, len(df), list(df.columns)), (50_000, 1_000, ["id", "note"]))
+        self.assertTrue(df["id"].is_monotonic_increasing)
+        status = np.where(df["id"] % 10 == 0, "canceled", np.where(df["id"] % 100 == 1, "null", "ok"))
+        self.assertEqual(dict(zip(*np.unique(status, return_counts=True))), {"canceled": 100, "null": 10, "ok": 890})
+        self.assertEqual(df.loc[df["id"] % 3 == 0, "note"].unique().tolist(), ['said "hi",\nthen left'])
+        again, _ = read_csv_sample(self.path, ["id", "note"], 1_000, stratify_by="status", seed=3)
+        pd.testing.assert_frame_equal(df, again)
+
+
+class SampledCheckerTest(unittest.TestCase):
+    def test_sample_decides_clear_columns_and_escalates_borderline(self):
+        rng = np.random.default_rng(0)
+        n = 60_000
+        borderline = np.where(rng.random(n) < 0.90, 1.0, np.nan)  # ~90% complete, threshold 90
+        df = pd.DataFrame({
+            "order_id": [f"o{i}" for i in range(n)],
+            "half_null": np.where(np.arange(n) % 2 == 0, "x", None),
+            "borderline": borderline,
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            data_dir = root / "raw"
+            data_dir.mkdir()
+            df.to_csv(data_dir / "olist_orders_dataset.csv", index=False)
+            config = root / "dq_config.yml"
+            config.write_text("threshold: 90\nchecks:\n  completeness: {enabled: true}\n"
+                              "  validity: {enabled: false}\n  accuracy: {enabled: false}\n"
+                              "  consistency: {enabled: false}\n  conformity: {enabled: false}\n")
+            checker = DataQualityChecker(config_path=str(config), data_dir=str(data_dir),
+                                         output_dir=str(root / "out"),
+                                         sampling={"enabled": True, "min_rows": 10_000, "sample_size": 2_000})
+            checker.run_checks()
+
+        records = {r["column_name"]: r for r in checker.results.records()}
+        order_id = records["order_id"]
+        self.assertEqual(order_id["scan"], "sample")
+        self.assertEqual(order_id["sample_rows"], 2_000)
+        self.assertTrue(order_id["overall_passed"])
+        self.assertGreaterEqual(order_id["overall_ci"][0], 90)
+
+        half = records["half_null"]
+        self.assertEqual(half["scan"], "sample")
+        self.assertFalse(half["overall_passed"])
+        low, high = half["overall_ci"]
+        self.assertTrue(low <= 50 <= high)
+
+        exact = round(float(np.isfinite(borderline).mean() * 100), 2)
+        self.assertEqual(records["borderline"]["scan"], "escalated")
+        self.assertEqual(records["borderline"]["completeness"]["score"], exact)
+        self.assertEqual(checker.summary["escalated_columns"], 1)
+        self.assertEqual(checker.summary["sampled_columns"], 2)
+
+    @unittest.skipIf(dq_sampling.pa is None, "pyarrow not installed")
+    def test_large_tables_load_only_the_sample(self):
+        n = 60_000
+        orders = pd.DataFrame({"order_id": [f"o{i}" for i in range(n)], "status": "delivered"})
+        items = pd.DataFrame({"order_id": [f"o{i}" for i in range(0, n, 100)] + ["missing"]})
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            data_dir = root / "raw"
+            data_dir.mkdir()
+            orders.to_csv(data_dir / "olist_orders_dataset.csv", index=False)
+            items.to_csv(data_dir / "olist_order_items_dataset.csv", index=False)
+            config = root / "dq_config.yml"
+            config.write_text("threshold: 90\nconsistency:\n  references:\n"
+                              "    - {child: olist_order_items.order_id, parent: olist_orders.order_id}\n")
+            checker = DataQualityChecker(config_path=str(config), data_dir=str(data_dir),
+                                         output_dir=str(root / "out"), stats_cache_path=None,
+                                         drift_report_path=None,
+                                         sampling={"enabled": True, "min_rows": 10_000, "sample_size": 2_000})
+            tables = checker.load_all_tables()
+            self.assertEqual(len(tables["olist_orders"]), 2_000)
+            checker.check_loaded_tables(tables)
+
+        records = {(r["table_name"], r["column_name"]): r for r in checker.results.records()}
+        # nothing escalated: the orders table was never read in full ...
+        self.assertIn("olist_orders", checker._samples)
+        self.assertEqual(records[("olist_orders", "order_id")]["total_rows"], n)
+        self.assertEqual(records[("olist_orders", "order_id")]["scan"], "sample")
+        # ... but the parent key index still covers every order id
+        self.assertEqual(records[("olist_order_items", "order_id")]["consistency"]["valid_records"], len(items) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
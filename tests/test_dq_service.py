@@ -0,0 +1,148 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dq_drift import DRIFT_DIR, REPORT_FILE as DRIFT_REPORT_FILE  # noqa: E402
+from dq_service import STAGES, DQService, QueueFull, make_server  # noqa: E402
+
+
+class DQServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.data_dir = root / "raw"
+        self.data_dir.mkdir()
+        pd.DataFrame({"order_id": ["a", "b", None], "price": [1.0, 2.0, 3.0]}).to_csv(
+            self.data_dir / "olist_orders_dataset.csv", index=False)
+        pd.DataFrame({"seller_id": ["x", "y"]}).to_csv(self.data_dir / "olist_sellers_dataset.csv", index=False)
+        self.config = root / "dq_config.yml"
+        self.config.write_text("threshold: 90\nresult_formats: [jsonl]\n")
+        self.service = DQService(root / "service", workers=1, max_queued=3, default_config=str(self.config))
+
+    def tearDown(self):
+        self.service.stop()
+        self.tmp.cleanup()
+
+    def test_priority_order_timings_and_shared_history(self):
+        low = self.service.submit(str(self.data_dir / "olist_orders_dataset.csv"))
+        high = self.service.submit(str(self.data_dir / "olist_sellers_dataset.csv"), priority=5)
+        whole_dir = self.service.submit(str(self.data_dir))
+        with self.assertRaises(QueueFull):
+            self.service.submit(str(self.data_dir))
+        self.service.start()
+        self.service.stop()
+
+        for job in (low, high, whole_dir):
+            self.assertEqual(job.status, "succeeded", job.error)
+            self.assertEqual(tuple(job.timings), STAGES)
+        self.assertEqual(len(low.columns), 2)
+        self.assertEqual(len(whole_dir.columns), 3)
+        # single worker: the high-priority job ran first
+        self.assertEqual((high.summary["history_run_id"], low.summary["history_run_id"]), (1, 2))
+        self.assertTrue((self.service.root / "jobs" / low.job_id / "dq_results_detailed.jsonl").exists())
+
+    def test_failed_job_is_reported(self):
+        bad = Path(self.tmp.name) / "olist_empty_dataset.csv"
+        bad.write_text("")
+        job = self.service.run_job(self.service.submit(str(bad), config=str(self.config)))
+        self.assertEqual(job.status, "failed")
+        self.assertIn("No checkable CSV data", job.error)
+        with self.assertRaises(ValueError):
+            self.service.submit(str(self.data_dir / "missing.csv"))
+
+    def test_http_api(self):
+        self.service.start()
+        server = make_server(self.service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            request = urllib.request.Request(f"{base}/jobs", method="POST",
+                                             data=json.dumps({"path": str(self.data_dir)}).encode())
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(response.status, 202)
+                job_id = json.load(response)["job_id"]
+            self.service._queue.join()
+            with urllib.request.urlopen(f"{base}/jobs/{job_id}/results") as response:
+                job = json.load(response)
+            self.assertEqual(job["status"], "succeeded")
+            self.assertEqual(len(job["results"]), 3)
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(urllib.request.Request(f"{base}/jobs", method="POST", data=b"{}"))
+            self.assertEqual(error.exception.code, 400)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_concurrent_jobs_check_zips_against_their_own_feed(self):
+        root = Path(self.tmp.name)
+        config = root / "zip_config.yml"
+        config.write_text(
+            "threshold: 90\nresult_formats: [jsonl]\nconsistency:\n  references:\n"
+            "    - {child: olist_customers.customer_zip_code_prefix, "
+            "parent: olist_geolocation.geolocation_zip_code_prefix}\n")
+        customers = pd.DataFrame({"customer_zip_code_prefix": [1001, 1002, 5555]})
+        feeds = {"feed_a": [1001, 1002], "feed_b": [5555]}
+        for feed, zips in feeds.items():
+            (root / feed).mkdir()
+            customers.to_csv(root / feed / "olist_customers_dataset.csv", index=False)
+            pd.DataFrame({"geolocation_zip_code_prefix": zips}).to_csv(
+                root / feed / "olist_geolocation_dataset.csv", index=False)
+
+        service = DQService(root / "zip_service", workers=2, default_config=str(config))
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            jobs = {feed: service.submit(str(root / feed)) for feed in feeds}
+            service.start()
+            service.stop()
+        finally:
+            os.chdir(cwd)
+
+        for feed, zips in feeds.items():
+            job = jobs[feed]
+            self.assertEqual(job.status, "succeeded", job.error)
+            zip_column = next(r for r in job.columns if r["column_name"] == "customer_zip_code_prefix")
+            self.assertEqual(zip_column["consistency"]["valid_records"], len(zips))
+        # no centroid cache shared through the working directory
+        self.assertEqual(list(root.rglob("zip_centroids*")), [])
+
+    def test_alerts_across_feeds_and_no_profiler_drift(self):
+        root = Path(self.tmp.name)
+        feeds = {"feed_a": "olist_orders_dataset.csv", "feed_b": "olist_sellers_dataset.csv"}
+        for feed, name in feeds.items():
+            (root / feed).mkdir()
+        # a profiler drift report for some other load, at the checker's default (cwd-relative) path
+        (root / DRIFT_DIR).mkdir(parents=True)
+        (root / DRIFT_DIR / DRIFT_REPORT_FILE).write_text(json.dumps(
+            {"load_id": "x", "previous_load_id": None, "drifted_columns": 0, "schema_changes": [], "columns": []}))
+
+        def submit(feed, values):
+            pd.DataFrame({"value": values}).to_csv(root / feed / feeds[feed], index=False)
+            return self.service.run_job(self.service.submit(str(root / feed / feeds[feed])))
+
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            submit("feed_a", [1, 2, 3, 4])
+            submit("feed_b", [1, 2, 3, 4])
+            job = submit("feed_a", [1, None, None, None])
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(job.status, "succeeded", job.error)
+        self.assertNotIn("drift", job.summary)
+        self.assertEqual([(a["table_name"], a["kind"]) for a in job.summary["alerts"]],
+                         [("olist_orders", "regression")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dq_sinks import CSV_COLUMNS, read_jsonl  # noqa: E402
+from run_dq_check import DataQualityChecker  # noqa: E402
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet sink is optional
+    pq = None
+
+
+class StreamingSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.data_dir = root / "raw"
+        self.data_dir.mkdir()
+        pd.DataFrame({
+            "order_id": ["a", "b", "c", None],
+            "price": [1.0, 2.0, 3.0, 100.0],
+        }).to_csv(self.data_dir / "olist_orders_dataset.csv", index=False)
+        pd.DataFrame({"seller_id": ["x", "y"]}).to_csv(self.data_dir / "olist_sellers_dataset.csv", index=False)
+        self.config = root / "dq_config.yml"
+        self.config.write_text("threshold: 90\n")
+        self.out = root / "out"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, formats):
+        checker = DataQualityChecker(config_path=str(self.config), data_dir=str(self.data_dir),
+                                     output_dir=str(self.out), result_formats=formats,
+                                     stats_cache_path=self.out / "column_stats.json")
+        checker.run_checks()
+        checker.save_results()
+        return checker
+
+    def test_jsonl_csv_and_summary(self):
+        checker = self._run(["jsonl", "csv"])
+        detailed = read_jsonl(self.out / "dq_results_detailed.jsonl")
+        self.assertEqual(len(detailed), 3)
+        self.assertEqual({r["column_name"] for r in detailed}, {"order_id", "price", "seller_id"})
+
+        csv_df = pd.read_csv(self.out / "dq_results_summary.csv")
+        self.assertEqual(list(csv_df.columns), CSV_COLUMNS)
+        self.assertEqual(len(csv_df), 3)
+
+        with open(self.out / "dq_summary.json") as f:
+            summary = json.load(f)
+        self.assertEqual(summary, checker.summary)
+        self.assertEqual(summary["total_columns"], 3)
+        self.assertEqual(summary["passed_columns"] + summary["failed_columns"], 3)
+
+        # each saved run is appended to the score history
+        rerun = self._run(["jsonl"])
+        self.assertEqual(rerun.summary["history_run_id"], 2)
+        self.assertEqual(rerun.summary["alerts"], [])
+        self.assertTrue((self.out / "dq_results.npz").exists())
+        self.assertEqual(csv_df["Overall Score"].tolist(), checker.results.to_frame()["Overall Score"].tolist())
+        orders = summary["tables"]["olist_orders"]
+        expected = round(csv_df.loc[csv_df["Table"] == "olist_orders", "Overall Score"].mean(), 2)
+        self.assertAlmostEqual(orders["average_score"], expected)
+
+    @unittest.skipIf(pq is None, "pyarrow not installed")
+    def test_parquet_sink(self):
+        self._run(["parquet"])
+        table = pq.read_table(self.out / "dq_results_detailed.parquet")
+        self.assertEqual(table.num_rows, 3)
+        self.assertIn("completeness_valid", table.column_names)
+
+    def test_unknown_format_rejected(self):
+        with self.assertRaises(ValueError):
+            self._run(["xml"])
+
+
+if __name__ == "__main__":
+    unittest.main()
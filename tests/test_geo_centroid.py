@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from geo_centroid import GEOLOCATION_CSV, build_zip_lookup, load_zip_lookup
+
+
+class TestZipCentroid(unittest.TestCase):
+
+    def setUp(self):
+        self.geo = pd.DataFrame({
+            'geolocation_zip_code_prefix': [1037, 1037, 1037, 1037, 1046, 1046],
+            'geolocation_lat': [-23.5, -23.5, -23.5, -23.7, -23.1, -23.2],
+            'geolocation_lng': [-46.6, -46.6, -46.6, -46.8, -46.1, -46.2],
+            'geolocation_city': ['Sao Paulo', 'sao paulo', 'osasco', 'osasco', 'b', 'a'],
+            'geolocation_state': ['SP', 'SP', 'SP', 'RJ', 'SP', 'SP'],
+        })
+
+    def test_modes_and_distinct_point_centroid(self):
+        frame = build_zip_lookup(self.geo).to_frame().set_index('zip_prefix')
+        self.assertEqual(list(frame.index), ['01037', '01046'])
+        # 2x sao paulo vs 2x osasco -> alphabetical tie-break; cities are lower-cased
+        self.assertEqual(frame.loc['01037', 'city'], 'osasco')
+        self.assertEqual(frame.loc['01037', 'state'], 'sp')
+        self.assertEqual(frame.loc['01046', 'city'], 'a')
+        # Centroid over the two DISTINCT coordinates, not the four rows
+        self.assertAlmostEqual(frame.loc['01037', 'latitude'], -23.6)
+        self.assertAlmostEqual(frame.loc['01037', 'longitude'], -46.7)
+
+    def test_lookup(self):
+        lookup = build_zip_lookup(self.geo)
+        result = lookup.lookup(['01046', 1037, 99999, None])
+        self.assertEqual(list(result['state'][:2]), ['sp', 'sp'])
+        self.assertTrue(result['city'][2:].isna().all())
+        self.assertEqual(list(lookup.contains([1037, '99999'])), [True, False])
+
+    def test_load_from_data_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            self.geo.assign(extra=1).to_csv(tmp / GEOLOCATION_CSV, index=False)
+            lookup = load_zip_lookup(tmp)
+            self.assertIsNone(load_zip_lookup(tmp / 'missing'))
+        self.assertEqual(list(lookup.zips), [1037, 1046])
+        self.assertEqual(list(lookup.city), ['osasco', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
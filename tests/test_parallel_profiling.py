@@ -0,0 +1,74 @@
+import contextlib
+import io
+import multiprocessing
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import data_profiling_analysis  # noqa: E402
+from column_stats import StatsCache  # noqa: E402
+from data_profiling_analysis import profile_all_datasets  # noqa: E402
+
+
+@unittest.skipIf(data_profiling_analysis.pa is None, "pyarrow not installed")
+class ParallelProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        rng = np.random.default_rng(0)
+        n = 500
+        pd.DataFrame({
+            "order_id": [f"{i:032x}" for i in range(n)],
+            "price": np.where(rng.random(n) < 0.1, np.nan, rng.random(n) * 100),
+            "qty": rng.integers(0, 4, n),
+            "status": rng.choice(["delivered", "canceled", None], n),
+        }).to_csv(self.data_dir / "olist_orders_dataset.csv", index=False)
+        pd.DataFrame({f"c{i}": rng.normal(i, 1, 50) for i in range(12)}).to_csv(
+            self.data_dir / "olist_wide_dataset.csv", index=False)
+        self.files = ["olist_orders_dataset.csv", "olist_wide_dataset.csv"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parallel_matches_serial_in_order(self):
+        serial, _ = profile_all_datasets(data_dir=self.data_dir, csv_files=self.files)
+        cache = StatsCache(self.data_dir / "column_stats.json")
+        parallel, datasets = profile_all_datasets(cache, workers=2, data_dir=self.data_dir, csv_files=self.files)
+        pd.testing.assert_frame_equal(serial, parallel)
+        self.assertEqual(list(datasets), ["olist_orders_dataset", "olist_wide_dataset"])
+        # numeric stats computed in the workers come back to the parent's cache
+        self.assertEqual(cache.misses, 14)
+        self.assertEqual(len(cache.entries), 14)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork", "workers must inherit the patched profiler")
+    def test_failing_column_drops_its_table_in_both_modes(self):
+        profile = data_profiling_analysis.calculate_column_profile
+
+        def failing_profile(df, column, table_name, *args):
+            if column == "c3":
+                raise ValueError("bad column")
+            return profile(df, column, table_name, *args)
+
+        data_profiling_analysis.calculate_column_profile = failing_profile
+        try:
+            results = []
+            for workers in (1, 2):
+                with contextlib.redirect_stdout(io.StringIO()) as out:
+                    results.append(profile_all_datasets(workers=workers, data_dir=self.data_dir, csv_files=self.files))
+                self.assertIn("✗ Error reading olist_wide_dataset.csv", out.getvalue())
+        finally:
+            data_profiling_analysis.calculate_column_profile = profile
+        (serial, serial_datasets), (parallel, parallel_datasets) = results
+        pd.testing.assert_frame_equal(serial, parallel)
+        self.assertEqual(set(parallel["table_name"]), {"olist_orders_dataset"})
+        self.assertEqual(list(serial_datasets), list(parallel_datasets))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "orchestration" / "dagster"))
+
+try:
+    import duckdb  # noqa: F401
+    import parquet_load
+except ImportError:  # pyarrow / duckdb are only needed for the Parquet load path
+    parquet_load = None
+
+MELTANO_YML = """
+plugins:
+  extractors:
+  - name: tap-csv
+    config:
+      files:
+        - entity: reviews
+          path: ../raw/reviews.csv
+          keys: [review_id]
+          encoding: utf-8-sig
+  loaders:
+  - name: target-bigquery
+    config: {project: p, dataset: d, location: US}
+"""
+
+CATALOG = {"streams": [{
+    "tap_stream_id": "reviews",
+    "schema": {"properties": {
+        "\ufeffreview_id": {"type": ["string", "null"]},
+        "review_score": {"type": ["string", "null"]},
+        "review_comment_message": {"type": ["string", "null"]},
+    }},
+}]}
+
+
+@unittest.skipIf(parquet_load is None, "pyarrow/duckdb not installed")
+class TestParquetLoad(unittest.TestCase):
+
+    def test_csv_loads_into_duckdb_with_catalog_types(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "meltano").mkdir()
+            (tmp / "raw").mkdir()
+            (tmp / "meltano" / "meltano.yml").write_text(MELTANO_YML)
+            (tmp / "meltano" / "catalog.json").write_text(json.dumps(CATALOG))
+            (tmp / "raw" / "reviews.csv").write_text(
+                '\ufeffreview_id,review_score,review_comment_message\n'
+                'r1,5,"great\nproduct"\n'
+                'r2,1,\n', encoding="utf-8")
+
+            files = parquet_load.load_tap_csv_files(tmp / "meltano")
+            schemas = parquet_load.load_catalog_schemas(tmp / "meltano" / "catalog.json")
+            target = parquet_load.DuckDBTarget()
+            result = parquet_load.run_parquet_load(files, schemas, target, tmp / "staging", log=lambda _: None)
+
+            self.assertEqual(result["rows"], 2)
+            self.assertEqual(result["entities"][0]["loaded_rows"], 2)
+            self.assertEqual(parquet_load.count_csv_rows(files), 2)
+            rows = target.con.execute(
+                "SELECT review_id, review_score, review_comment_message FROM brazilian_ecommerce.reviews ORDER BY 1"
+            ).fetchall()
+            # Strings stay strings (catalog contract) and empty fields stay '' like tap-csv
+            self.assertEqual(rows, [("r1", "5", "great\nproduct"), ("r2", "1", "")])
+
+    def test_throughput_log_returns_other_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "throughput.jsonl"
+            self.assertIsNone(parquet_load.append_throughput(log, parquet_load.throughput_record("singer", 100, 2.0)))
+            previous = parquet_load.append_throughput(log, parquet_load.throughput_record("parquet", 100, 0.5))
+            self.assertEqual(previous["load_path"], "singer")
+            self.assertEqual(previous["rows_per_second"], 50.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline_trace import NULL_TRACER, Tracer  # noqa: E402
+from run_dq_check import TRACE_FILE, DataQualityChecker  # noqa: E402
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TracerTest(unittest.TestCase):
+    def test_nested_spans_and_chrome_events(self):
+        tracer = Tracer()
+        with tracer.span("load"):
+            for table in ("orders", "items"):
+                with tracer.span("load_table", category="table", table=table):
+                    _busy(0.01)
+        with tracer.span("check"):
+            _busy(0.03)
+        self.assertEqual([s.name for s in tracer.spans], ["load_table", "load_table", "load", "check"])
+        self.assertEqual([s.depth for s in tracer.spans], [1, 1, 0, 0])
+        self.assertEqual(tracer.slowest().name, "check")
+        check = tracer.spans[-1]
+        self.assertGreaterEqual(check.wall, 0.03)
+        self.assertGreater(check.cpu, 0.02)
+
+        events = tracer.events()
+        self.assertEqual([e["name"] for e in events], ["load", "load_table", "load_table", "check"])
+        load, first = events[0], events[1]
+        self.assertEqual((load["ph"], first["cat"], first["args"]["table"]), ("X", "table", "orders"))
+        self.assertLessEqual(load["ts"], first["ts"])
+        self.assertGreaterEqual(load["ts"] + load["dur"], first["ts"] + first["dur"])
+        self.assertIn("rss_peak_growth_mb", first["args"])
+        self.assertEqual(len(tracer.report()), 2 + 2)
+
+    def test_tracemalloc_peak_propagates_to_parent(self):
+        tracer = Tracer(tracemalloc=True)
+        with tracer.span("stage"):
+            with tracer.span("alloc"):
+                block = bytearray(20 * 1024 * 1024)
+                del block
+            kept = bytearray(1024 * 1024)
+        tracer.close()
+        alloc, stage = tracer.spans
+        self.assertGreaterEqual(alloc.py_peak, 20 * 1024 * 1024)
+        self.assertLess(alloc.py_delta, 1024 * 1024)
+        self.assertGreaterEqual(stage.py_peak, alloc.py_peak)
+        self.assertGreaterEqual(stage.py_delta, 1024 * 1024)
+        del kept
+
+    def test_threads_nest_independently(self):
+        tracer = Tracer()
+
+        def job(name):
+            with tracer.span("job", job=name):
+                with tracer.span("column"):
+                    _busy(0.005)
+
+        threads = [threading.Thread(target=job, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(s.depth for s in tracer.spans), [0, 0, 0, 1, 1, 1])
+
+    def test_write_trace_and_slowest_profile(self):
+        tracer = Tracer(cprofile=True)
+        with tracer.span("fast"):
+            _busy(0.001)
+        with tracer.span("slow"):
+            _busy(0.02)
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_path, prof_path = tracer.write(Path(tmp) / "trace.json")
+            with open(trace_path) as f:
+                trace = json.load(f)
+            self.assertEqual(trace["otherData"]["cprofile_span"], "slow")
+            self.assertEqual(len(trace["traceEvents"]), 2)
+            self.assertEqual(prof_path, Path(tmp) / "trace.prof")
+            functions = {func[2] for func in pstats.Stats(str(prof_path)).stats}
+            self.assertIn("_busy", functions)
+
+    def test_disabled_tracer_records_nothing(self):
+        with NULL_TRACER.span("anything") as span:
+            self.assertIsNone(span)
+        self.assertEqual(NULL_TRACER.spans, [])
+
+
+class CheckerTraceTest(unittest.TestCase):
+    def test_dq_run_writes_trace(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "raw").mkdir()
+            pd.DataFrame({"order_id": ["a", "b"], "price": [1.0, 2.0]}).to_csv(
+                root / "raw" / "olist_orders_dataset.csv", index=False)
+            (root / "dq_config.yml").write_text("threshold: 90\n")
+            checker = DataQualityChecker(config_path=str(root / "dq_config.yml"), data_dir=str(root / "raw"),
+                                         output_dir=str(root / "out"), stats_cache_path=None)
+            checker.run_checks()
+            checker.save_results()
+            with open(root / "out" / TRACE_FILE) as f:
+                events = json.load(f)["traceEvents"]
+        names = [e["name"] for e in events]
+        self.assertEqual([n for n in names if n in ("load", "check", "save")], ["load", "check", "save"])
+        columns = [e["args"]["column"] for e in events if e["name"] == "check_column"]
+        self.assertEqual(columns, ["order_id", "price"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from profile_bins import PlotBins, hexbin, histogram  # noqa: E402
+
+
+def _datasets(n=20_000):
+    rng = np.random.default_rng(3)
+    return {
+        "olist_order_items_dataset": pd.DataFrame({
+            "order_item_id": rng.integers(1, 8, n),
+            "price": rng.lognormal(4, 0.8, n),
+            "freight_value": np.where(rng.random(n) < 0.01, np.nan, rng.lognormal(2.5, 0.5, n)),
+            "seller_id": rng.choice(["a", "b"], n),
+        }),
+        "olist_order_reviews_dataset": pd.DataFrame({"review_score": rng.integers(1, 6, n)}),
+    }
+
+
+class BinningTest(unittest.TestCase):
+    def test_histogram_matches_numpy(self):
+        items = _datasets()["olist_order_items_dataset"]
+        price = histogram(items["price"])
+        self.assertEqual(len(price["counts"]), 50)
+        np.testing.assert_array_equal(price["counts"], np.histogram(items["price"], price["edges"])[0])
+        self.assertAlmostEqual(price["std"], items["price"].std())
+        ids = histogram(items["order_item_id"])
+        np.testing.assert_array_equal(ids["edges"], np.arange(0.5, 8.5))
+        self.assertEqual(histogram(items["freight_value"])["n"], items["freight_value"].notna().sum())
+        self.assertIsNone(histogram(pd.Series([np.nan, np.nan])))
+
+    def test_hexbin_matches_matplotlib(self):
+        items = _datasets()["olist_order_items_dataset"].dropna()
+        ours = hexbin(items["price"], items["freight_value"], gridsize=30)
+        collection = plt.hexbin(items["price"], items["freight_value"], gridsize=30)
+        plt.close("all")
+        counts = np.asarray(collection.get_array())
+        theirs = {(round(x, 6), round(y, 6)): c for (x, y), c in zip(collection.get_offsets(), counts) if c}
+        self.assertEqual(dict(zip(zip(ours["x"].round(6), ours["y"].round(6)), ours["counts"])), theirs)
+        self.assertAlmostEqual(ours["corr"], items["price"].corr(items["freight_value"]))
+
+    def test_save_and_load(self):
+        bins = PlotBins.compute(_datasets())
+        self.assertEqual(set(bins.hexbins), {"price_vs_freight"})
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(PlotBins.load(Path(tmp) / "missing.npz"))
+            loaded = PlotBins.load(bins.save(Path(tmp) / "plot_bins.npz"))
+        self.assertEqual(list(loaded.hists["olist_order_items_dataset"]), ["order_item_id", "price", "freight_value"])
+        np.testing.assert_array_equal(loaded.review_scores["values"], [1, 2, 3, 4, 5])
+        self.assertEqual(loaded.review_scores["counts"].sum(), 20_000)
+        self.assertEqual(loaded.hexbins["price_vs_freight"]["gridsize"], 40)
+        np.testing.assert_array_equal(loaded.hists["olist_order_items_dataset"]["price"]["counts"],
+                                      bins.hists["olist_order_items_dataset"]["price"]["counts"])
+
+
+if __name__ == "__main__":
+    unittest.main()
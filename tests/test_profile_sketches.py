@@ -0,0 +1,79 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_profiling_analysis import calculate_column_profile  # noqa: E402
+from profile_sketches import FrequentItems, HyperLogLog, QuantileSketch, _bit_length  # noqa: E402
+
+
+class SketchTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+
+    def test_bit_length(self):
+        values = np.array([0, 1, 2, 3, 255, 256, 2**52 - 1, 2**63], dtype=np.uint64)
+        np.testing.assert_array_equal(_bit_length(values), [0, 1, 2, 2, 8, 9, 52, 64])
+
+    def test_hyperloglog_within_error(self):
+        for n in (50, 20_000, 300_000):
+            series = pd.Series(self.rng.integers(0, n, n))
+            hll = HyperLogLog()
+            hll.update(series)
+            exact = series.nunique()
+            self.assertLess(abs(hll.estimate() - exact) / exact, 4 * hll.relative_error, n)
+        self.assertEqual(HyperLogLog().registers.nbytes, 16_384)
+
+    def test_frequent_items_bounds(self):
+        series = pd.Series(self.rng.zipf(1.6, 200_000))
+        frequent = FrequentItems(capacity=64)
+        for start in range(0, len(series), 10_000):
+            frequent.update(series.iloc[start:start + 10_000])
+        self.assertLessEqual(len(frequent.counts), 64)
+        self.assertLessEqual(frequent.error, len(series) / 65)
+        exact = series.value_counts()
+        top = frequent.top(5)
+        self.assertEqual(list(top.index), list(exact.index[:5]))
+        for value, count in top.items():
+            self.assertTrue(exact[value] - frequent.error <= count <= exact[value])
+
+    def test_quantiles_within_rank_error(self):
+        values = self.rng.lognormal(3, 1, 400_000)
+        sketch = QuantileSketch(k=200)
+        for start in range(0, len(values), 65_536):
+            sketch.update(values[start:start + 65_536])
+        self.assertLess(sum(len(level) for level in sketch.levels), 200 * 16)
+        for q, estimate in zip((0.1, 0.5, 0.9), sketch.quantiles([0.1, 0.5, 0.9])):
+            self.assertLess(abs((values < estimate).mean() - q), sketch.rank_error)
+
+
+class ApproximateProfileTest(unittest.TestCase):
+    def test_profile_records_error_bounds(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            "geolocation_lat": rng.normal(-23.5, 2, 100_000),
+            "geolocation_state": rng.choice(["SP", "RJ", "MG"], 100_000, p=[0.6, 0.3, 0.1]),
+        })
+        for column in df.columns:
+            exact = calculate_column_profile(df, column, "olist_geolocation_dataset")
+            approx = calculate_column_profile(df, column, "olist_geolocation_dataset", approximate=True)
+            self.assertEqual((exact["profile_mode"], approx["profile_mode"]), ("exact", "approximate"))
+            self.assertEqual(exact["distinct_count_error"], 0)
+            self.assertLessEqual(abs(approx["distinct_count"] - exact["distinct_count"]),
+                                 4 * approx["distinct_count_error"] + 1)
+            self.assertIsNone(approx["unique_count"])
+        lat = calculate_column_profile(df, "geolocation_lat", "t", approximate=True)
+        self.assertAlmostEqual(lat["median"], df["geolocation_lat"].median(), delta=0.1)
+        self.assertGreater(lat["quantile_rank_error"], 0)
+        state = calculate_column_profile(df, "geolocation_state", "t", approximate=True)
+        self.assertEqual(state["top_10_values"], ["SP", "RJ", "MG"])
+        self.assertEqual(state["frequency_error"], 0)
+        self.assertIsNone(state["quantile_rank_error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import contextlib
+import gc
+import io
+import os
+import sys
+import tempfile
+import unittest
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import data_profiling_analysis  # noqa: E402
+from benchmarks.synthetic_olist import write_tables  # noqa: E402
+from data_profiling_analysis import dataset_stats, profile_all_datasets  # noqa: E402
+from dq_drift import table_sketches  # noqa: E402
+from profile_bins import PlotBins  # noqa: E402
+from profile_stages import StageInputs, stage_columns  # noqa: E402
+
+
+class StageInputsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)  # the synthetic tables go to ./data of a scratch directory
+        self.files = write_tables("data", 0.002)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _profile(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return profile_all_datasets(data_dir=Path("data"), csv_files=self.files, **kwargs)
+
+    def _assert_same_inputs(self, stages, profile_df, datasets):
+        pd.testing.assert_frame_equal(stages.table_stats, dataset_stats(datasets))
+        self.assertEqual(stages.sketches, table_sketches(datasets, profile_df))
+        expected = PlotBins.compute(datasets)
+        self.assertEqual(list(stages.bins.hists), list(expected.hists))
+        for table, columns in expected.hists.items():
+            self.assertEqual(list(stages.bins.hists[table]), list(columns))
+            for column, hist in columns.items():
+                np.testing.assert_array_equal(stages.bins.hists[table][column]['counts'], hist['counts'])
+        self.assertEqual(set(stages.bins.hexbins), set(expected.hexbins))
+        np.testing.assert_array_equal(stages.bins.review_scores['counts'], expected.review_scores['counts'])
+
+    def test_stages_match_retained_datasets_and_release_tables(self):
+        profile_df, datasets = self._profile()
+        refs, alive = [], []
+        stages = StageInputs()
+        add = stages.add
+
+        def tracking_add(table_name, df, profiles=None):
+            # the previous table must be gone before the next one is handed over
+            gc.collect()
+            alive.append(sum(ref() is not None for ref in refs))
+            refs.append(weakref.ref(df))
+            add(table_name, df, profiles)
+        stages.add = tracking_add
+        staged_df, kept = self._profile(stages=stages)
+        self.assertEqual(kept, {})
+        self.assertEqual(alive, [0, 0, 0, 0])
+        pd.testing.assert_frame_equal(staged_df, profile_df)
+        self._assert_same_inputs(stages, profile_df, datasets)
+
+    @unittest.skipIf(data_profiling_analysis.pa is None, "pyarrow not installed")
+    def test_parallel_stages(self):
+        profile_df, datasets = self._profile()
+        stages = StageInputs()
+        parallel_df, kept = self._profile(workers=2, stages=stages)
+        self.assertEqual(kept, {})
+        pd.testing.assert_frame_equal(parallel_df, profile_df)
+        self._assert_same_inputs(stages, profile_df, datasets)
+
+    def test_declared_columns(self):
+        geo = pd.read_csv("data/olist_geolocation_dataset.csv")
+        reviews = pd.read_csv("data/olist_order_reviews_dataset.csv")
+        self.assertEqual(stage_columns('plot_bins', 'olist_order_reviews_dataset', reviews), ['review_score'])
+        self.assertEqual(stage_columns('plot_bins', 'olist_geolocation_dataset', geo),
+                         ['geolocation_zip_code_prefix', 'geolocation_lat', 'geolocation_lng'])
+        self.assertEqual(stage_columns('drift', 'olist_order_reviews_dataset', reviews), list(reviews.columns))
+        with self.assertRaises(ValueError):
+            stage_columns('plots', 'olist_order_reviews_dataset', reviews)
+
+
+if __name__ == "__main__":
+    unittest.main()
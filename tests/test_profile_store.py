@@ -0,0 +1,67 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_profiling_analysis import calculate_column_profile  # noqa: E402
+from profile_store import ProfileStore, pq, write_profile_artifact  # noqa: E402
+
+
+def _profiles():
+    rng = np.random.default_rng(1)
+    items = pd.DataFrame({"price": rng.lognormal(4, 1, 500), "order_id": [f"o{i % 40}" for i in range(500)]})
+    sellers = pd.DataFrame({"seller_state": rng.choice(["SP", "RJ"], 200), "seller_zip_code_prefix": rng.integers(1000, 9999, 200)})
+    rows = [calculate_column_profile(items, c, "olist_order_items_dataset") for c in items.columns]
+    rows += [calculate_column_profile(sellers, c, "olist_sellers_dataset") for c in sellers.columns]
+    rows.append(calculate_column_profile(sellers, "seller_state", "olist_geolocation_dataset", approximate=True))
+    return pd.DataFrame(rows)
+
+
+@unittest.skipIf(pq is None, "pyarrow not installed")
+class ProfileStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.profile_df = _profiles()
+        self.path = write_profile_artifact(self.profile_df, Path(self.tmp.name) / "results.parquet")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_artifact_is_typed_and_sorted(self):
+        schema = pq.read_schema(self.path)
+        self.assertEqual(str(schema.field("top_10_values").type), "list<element: string>")
+        self.assertEqual(str(schema.field("top_10_frequencies").type), "list<element: int64>")
+        self.assertEqual(str(schema.field("unique_count").type), "int64")
+        keys = pq.read_table(self.path, columns=["table_name", "column_name"]).to_pylist()
+        self.assertEqual(keys, sorted(keys, key=lambda r: (r["table_name"], r["column_name"])))
+
+    def test_lookups(self):
+        store = ProfileStore.open(self.path)
+        self.assertEqual(store.metrics, list(self.profile_df.columns))
+        pd.testing.assert_series_equal(store.frame["column_name"], self.profile_df["column_name"])
+        self.assertEqual(store.tables(), ["olist_order_items_dataset", "olist_sellers_dataset", "olist_geolocation_dataset"])
+        state = store.get("olist_sellers_dataset", "seller_state")
+        self.assertEqual(set(state["top_10_values"]), {"SP", "RJ"})
+        self.assertEqual(sum(state["top_10_frequencies"]), 200)
+        self.assertIsNone(store.get("olist_geolocation_dataset", "seller_state")["unique_count"])
+        self.assertEqual(store.table("olist_sellers_dataset")["column_name"].tolist(),
+                         ["seller_state", "seller_zip_code_prefix"])
+        self.assertEqual(len(store.table("missing")), 0)
+        with self.assertRaises(KeyError):
+            store.get("olist_sellers_dataset", "price")
+        self.assertEqual(len(ProfileStore.open(self.path, tables=["olist_sellers_dataset"])), 2)
+
+    def test_csv_fallback(self):
+        csv = Path(self.tmp.name) / "results.csv"
+        self.profile_df.to_csv(csv, index=False)
+        store = ProfileStore.open(Path(self.tmp.name) / "missing.parquet", csv_path=csv)
+        self.assertEqual(store.get("olist_order_items_dataset", "price")["total_count"], 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import io
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_profiling_analysis import (  # noqa: E402
+    calculate_column_profile, dataset_stats, generate_html_report, generate_summary_report, typed_profile,
+    write_html_report,
+)
+
+
+def _profiles():
+    rng = np.random.default_rng(0)
+    datasets = {
+        "olist_orders_dataset": pd.DataFrame({
+            "order_id": [f"{i:032x}" for i in range(200)],
+            "price": np.where(rng.random(200) < 0.6, np.nan, rng.random(200) * 100),
+            "status": rng.choice(["delivered", "canceled", None], 200),
+        }),
+        "olist_sellers_dataset": pd.DataFrame({"seller_id": ["a", "b"], "zeros": [0, 0], "empty": [None, None]}),
+    }
+    profile_df = pd.DataFrame([calculate_column_profile(df, column, table)
+                               for table, df in datasets.items() for column in df.columns])
+    return profile_df, datasets
+
+
+def _strip_timestamp(html):
+    return re.sub(r"Report Generated:</strong> [0-9: -]+", "", html)
+
+
+class HtmlReportTest(unittest.TestCase):
+    def test_stream_matches_string_report(self):
+        profile_df, datasets = _profiles()
+        buffer = io.StringIO()
+        written = write_html_report(profile_df, datasets, buffer)
+        self.assertEqual(written, len(buffer.getvalue()))
+        self.assertEqual(_strip_timestamp(buffer.getvalue()),
+                         _strip_timestamp(generate_html_report(profile_df, datasets)))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.html"
+            write_html_report(profile_df, datasets, path)
+            self.assertEqual(_strip_timestamp(path.read_text(encoding="utf-8")),
+                             _strip_timestamp(buffer.getvalue()))
+
+    def test_sections_and_cells(self):
+        profile_df, datasets = _profiles()
+        html = generate_html_report(profile_df, datasets)
+        self.assertEqual(html.count("<h3>"), 2)
+        self.assertLess(html.index("<h3>olist_orders_dataset</h3>"), html.index("<h3>olist_sellers_dataset</h3>"))
+        self.assertEqual(html.count("<tr>") - 2, len(profile_df))  # minus the two header rows
+        self.assertIn("<p><strong>Shape:</strong> 200 rows × 3 columns</p>", html)
+        self.assertIn('<td class="warning">100.00%</td>', html)  # all-null column
+        self.assertIn("<td>N/A</td>", html)
+
+
+class SummaryReportTest(unittest.TestCase):
+    def test_typed_profile_classifies_each_dtype_once(self):
+        profile_df, _ = _profiles()
+        typed = typed_profile(profile_df)
+        self.assertEqual(typed.loc[typed["is_numeric"], "label"].tolist(),
+                         ["olist_orders_dataset.price", "olist_sellers_dataset.zeros"])
+        self.assertEqual(str(typed["data_type"].dtype), "category")
+
+    def test_sections(self):
+        profile_df, datasets = _profiles()
+        report = generate_summary_report(profile_df, datasets)
+        self.assertEqual(report, generate_summary_report(profile_df, datasets, dataset_stats(datasets)))
+        self.assertIn("   • Total Rows (across all tables): 202", report)
+        self.assertIn("     - olist_sellers_dataset.empty: 100.00% null (2 of 2)", report)
+        self.assertIn("     - olist_orders_dataset.order_id: 100.00% distinct", report)
+        self.assertIn("     - olist_sellers_dataset.zeros: 100.00% zeros", report)
+        self.assertIn("     - olist_orders_dataset.order_id: avg = 32.0 chars (min: 32.0, max: 32.0)", report)
+        self.assertIn("     - olist_orders_dataset.status: 2 distinct values", report)
+        self.assertTrue(report.rstrip().endswith("END OF SUMMARY\n" + "=" * 80))
+
+
+if __name__ == "__main__":
+    unittest.main()
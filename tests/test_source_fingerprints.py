@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "orchestration" / "dagster"))
+
+import source_fingerprints  # noqa: E402
+
+
+class SourceFingerprintTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.state = self.root / "output" / "source_fingerprints.json"
+        self.files = []
+        for entity in ("orders", "customers"):
+            path = self.root / f"{entity}.csv"
+            path.write_text(f"{entity}_id\n1\n2\n")
+            self.files.append({"entity": entity, "path": path})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self):
+        return source_fingerprints.fingerprint_sources(self.files, source_fingerprints.load_state(self.state))
+
+    def test_first_run_marks_everything_changed(self):
+        result = self._run()
+        self.assertEqual(result["changed"], ["orders", "customers"])
+        self.assertEqual(result["unchanged"], [])
+
+    def test_unchanged_after_save(self):
+        source_fingerprints.save_state(self.state, self._run()["fingerprints"])
+        result = self._run()
+        self.assertEqual(result["changed"], [])
+        self.assertEqual(result["unchanged"], ["orders", "customers"])
+
+    def test_touched_file_is_rehashed_but_unchanged(self):
+        source_fingerprints.save_state(self.state, self._run()["fingerprints"])
+        path = self.files[0]["path"]
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        result = self._run()
+        self.assertEqual(result["changed"], [])
+        self.assertEqual(result["fingerprints"]["orders"]["mtime_ns"], stat.st_mtime_ns + 10**9)
+
+    def test_content_change_detected(self):
+        source_fingerprints.save_state(self.state, self._run()["fingerprints"])
+        self.files[1]["path"].write_text("customers_id\n1\n3\n")
+        result = self._run()
+        self.assertEqual(result["changed"], ["customers"])
+        self.assertEqual(result["unchanged"], ["orders"])
+
+    def test_missing_file_reported(self):
+        self.files[0]["path"].unlink()
+        result = self._run()
+        self.assertEqual(result["missing"], ["orders"])
+        self.assertNotIn("orders", result["fingerprints"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+
+try:
+    import duckdb
+    import warehouse_layout_check as wlc
+except ImportError:  # duckdb / pyarrow are optional outside the layout tooling
+    duckdb = None
+
+
+def build_fact_tables(con, n_orders=20000):
+    """Small olist-shaped fact tables in load (random) order spanning ~2 years."""
+    con.execute(f"""
+        CREATE TABLE fact_orders AS
+        SELECT md5('o' || i) AS order_id,
+               md5('c' || (i % 5000)) AS customer_id,
+               CASE WHEN i % 20 = 0 THEN 'canceled' ELSE 'delivered' END AS order_status,
+               TIMESTAMP '2016-10-01' + INTERVAL (hash(i) % 700) DAY AS purchase_ts,
+               TIMESTAMP '2016-10-08' + INTERVAL (hash(i) % 700) DAY AS delivered_customer_ts
+        FROM range({n_orders}) t(i)
+    """)
+    con.execute("""
+        CREATE TABLE fact_order_items AS
+        SELECT order_id, 1 AS order_item_id,
+               md5('p' || (hash(order_id) % 3000)) AS product_id,
+               md5('s' || (hash(order_id) % 300)) AS seller_id,
+               purchase_ts + INTERVAL 3 DAY AS shipping_limit_date,
+               10.0 + hash(order_id) % 500 AS price, 5.0 + hash(order_id) % 40 AS freight_value
+        FROM fact_orders
+    """)
+    con.execute("""
+        CREATE TABLE fact_payments AS
+        SELECT order_id, 1 AS payment_sequential, 'credit_card' AS payment_type,
+               1 AS payment_installments, 50.0 AS payment_value
+        FROM fact_orders
+    """)
+    con.execute("""
+        CREATE TABLE fact_reviews AS
+        SELECT md5('r' || order_id) AS review_id, order_id, 1 + hash(order_id) % 5 AS review_score,
+               delivered_customer_ts AS review_creation_ts
+        FROM fact_orders
+    """)
+
+
+@unittest.skipIf(duckdb is None, "duckdb/pyarrow not installed")
+class TestWarehouseLayout(unittest.TestCase):
+
+    def test_fact_models_declare_layout(self):
+        layouts = wlc.load_layouts()
+        self.assertEqual(layouts['fact_orders']['partition_by'], 'purchase_ts')
+        self.assertEqual(layouts['fact_reviews']['partition_by'], 'review_creation_ts')
+        self.assertIn('customer_id', layouts['fact_orders']['cluster_by'])
+        self.assertIn('seller_id', layouts['fact_order_items']['cluster_by'])
+        self.assertIn('product_id', layouts['fact_order_items']['cluster_by'])
+        self.assertTrue(all(layouts[m]['cluster_by'] for m in wlc.FACT_MODELS))
+
+    def test_layout_reduces_scanned_bytes(self):
+        con = duckdb.connect()
+        build_fact_tables(con)
+        with tempfile.TemporaryDirectory() as tmp:
+            results = wlc.run_layout_check(con, output_dir=tmp, row_group_size=1000)
+
+        self.assertEqual(len(results), len(wlc.REPRESENTATIVE_QUERIES))
+        windowed = {q['name'] for q in wlc.REPRESENTATIVE_QUERIES if q.get('window_days')}
+        for r in results:
+            self.assertTrue(r['results_match'], r['query'])
+            self.assertLessEqual(r['partitioned']['rows_scanned'], r['baseline']['rows_scanned'], r['query'])
+            # Date-range queries must be served by partition pruning
+            if r['query'] in windowed:
+                self.assertGreater(r['bytes_reduction_pct'], 50, r['query'])
+
+
+if __name__ == '__main__':
+    unittest.main()
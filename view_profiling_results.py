@@ -1,10 +1,11 @@
 """
 Quick viewer for data profiling results
 """
-import pandas as pd
+from profile_store import ProfileStore
 
-# Load the profiling results
-profile_df = pd.read_csv('data_profiling_results.csv')
+# Load the profiling results (typed Parquet artifact; CSV if it is missing)
+store = ProfileStore.open()
+profile_df = store.frame
 
 print("\n" + "="*100)
 print("DATA PROFILING RESULTS - SAMPLE VIEW")
@@ -26,8 +27,8 @@ print("\n\n" + "="*100)
 print("SUMMARY STATISTICS BY TABLE")
 print("="*100)
 
-for table in profile_df['table_name'].unique():
-    table_data = profile_df[profile_df['table_name'] == table]
+for table in store.tables():
+    table_data = store.table(table)
     print(f"\n{table}:")
     print(f"  - Number of columns: {len(table_data)}")
     print(f"  - Avg null percentage: {table_data['percent_null'].mean():.2f}%")
@@ -57,6 +58,7 @@ if len(pk_candidates) > 0:
 print("\n" + "="*100)
 print("\nFor full details, see:")
 print("  • data_profiling_results.csv")
+print("  • data_profiling_results.parquet (typed; query with profile_store.ProfileStore)")
 print("  • data_profiling_report.html") 
 print("  • data_profiling_summary.txt")
 print("  • data_profiling_output/ directory for visualizations")
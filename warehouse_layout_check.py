@@ -0,0 +1,330 @@
+"""
+Warehouse Layout Check for the Fact Marts
+Replays representative dashboard queries against a local DuckDB copy of the fact
+tables, once in load order (no layout) and once laid out the way the dbt mart
+configs partition and cluster them in BigQuery, and reports rows/bytes scanned.
+"""
+
+import argparse
+import json
+import re
+import shutil
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import duckdb
+import pyarrow.parquet as pq
+
+# dbt marts holding the partition_by / cluster_by configs (single source of truth)
+MODELS_DIR = Path("brazillian_ecommerce_project/models/marts")
+FACT_MODELS = ["fact_orders", "fact_order_items", "fact_payments", "fact_reviews"]
+
+RAW_DIR = Path("data/kaggle-raw")
+OUTPUT_DIR = Path("warehouse_layout_output")
+
+# Rows per Parquet row group; stands in for a BigQuery storage/cluster block
+ROW_GROUP_SIZE = 10_000
+
+# Local copy of the fact tables built straight from the raw CSVs (same column
+# names as the marts, only what the representative queries need)
+RAW_FACT_QUERIES = {
+    "fact_orders": """
+        SELECT order_id, customer_id, order_status,
+               CAST(order_purchase_timestamp AS TIMESTAMP) AS purchase_ts,
+               CAST(order_delivered_customer_date AS TIMESTAMP) AS delivered_customer_ts
+        FROM read_csv_auto('{raw_dir}/olist_orders_dataset.csv', all_varchar=true)
+    """,
+    "fact_order_items": """
+        SELECT order_id, CAST(order_item_id AS INTEGER) AS order_item_id, product_id, seller_id,
+               CAST(shipping_limit_date AS TIMESTAMP) AS shipping_limit_date,
+               CAST(price AS DOUBLE) AS price, CAST(freight_value AS DOUBLE) AS freight_value
+        FROM read_csv_auto('{raw_dir}/olist_order_items_dataset.csv', all_varchar=true)
+    """,
+    "fact_payments": """
+        SELECT order_id, CAST(payment_sequential AS INTEGER) AS payment_sequential, payment_type,
+               CAST(payment_installments AS INTEGER) AS payment_installments,
+               CAST(payment_value AS DOUBLE) AS payment_value
+        FROM read_csv_auto('{raw_dir}/olist_order_payments_dataset.csv', all_varchar=true)
+    """,
+    "fact_reviews": """
+        SELECT review_id, order_id, CAST(review_score AS INTEGER) AS review_score,
+               CAST(review_creation_date AS TIMESTAMP) AS review_creation_ts
+        FROM read_csv_auto('{raw_dir}/olist_order_reviews_dataset.csv', all_varchar=true)
+    """,
+}
+
+# Representative dashboard queries.
+#   window_days : filter the table's partition column to the last N days of data
+#   lookup      : equality filter on the most frequent value of that column
+REPRESENTATIVE_QUERIES = [
+    {
+        "name": "orders_by_status_last_30d",
+        "table": "fact_orders",
+        "columns": ["order_status", "order_id"],
+        "window_days": 30,
+        "sql": "SELECT order_status, COUNT(order_id) AS orders FROM {table} WHERE {where} GROUP BY 1 ORDER BY 1",
+    },
+    {
+        "name": "customer_order_history",
+        "table": "fact_orders",
+        "columns": ["order_id", "order_status", "purchase_ts"],
+        "lookup": "customer_id",
+        "sql": "SELECT order_id, order_status, purchase_ts FROM {table} WHERE {where} ORDER BY 1",
+    },
+    {
+        "name": "seller_revenue_last_90d",
+        "table": "fact_order_items",
+        "columns": ["price", "freight_value"],
+        "window_days": 90,
+        "lookup": "seller_id",
+        "sql": "SELECT ROUND(SUM(price + freight_value), 2) AS revenue FROM {table} WHERE {where}",
+    },
+    {
+        "name": "product_sales_last_90d",
+        "table": "fact_order_items",
+        "columns": ["order_id", "price"],
+        "window_days": 90,
+        "lookup": "product_id",
+        "sql": "SELECT COUNT(DISTINCT order_id) AS orders, ROUND(SUM(price), 2) AS sales FROM {table} WHERE {where}",
+    },
+    {
+        "name": "order_payment_lookup",
+        "table": "fact_payments",
+        "columns": ["payment_sequential", "payment_type", "payment_value"],
+        "lookup": "order_id",
+        "sql": "SELECT payment_sequential, payment_type, payment_value FROM {table} WHERE {where} ORDER BY 1",
+    },
+    {
+        "name": "review_scores_last_30d",
+        "table": "fact_reviews",
+        "columns": ["review_score"],
+        "window_days": 30,
+        "sql": "SELECT review_score, COUNT(*) AS reviews FROM {table} WHERE {where} GROUP BY 1 ORDER BY 1",
+    },
+]
+
+_PARTITION_RE = re.compile(r"partition_by\s*=\s*\{[^}]*'field'\s*:\s*'(\w+)'")
+_CLUSTER_RE = re.compile(r"cluster_by\s*=\s*\[([^\]]*)\]")
+
+
+def load_layouts(models_dir=MODELS_DIR, models=FACT_MODELS):
+    """
+    Read the partition and cluster columns from the dbt model config blocks.
+
+    Returns:
+    --------
+    dict : {model_name: {'partition_by': str or None, 'cluster_by': [str, ...]}}
+    """
+    layouts = {}
+    for model in models:
+        sql = (Path(models_dir) / f"{model}.sql").read_text()
+        partition = _PARTITION_RE.search(sql)
+        cluster = _CLUSTER_RE.search(sql)
+        layouts[model] = {
+            "partition_by": partition.group(1) if partition else None,
+            "cluster_by": re.findall(r"'(\w+)'", cluster.group(1)) if cluster else [],
+        }
+    return layouts
+
+
+def load_local_copy(con, raw_dir=RAW_DIR):
+    """
+    Materialize the fact tables into the DuckDB connection from the raw CSVs.
+    Tables whose source CSV is missing are skipped.
+    """
+    loaded = []
+    for table, query in RAW_FACT_QUERIES.items():
+        try:
+            con.execute(f"CREATE OR REPLACE TABLE {table} AS " + query.format(raw_dir=Path(raw_dir).as_posix()))
+            loaded.append(table)
+        except duckdb.Error as e:
+            print(f"  ✗ {table}: {e}")
+    return loaded
+
+
+def _fetch_arrow(con, sql):
+    result = con.execute(sql)
+    # duckdb >= 1.4 renamed fetch_arrow_table
+    return result.to_arrow_table() if hasattr(result, "to_arrow_table") else result.fetch_arrow_table()
+
+
+def write_layouts(con, table, layout, output_dir, row_group_size=ROW_GROUP_SIZE):
+    """
+    Write one table twice as Parquet:
+      - baseline/    : a single file in load order (unpartitioned, unclustered)
+      - partitioned/ : one file per partition day, rows sorted by the cluster columns
+
+    Returns:
+    --------
+    dict : {'baseline': Path, 'partitioned': Path}
+    """
+    output_dir = Path(output_dir)
+    paths = {"baseline": output_dir / "baseline" / table, "partitioned": output_dir / "partitioned" / table}
+    for path in paths.values():
+        if path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True)
+
+    pq.write_table(_fetch_arrow(con, f"SELECT * FROM {table}"),
+                   paths["baseline"] / "data.parquet", row_group_size=row_group_size)
+
+    partition_col = layout["partition_by"]
+    order_cols = layout["cluster_by"] or []
+    if partition_col:
+        order_by = ", ".join([f"CAST({partition_col} AS DATE)"] + order_cols)
+        ordered = _fetch_arrow(
+            con, f"SELECT *, CAST({partition_col} AS DATE) AS _partition FROM {table} ORDER BY {order_by}"
+        )
+        partitions = ordered.column("_partition").to_pylist()
+        ordered = ordered.drop_columns(["_partition"])
+        start = 0
+        for end in range(1, len(partitions) + 1):
+            if end == len(partitions) or partitions[end] != partitions[start]:
+                part_dir = paths["partitioned"] / f"{partition_col}={partitions[start]}"
+                part_dir.mkdir(exist_ok=True)
+                pq.write_table(ordered.slice(start, end - start), part_dir / "data.parquet",
+                               row_group_size=row_group_size)
+                start = end
+    else:
+        order_by = f" ORDER BY {', '.join(order_cols)}" if order_cols else ""
+        pq.write_table(_fetch_arrow(con, f"SELECT * FROM {table}{order_by}"),
+                       paths["partitioned"] / "data.parquet", row_group_size=row_group_size)
+    return paths
+
+
+def _row_group_may_match(row_group, column_index, filters):
+    """Min/max pruning, the same block elimination BigQuery does on partitions and clusters."""
+    for column, op, value in filters:
+        stats = row_group.column(column_index[column]).statistics
+        if stats is None or not stats.has_min_max:
+            continue
+        if op == "=" and not (stats.min <= value <= stats.max):
+            return False
+        if op == "range" and (stats.max < value[0] or stats.min >= value[1]):
+            return False
+    return True
+
+
+def scan_stats(layout_path, columns, filters):
+    """
+    Rows and (uncompressed, BigQuery-style logical) bytes a query would have to read
+    from a layout after partition/cluster pruning.
+
+    Parameters:
+    -----------
+    layout_path : Path
+        Directory of Parquet files written by write_layouts
+    columns : list
+        Columns referenced by the query (filter columns are added automatically)
+    filters : list
+        (column, '=' | 'range', value) predicates; range values are (low, high_exclusive)
+    """
+    columns = list(dict.fromkeys(list(columns) + [f[0] for f in filters]))
+    rows = bytes_scanned = 0
+    for path in sorted(Path(layout_path).rglob("*.parquet")):
+        metadata = pq.ParquetFile(path).metadata
+        column_index = {metadata.schema.column(i).name: i for i in range(metadata.num_columns)}
+        for rg in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg)
+            if not _row_group_may_match(row_group, column_index, filters):
+                continue
+            rows += row_group.num_rows
+            bytes_scanned += sum(row_group.column(column_index[c]).total_uncompressed_size for c in columns)
+    return {"rows_scanned": rows, "bytes_scanned": bytes_scanned}
+
+
+def resolve_filters(con, query, layouts):
+    """Turn a query's window_days/lookup into concrete predicates and a SQL WHERE clause."""
+    table = query["table"]
+    filters, where = [], []
+    if query.get("window_days"):
+        partition_col = layouts[table]["partition_by"]
+        high = con.execute(f"SELECT MAX({partition_col}) FROM {table}").fetchone()[0] + timedelta(microseconds=1)
+        low = high - timedelta(days=query["window_days"])
+        filters.append((partition_col, "range", (low, high)))
+        where.append(f"{partition_col} >= TIMESTAMP '{low}' AND {partition_col} < TIMESTAMP '{high}'")
+    if query.get("lookup"):
+        col = query["lookup"]
+        value = con.execute(
+            f"SELECT {col} FROM {table} WHERE {col} IS NOT NULL "
+            # md5 tie-break: deterministic without always landing on the smallest key
+            f"GROUP BY 1 ORDER BY COUNT(*) DESC, md5(CAST({col} AS VARCHAR)) LIMIT 1"
+        ).fetchone()[0]
+        filters.append((col, "=", value))
+        where.append(f"{col} = '{value}'")
+    return filters, " AND ".join(where) or "TRUE"
+
+
+def run_layout_check(con, output_dir=OUTPUT_DIR, layouts=None, queries=REPRESENTATIVE_QUERIES,
+                     row_group_size=ROW_GROUP_SIZE):
+    """
+    Write both layouts for every fact table in the connection and replay the
+    representative queries against each.
+
+    Returns:
+    --------
+    list : One dict per query with baseline/partitioned scan stats, timings and reduction
+    """
+    layouts = layouts or load_layouts()
+    available = {r[0] for r in con.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+    paths = {t: write_layouts(con, t, layouts[t], output_dir, row_group_size)
+             for t in layouts if t in available}
+
+    results = []
+    for query in queries:
+        table = query["table"]
+        if table not in paths:
+            continue
+        filters, where = resolve_filters(con, query, layouts)
+        result = {"query": query["name"], "table": table}
+        answers = {}
+        for layout_name, path in paths[table].items():
+            source = f"read_parquet('{path.as_posix()}/**/*.parquet', hive_partitioning=false)"
+            start = time.perf_counter()
+            answers[layout_name] = con.execute(query["sql"].format(table=source, where=where)).fetchall()
+            elapsed = time.perf_counter() - start
+            result[layout_name] = dict(scan_stats(path, query["columns"], filters), seconds=round(elapsed, 4))
+        result["results_match"] = answers["baseline"] == answers["partitioned"]
+        base_bytes = result["baseline"]["bytes_scanned"]
+        result["bytes_reduction_pct"] = round(
+            (1 - result["partitioned"]["bytes_scanned"] / base_bytes) * 100, 2) if base_bytes else 0.0
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare scanned rows/bytes before and after the mart layout")
+    parser.add_argument("--raw-dir", default=str(RAW_DIR))
+    parser.add_argument("--output-dir", default=str(OUTPUT_DIR))
+    parser.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("WAREHOUSE LAYOUT CHECK - FACT MARTS")
+    print("=" * 80 + "\n")
+
+    con = duckdb.connect()
+    loaded = load_local_copy(con, args.raw_dir)
+    if not loaded:
+        print("❌ No fact tables could be built from the raw CSVs. Exiting...")
+        return
+    print(f"📊 Local copy built: {', '.join(loaded)}\n")
+
+    results = run_layout_check(con, args.output_dir, row_group_size=args.row_group_size)
+    for r in results:
+        status = "✓" if r["results_match"] else "✗ RESULT MISMATCH"
+        print(f"{status} {r['query']} ({r['table']})")
+        for layout_name in ("baseline", "partitioned"):
+            s = r[layout_name]
+            print(f"   {layout_name:12s}: {s['rows_scanned']:>10,} rows  {s['bytes_scanned'] / 1024**2:>9.2f} MB  {s['seconds']:.3f}s")
+        print(f"   bytes scanned reduced by {r['bytes_reduction_pct']}%\n")
+
+    report_file = Path(args.output_dir) / "warehouse_layout_report.json"
+    with open(report_file, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Report saved to: {report_file}")
+
+
+if __name__ == "__main__":
+    main()